@@ -0,0 +1,19 @@
+# benchmarks/__init__.py
+"""
+Benchmarks de los repositorios contra bases de prueba.
+
+    data_generator      llena una base SQLite o MySQL de prueba con datos sintéticos
+                        reproducibles (misma semilla -> mismos datos).
+    harness             mide los métodos de los repositorios (p50/p95/p99, filas/s,
+                        memoria pico), guarda la línea base en JSON y compara corridas.
+    prepared_statements compara las búsquedas con y sin sentencias preparadas.
+    row_models          compara filas como dict contra los objetos de models.py
+                        (tiempo de armado, lectura y memoria retenida).
+    search              latencia de la búsqueda de texto (índice en memoria o FULLTEXT).
+    startup             tiempo hasta el primer menú y la primera consulta de main.py
+                        y del ejecutable de PyInstaller.
+
+Se ejecutan como módulos desde la raíz del proyecto, p. ej.:
+    python -m benchmarks.data_generator --sqlite bench.sqlite3 --jobs 200000
+    python -m benchmarks.harness --sqlite bench.sqlite3 --save base.json
+"""
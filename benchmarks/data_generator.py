@@ -0,0 +1,230 @@
+# benchmarks/data_generator.py
+"""
+Generador determinista de datos sintéticos para benchmarks.
+Con la misma semilla y los mismos volúmenes produce exactamente las mismas filas,
+así dos corridas del harness sobre bases generadas por separado son comparables.
+
+Destinos:
+    --sqlite ARCHIVO         crea el esquema de sqlite_backend y lo llena.
+    --mysql-database NOMBRE  usa una base MySQL/MariaDB de prueba que ya tenga el
+                             esquema con las migraciones aplicadas. Se exige el
+                             nombre explícito para no vaciar la base de DB_CONFIG.
+
+Uso:
+    python -m benchmarks.data_generator --sqlite bench.sqlite3 --jobs 1000000
+    python -m benchmarks.data_generator --mysql-database bench --consorcios 5000 --jobs 200000
+"""
+import argparse
+import getpass
+import random
+import time
+from datetime import date, timedelta
+from config import DB_CONFIG, ESTADOS_POSIBLES, PRIORIDADES_POSIBLES
+from db_manager import DatabaseManager
+from sqlite_backend import SQLiteDatabaseManager
+
+DEFAULT_SEED = 42
+DEFAULT_VOLUMES = {
+    'consorcios': 2000,
+    'max_departments': 40,     # Departamentos por consorcio: entre 0 y este valor
+    'gremios': 200,
+    'jobs': 200000,
+}
+INSERT_CHUNK_SIZE = 5000
+
+STREETS = ["Av. Rivadavia", "Corrientes", "Santa Fe", "Cabildo", "Belgrano", "San Martín",
+           "Mitre", "Sarmiento", "Lavalle", "Córdoba", "Callao", "Pueyrredón"]
+TRADES = ["Plomería", "Electricidad", "Gas", "Pintura", "Albañilería", "Ascensores",
+          "Cerrajería", "Herrería", "Vidriería", "Climatización"]
+TASKS = ["Reparar pérdida en", "Cambiar", "Revisar", "Pintar", "Destapar", "Reemplazar",
+         "Ajustar", "Impermeabilizar", "Instalar", "Limpiar"]
+OBJECTS = ["cañería de cocina", "tablero eléctrico", "portón de garage", "bomba de agua",
+           "terraza", "caja de escalera", "medidor de gas", "ascensor", "tanque de agua",
+           "luces del palier", "cerradura de entrada", "membrana"]
+
+FIRST_DATE = date(2018, 1, 1)
+DATE_SPAN_DAYS = 9 * 365
+
+TABLES_IN_DELETE_ORDER = ("Avance", "Departamentos", "Estado", "Gremios", "Consorcios")
+
+
+def _consorcios(rng, count):
+    for codigo in range(1, count + 1):
+        yield (codigo, f"{rng.choice(STREETS)} {rng.randint(100, 9999)} (#{codigo})")
+
+
+def _gremios(rng, count):
+    for gremio_id in range(1, count + 1):
+        yield (gremio_id, f"{rng.choice(TRADES)} {gremio_id}")
+
+
+def _departamentos(rng, consorcios, max_departments):
+    """Entrega (ID, Codigo, Unidad, Orden, Nombre, Consorcio_FK) y la lista de IDs por consorcio."""
+    by_consorcio = {}
+    dept_id = 0
+    rows = []
+    for consorcio in range(1, consorcios + 1):
+        ids = []
+        floors = rng.randint(0, max(max_departments // 4, 0))
+        for floor in range(1, floors + 1):
+            for orden, letter in enumerate("ABCD"[:rng.randint(1, 4)], start=1):
+                if len(ids) >= max_departments:
+                    break
+                dept_id += 1
+                ids.append(dept_id)
+                rows.append((dept_id, len(ids), f"{floor}{letter}", orden, f"Depto {floor}{letter}", consorcio))
+        by_consorcio[consorcio] = ids
+    return rows, by_consorcio
+
+
+def _jobs(rng, count, consorcios, gremios, depts_by_consorcio):
+    estados = len(ESTADOS_POSIBLES)
+    for job_id in range(1, count + 1):
+        consorcio = rng.randint(1, consorcios)
+        depts = depts_by_consorcio.get(consorcio)
+        department = rng.choice(depts) if depts and rng.random() < 0.7 else None
+        fecha_ini = FIRST_DATE + timedelta(days=rng.randrange(DATE_SPAN_DAYS))
+        fecha_fin = fecha_ini + timedelta(days=rng.randint(1, 120))
+        yield (
+            job_id, fecha_ini.day, fecha_ini.month, fecha_ini.year,
+            consorcio, department,
+            f"{rng.choice(TASKS)} {rng.choice(OBJECTS)}",
+            f"Trabajo generado #{job_id}",
+            rng.randint(1, gremios),
+            fecha_fin.day, fecha_fin.month, fecha_fin.year,
+            rng.randint(1, estados), rng.choice(PRIORIDADES_POSIBLES),
+            fecha_ini, fecha_fin
+        )
+
+
+def _insert(db_manager, table, columns, rows, chunk_size):
+    """Inserta en bloques de chunk_size filas, una transacción por bloque."""
+    sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join(['%s'] * len(columns))})"
+    total = 0
+    chunk = []
+
+    def flush():
+        with db_manager.transaction() as conn:
+            cursor = conn.cursor()
+            try:
+                cursor.executemany(sql, chunk)
+            finally:
+                cursor.close()
+
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            flush()
+            total += len(chunk)
+            chunk = []
+    if chunk:
+        flush()
+        total += len(chunk)
+    return total
+
+
+def _reset(db_manager):
+    with db_manager.transaction() as conn:
+        cursor = conn.cursor()
+        try:
+            for table in TABLES_IN_DELETE_ORDER:
+                cursor.execute(f"DELETE FROM {table}")
+        finally:
+            cursor.close()
+
+
+def generate(db_manager, seed=DEFAULT_SEED, consorcios=DEFAULT_VOLUMES['consorcios'],
+             max_departments=DEFAULT_VOLUMES['max_departments'], gremios=DEFAULT_VOLUMES['gremios'],
+             jobs=DEFAULT_VOLUMES['jobs'], chunk_size=INSERT_CHUNK_SIZE):
+    """
+    Vacía las tablas de la aplicación y las llena con datos sintéticos.
+    Returns:
+        dict: Filas insertadas por tabla.
+    """
+    rng = random.Random(seed)
+    _reset(db_manager)
+    counts = {}
+    counts['Consorcios'] = _insert(db_manager, "Consorcios", ("Codigo", "Nombre"),
+                                   _consorcios(rng, consorcios), chunk_size)
+    counts['Gremios'] = _insert(db_manager, "Gremios", ("Id", "Nombre_Fantasia"),
+                                _gremios(rng, gremios), chunk_size)
+    counts['Estado'] = _insert(db_manager, "Estado", ("id", "Estado"),
+                               enumerate(ESTADOS_POSIBLES, start=1), chunk_size)
+    dept_rows, depts_by_consorcio = _departamentos(rng, consorcios, max_departments)
+    counts['Departamentos'] = _insert(
+        db_manager, "Departamentos", ("ID", "Codigo", "Unidad", "Orden", "Nombre", "Consorcio_FK"),
+        dept_rows, chunk_size
+    )
+    counts['Avance'] = _insert(
+        db_manager, "Avance",
+        ("ID", "DiaIni", "MesIni", "AnioIni", "Consorcio_FK", "Departamento_FK", "Titulo",
+         "Descripcion", "Gremio_FK", "DiaFin", "MesFin", "AnioFin", "Estado_FK", "Prioridad",
+         "FechaIni", "FechaFin"),
+        _jobs(rng, jobs, consorcios, gremios, depts_by_consorcio), chunk_size
+    )
+    return counts
+
+
+def add_target_arguments(parser):
+    """Argumentos comunes para elegir la base de prueba (también los usa el harness)."""
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--sqlite", metavar="ARCHIVO", help="Base SQLite de prueba.")
+    target.add_argument("--mysql-database", metavar="NOMBRE", help="Base MySQL/MariaDB de prueba.")
+    parser.add_argument("--host", default=DB_CONFIG['host'])
+    parser.add_argument("--port", type=int, default=DB_CONFIG['port'])
+    parser.add_argument("--user", default=DB_CONFIG['user'])
+    parser.add_argument("--password", default=None,
+                        help="Si se omite junto con --host, se usa la de DB_CONFIG; si no, se pide por consola.")
+
+
+def open_target(args):
+    """Crea el gestor de base de datos para los argumentos de add_target_arguments."""
+    if args.sqlite:
+        db_manager = SQLiteDatabaseManager(args.sqlite)
+        db_manager.create_schema()
+        return db_manager
+    password = args.password
+    if password is None:
+        password = DB_CONFIG['password'] if args.host == DB_CONFIG['host'] else getpass.getpass("Contraseña: ")
+    db_config = {
+        'host': args.host, 'port': args.port, 'user': args.user,
+        'password': password, 'database': args.mysql_database
+    }
+    return DatabaseManager(db_config, {'min_size': 1, 'max_size': 2, 'health_check_interval': 0})
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Genera datos sintéticos para benchmarks.")
+    add_target_arguments(parser)
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--consorcios", type=int, default=DEFAULT_VOLUMES['consorcios'])
+    parser.add_argument("--max-departments", type=int, default=DEFAULT_VOLUMES['max_departments'])
+    parser.add_argument("--gremios", type=int, default=DEFAULT_VOLUMES['gremios'])
+    parser.add_argument("--jobs", type=int, default=DEFAULT_VOLUMES['jobs'])
+    parser.add_argument("--chunk-size", type=int, default=INSERT_CHUNK_SIZE)
+    args = parser.parse_args(argv)
+
+    if args.mysql_database and args.mysql_database == DB_CONFIG['database'] and args.host == DB_CONFIG['host']:
+        print("Error: no se generan datos sobre la base de DB_CONFIG. Use una base de prueba.")
+        return 1
+
+    db_manager = open_target(args)
+    try:
+        start = time.perf_counter()
+        counts = generate(
+            db_manager, seed=args.seed, consorcios=args.consorcios,
+            max_departments=args.max_departments, gremios=args.gremios,
+            jobs=args.jobs, chunk_size=args.chunk_size
+        )
+        elapsed = time.perf_counter() - start
+    finally:
+        db_manager.close_connection()
+
+    for table, count in counts.items():
+        print(f"{table:<15} {count:>10} filas")
+    print(f"Generado en {elapsed:.1f} s (semilla {args.seed}).")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,235 @@
+# benchmarks/harness.py
+"""
+Mide los métodos de los repositorios sobre una base generada con data_generator.
+Cada caso se ejecuta 'iterations' veces: se informan latencias p50/p95/p99, filas
+por segundo y memoria pico (tracemalloc, medida en una pasada aparte para no
+afectar los tiempos). Los resultados se pueden guardar como línea base en JSON y
+comparar contra una corrida anterior: se marca regresión cuando el p95 o la
+memoria pico empeoran más que el umbral.
+
+Uso:
+    python -m benchmarks.harness --sqlite bench.sqlite3 --save base.json
+    python -m benchmarks.harness --sqlite bench.sqlite3 --compare base.json --threshold 0.2
+    python -m benchmarks.harness --mysql-database bench --only get_all_jobs,add_job
+"""
+import argparse
+import json
+import platform
+import random
+import time
+import tracemalloc
+from datetime import datetime
+from benchmarks.data_generator import add_target_arguments, open_target
+from lookup_cache import LookupCache
+from repositories import (
+    ConsorcioRepository, GremioRepository, EstadoRepository,
+    DepartamentoRepository, AvanceRepository
+)
+from job_query import JobFilter
+from config import ESTADOS_POSIBLES
+
+DEFAULT_ITERATIONS = 20
+DEFAULT_THRESHOLD = 0.2
+# Los listados completos son mucho más lentos: se repiten menos.
+HEAVY_CASES = {'get_all_jobs': 5, 'iter_all_jobs': 5}
+
+
+def percentile(sorted_values, pct):
+    """Percentil por rango más cercano sobre una lista ya ordenada."""
+    if not sorted_values:
+        return 0.0
+    rank = max(int(round(pct / 100 * len(sorted_values) + 0.5)) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+def _rows(result):
+    """Cantidad de filas que devolvió un caso (para filas/s)."""
+    if result is None or isinstance(result, (bool, str)):
+        return 1
+    if isinstance(result, int):     # Casos que ya devuelven la cantidad (iter_all_jobs)
+        return result
+    if isinstance(result, tuple):   # find_jobs: (trabajos, cursor)
+        return len(result[0])
+    if not hasattr(result, '__len__'):  # Un solo objeto de models.py (get_job_by_id)
+        return 1
+    return len(result)
+
+
+class BenchmarkContext:
+    """Repositorios y datos de muestra que usan los casos."""
+    def __init__(self, db_manager, seed):
+        self.db_manager = db_manager
+        self.rng = random.Random(seed)
+        self.consorcio_repo = ConsorcioRepository(db_manager)
+        self.gremio_repo = GremioRepository(db_manager)
+        self.estado_repo = EstadoRepository(db_manager)
+        cache = LookupCache(db_manager, ttl=0)
+        self.cached_consorcio_repo = ConsorcioRepository(db_manager, cache)
+        self.departamento_repo = DepartamentoRepository(db_manager)
+        self.avance_repo = AvanceRepository(db_manager)
+
+        self.consorcio_names = self.consorcio_repo.get_all()
+        self.gremio_ids = [self.gremio_repo.get_by_name(n) for n in self.gremio_repo.get_all()[:50]]
+        self.estado_ids = [i for i in map(self.estado_repo.get_by_name, ESTADOS_POSIBLES) if i]
+        if not self.consorcio_names or not self.gremio_ids or not self.estado_ids:
+            raise SystemExit("La base no tiene datos: ejecute primero benchmarks.data_generator.")
+        self.added_ids = []
+
+    def sample_job(self):
+        fecha_fin = self.rng.randint(1, 28), self.rng.randint(1, 12), self.rng.randint(2024, 2027)
+        return {
+            'DiaIni': 1, 'MesIni': 1, 'AnioIni': 2024,
+            'Consorcio_FK': self.consorcio_repo.get_by_name(self.rng.choice(self.consorcio_names)),
+            'Departamento_FK': None,
+            'Titulo': "Trabajo de benchmark", 'Descripcion': "",
+            'Gremio_FK': self.rng.choice(self.gremio_ids),
+            'DiaFin': fecha_fin[0], 'MesFin': fecha_fin[1], 'AnioFin': fecha_fin[2],
+            'Estado_FK': self.rng.choice(self.estado_ids), 'Prioridad': "Media"
+        }
+
+    def add_job(self):
+        job_id = self.avance_repo.add_job(self.sample_job())
+        if job_id and job_id is not True:
+            self.added_ids.append(job_id)
+        return bool(job_id)
+
+    def update_job(self):
+        # Actualiza los trabajos agregados por el caso add_job (no los generados).
+        job_id = self.rng.choice(self.added_ids) if self.added_ids else 1
+        return self.avance_repo.update_job(job_id, self.sample_job())
+
+    def delete_job(self):
+        return self.avance_repo.delete_job(self.added_ids.pop()) if self.added_ids else False
+
+
+def build_cases(ctx):
+    """Casos en orden de ejecución: nombre -> función sin argumentos."""
+    rng = ctx.rng
+    return {
+        'get_all_jobs': ctx.avance_repo.get_all_jobs,
+        'iter_all_jobs': lambda: sum(1 for _ in ctx.avance_repo.iter_all_jobs()),
+        'find_jobs_page': lambda: ctx.avance_repo.find_jobs(JobFilter(), limit=50),
+        'find_jobs_filtered': lambda: ctx.avance_repo.find_jobs(
+            JobFilter(building=rng.choice(ctx.consorcio_names)), limit=50),
+        'get_job_by_id': lambda: ctx.avance_repo.get_job_by_id(rng.randint(1, 1000)),
+        'consorcio.get_by_name (SQL)': lambda: ctx.consorcio_repo.get_by_name(rng.choice(ctx.consorcio_names)),
+        'consorcio.get_by_name (caché)': lambda: ctx.cached_consorcio_repo.get_by_name(rng.choice(ctx.consorcio_names)),
+        'gremio.get_all': ctx.gremio_repo.get_all,
+        'get_all_by_consorcio': lambda: ctx.departamento_repo.get_all_by_consorcio(rng.choice(ctx.consorcio_names)),
+        'add_job': ctx.add_job,
+        'update_job': ctx.update_job,
+        'delete_job': ctx.delete_job,
+    }
+
+
+def run_case(fn, iterations):
+    """Mide un caso: latencias, filas/s y memoria pico."""
+    latencies = []
+    rows = 0
+    for _ in range(iterations):
+        start = time.perf_counter()
+        result = fn()
+        latencies.append(time.perf_counter() - start)
+        rows += _rows(result)
+
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    latencies.sort()
+    total = sum(latencies)
+    return {
+        'iterations': iterations,
+        'p50_ms': percentile(latencies, 50) * 1000,
+        'p95_ms': percentile(latencies, 95) * 1000,
+        'p99_ms': percentile(latencies, 99) * 1000,
+        'rows_per_sec': rows / total if total else 0.0,
+        'peak_kib': peak / 1024,
+    }
+
+
+def run(db_manager, iterations=DEFAULT_ITERATIONS, only=None, seed=0):
+    ctx = BenchmarkContext(db_manager, seed)
+    results = {}
+    for name, fn in build_cases(ctx).items():
+        if only and name not in only:
+            continue
+        fn() # Calentamiento (conexiones, cachés, sentencias preparadas)
+        results[name] = run_case(fn, min(iterations, HEAVY_CASES.get(name, iterations)))
+    # Lo que agregó add_job y no borró delete_job no debe sesgar la próxima corrida.
+    while ctx.added_ids:
+        ctx.delete_job()
+    return results
+
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """
+    Compara contra una línea base.
+    Returns:
+        list: (caso, métrica, valor base, valor actual) de cada regresión.
+    """
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get('cases', {}).get(name)
+        if not previous:
+            continue
+        for metric in ('p95_ms', 'peak_kib'):
+            if previous[metric] and current[metric] > previous[metric] * (1 + threshold):
+                regressions.append((name, metric, previous[metric], current[metric]))
+    return regressions
+
+
+def print_results(results):
+    print("{:<30} {:>6} {:>10} {:>10} {:>10} {:>12} {:>10}".format(
+        "Caso", "N", "p50 ms", "p95 ms", "p99 ms", "filas/s", "pico KiB"))
+    for name, r in results.items():
+        print("{:<30} {:>6} {:>10.2f} {:>10.2f} {:>10.2f} {:>12.0f} {:>10.0f}".format(
+            name, r['iterations'], r['p50_ms'], r['p95_ms'], r['p99_ms'], r['rows_per_sec'], r['peak_kib']))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark de los repositorios.")
+    add_target_arguments(parser)
+    parser.add_argument("--iterations", type=int, default=DEFAULT_ITERATIONS)
+    parser.add_argument("--only", default=None, help="Casos a ejecutar, separados por coma.")
+    parser.add_argument("--save", metavar="JSON", help="Guarda los resultados como línea base.")
+    parser.add_argument("--compare", metavar="JSON", help="Línea base contra la cual comparar.")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Empeoramiento relativo tolerado (0.2 = 20%%).")
+    args = parser.parse_args(argv)
+
+    db_manager = open_target(args)
+    try:
+        only = set(args.only.split(",")) if args.only else None
+        results = run(db_manager, iterations=args.iterations, only=only)
+    finally:
+        db_manager.close_connection()
+
+    print_results(results)
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump({
+                'created_at': datetime.now().isoformat(timespec="seconds"),
+                'target': args.sqlite or args.mysql_database,
+                'python': platform.python_version(),
+                'cases': results,
+            }, f, indent=2)
+        print(f"Línea base guardada en {args.save}.")
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\nRegresiones (umbral {args.threshold:.0%}):")
+            for name, metric, before, after in regressions:
+                print(f"  {name}: {metric} {before:.2f} -> {after:.2f}")
+            return 1
+        print("\nSin regresiones respecto de la línea base.")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,109 @@
+# benchmarks/prepared_statements.py
+"""
+Compara las consultas de búsqueda de los repositorios (sin LookupCache, es decir,
+por SQL) con y sin el caché de sentencias preparadas.
+Usa una sola conexión para poder leer los contadores de sesión del servidor:
+Com_stmt_prepare muestra cuántas veces se analizó una sentencia preparada y
+Com_select cuántas consultas de texto se analizaron. La columna de viajes suma
+todos los comandos enviados: mysql.connector manda un COM_STMT_RESET antes de
+cada COM_STMT_EXECUTE, así que con caché son dos viajes por llamada contra uno
+sin él. Para decidir STATEMENT_CACHE_SIZE hay que correrlo contra el servidor de
+producción por la red real, no contra uno local: la latencia de cada viaje es lo
+que define si ahorrar el análisis compensa.
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.prepared_statements
+    python -m benchmarks.prepared_statements --iterations 5000
+"""
+import argparse
+import time
+from config import DB_CONFIG
+from db_manager import DatabaseManager
+from repositories import ConsorcioRepository, GremioRepository, EstadoRepository
+
+STATUS_COUNTERS = ("Com_select", "Com_stmt_prepare", "Com_stmt_execute", "Com_stmt_reset")
+
+
+def _session_status(db_manager):
+    with db_manager.connection() as conn:
+        cursor = conn.cursor()
+        try:
+            cursor.execute(
+                "SHOW SESSION STATUS WHERE Variable_name IN (%s, %s, %s, %s)", STATUS_COUNTERS
+            )
+            return {name: int(value) for name, value in cursor.fetchall()}
+        finally:
+            cursor.close()
+
+
+def _lookup_calls(db_manager):
+    """Pares (descripción, función) con las búsquedas a medir, resueltos con datos reales."""
+    consorcio_repo = ConsorcioRepository(db_manager)
+    gremio_repo = GremioRepository(db_manager)
+    estado_repo = EstadoRepository(db_manager)
+    calls = []
+    for label, repo in (("consorcio", consorcio_repo), ("gremio", gremio_repo), ("estado", estado_repo)):
+        names = repo.get_all()
+        if not names:
+            continue
+        name = names[0]
+        row_id = repo.get_by_name(name)
+        calls.append((f"{label}.get_by_name", lambda repo=repo, name=name: repo.get_by_name(name)))
+        calls.append((f"{label}.get_name_by_id", lambda repo=repo, row_id=row_id: repo.get_name_by_id(row_id)))
+    return calls
+
+
+def run(statement_cache_size, iterations):
+    db_manager = DatabaseManager(
+        DB_CONFIG, {'min_size': 1, 'max_size': 1, 'health_check_interval': 0},
+        statement_cache_size=statement_cache_size
+    )
+    try:
+        calls = _lookup_calls(db_manager)
+        for _, call in calls: # Calentamiento: prepara las sentencias fuera de la medición
+            call()
+        before = _session_status(db_manager)
+        start = time.perf_counter()
+        for _ in range(iterations):
+            for _, call in calls:
+                call()
+        elapsed = time.perf_counter() - start
+        after = _session_status(db_manager)
+    finally:
+        db_manager.close_connection()
+
+    total_calls = iterations * len(calls)
+    # La propia consulta SHOW STATUS cuenta como un Com_select.
+    counters = {name: after[name] - before[name] for name in STATUS_COUNTERS}
+    counters["Com_select"] -= 1
+    return {
+        'calls': total_calls,
+        'seconds': elapsed,
+        'us_per_call': elapsed / total_calls * 1e6 if total_calls else 0.0,
+        'trips_per_call': sum(counters.values()) / total_calls if total_calls else 0.0,
+        **counters,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark del caché de sentencias preparadas.")
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--cache-size", type=int, default=32)
+    args = parser.parse_args(argv)
+
+    results = [
+        ("sin caché", run(0, args.iterations)),
+        (f"caché {args.cache_size}", run(args.cache_size, args.iterations)),
+    ]
+    print("{:<12} {:>8} {:>10} {:>12} {:>15} {:>12} {:>16} {:>16} {:>14}".format(
+        "Modo", "Llamadas", "Segundos", "µs/llamada", "Viajes/llamada",
+        "Com_select", "Com_stmt_prepare", "Com_stmt_execute", "Com_stmt_reset"))
+    for label, r in results:
+        print("{:<12} {:>8} {:>10.3f} {:>12.1f} {:>15.2f} {:>12} {:>16} {:>16} {:>14}".format(
+            label, r['calls'], r['seconds'], r['us_per_call'], r['trips_per_call'],
+            r['Com_select'], r['Com_stmt_prepare'], r['Com_stmt_execute'], r['Com_stmt_reset']))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,110 @@
+# benchmarks/row_models.py
+"""
+Compara filas como diccionarios (dict(zip(columnas, fila)), lo que hacía
+cursor(dictionary=True)) contra los objetos de models.py armados con row_mapper.
+Las tuplas se leen una sola vez de la base y luego se convierten en memoria,
+así se mide solo el costo de la representación:
+    - tiempo de construcción por fila,
+    - memoria retenida por la lista completa (tracemalloc),
+    - tiempo de lectura de los campos que usa el listado.
+
+Uso:
+    python -m benchmarks.row_models --sqlite bench.sqlite3
+    python -m benchmarks.row_models --mysql-database bench --rounds 3
+"""
+import argparse
+import gc
+import time
+import tracemalloc
+from benchmarks.data_generator import add_target_arguments, open_target
+from models import Job, row_mapper
+from repositories import AvanceRepository
+
+DEFAULT_ROUNDS = 5
+
+
+def fetch_rows(db_manager):
+    """Tuplas y nombres de columna del listado completo."""
+    with db_manager.connection() as conn:
+        cursor = conn.cursor()
+        try:
+            cursor.execute(AvanceRepository.JOBS_SELECT + AvanceRepository.JOBS_ORDER_BY)
+            rows = cursor.fetchall()
+            columns = [column[0] for column in cursor.description]
+        finally:
+            cursor.close()
+    return columns, rows
+
+
+def _best_time(fn, rounds):
+    best = None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def _retained_kib(build):
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = build()
+        current, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return current / 1024
+
+
+def run(columns, rows, rounds=DEFAULT_ROUNDS):
+    to_job = row_mapper(Job, columns)
+    builders = {
+        'dict': lambda: [dict(zip(columns, row)) for row in rows],
+        'Job (slots)': lambda: list(map(to_job, rows)),
+    }
+    readers = {
+        'dict': lambda items: [(j['ID'], j['Titulo'], j['building'], j['status'], j['priority']) for j in items],
+        'Job (slots)': lambda items: [(j.ID, j.Titulo, j.building, j.status, j.priority) for j in items],
+    }
+    results = {}
+    for name, build in builders.items():
+        items = build()
+        results[name] = {
+            'build_ms': _best_time(build, rounds) * 1000,
+            'read_ms': _best_time(lambda read=readers[name], items=items: read(items), rounds) * 1000,
+            'retained_kib': _retained_kib(build),
+        }
+        del items
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Filas como dict vs. objetos con __slots__.")
+    add_target_arguments(parser)
+    parser.add_argument("--rounds", type=int, default=DEFAULT_ROUNDS)
+    args = parser.parse_args(argv)
+
+    db_manager = open_target(args)
+    try:
+        columns, rows = fetch_rows(db_manager)
+    finally:
+        db_manager.close_connection()
+    if not rows:
+        print("La base no tiene trabajos: ejecute primero benchmarks.data_generator.")
+        return 1
+
+    results = run(columns, rows, args.rounds)
+    print(f"{len(rows)} filas, mejor de {args.rounds} rondas")
+    print("{:<14} {:>12} {:>12} {:>14} {:>12}".format("Formato", "armado ms", "lectura ms", "retenido KiB", "bytes/fila"))
+    for name, r in results.items():
+        print("{:<14} {:>12.1f} {:>12.1f} {:>14.0f} {:>12.0f}".format(
+            name, r['build_ms'], r['read_ms'], r['retained_kib'], r['retained_kib'] * 1024 / len(rows)))
+    base, slots = results['dict'], results['Job (slots)']
+    print(f"\nMemoria retenida: {slots['retained_kib'] / base['retained_kib']:.0%} de la versión con dict.")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,76 @@
+# benchmarks/search.py
+"""
+Latencia de la búsqueda de texto (AvanceRepository.search_jobs):
+    - con --sqlite, el índice en memoria de search_index.py (tiempo de carga y de
+      cada consulta, sin contar la lectura de las filas encontradas),
+    - con --mysql-database, la consulta sobre el índice FULLTEXT (migración 4).
+Las consultas por defecto usan palabras de benchmarks.data_generator, de más
+selectivas a más frecuentes.
+
+Uso:
+    python -m benchmarks.search --sqlite bench.sqlite3
+    python -m benchmarks.search --mysql-database bench --query "cañería cocina" --query asc
+"""
+import argparse
+import time
+from benchmarks.data_generator import add_target_arguments, open_target
+from benchmarks.harness import percentile
+from repositories import AvanceRepository
+from search_index import SearchIndex
+
+DEFAULT_ITERATIONS = 20
+DEFAULT_QUERIES = ["membrana impermeabilizar", "medidor gas", "cañería cocina", "ascensor", "asc", "trabajo"]
+
+
+def _latencies(search, query, iterations):
+    latencies = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        results = search(query)
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+    return len(results), latencies
+
+
+def run(search, queries, iterations=DEFAULT_ITERATIONS):
+    results = {}
+    for query in queries:
+        found, latencies = _latencies(search, query, iterations)
+        results[query] = {
+            'found': found,
+            'p50_ms': percentile(latencies, 50) * 1000,
+            'p95_ms': percentile(latencies, 95) * 1000,
+        }
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Latencia de la búsqueda de texto en trabajos.")
+    add_target_arguments(parser)
+    parser.add_argument("--query", action="append", default=None, help="Consulta (repetible).")
+    parser.add_argument("--iterations", type=int, default=DEFAULT_ITERATIONS)
+    args = parser.parse_args(argv)
+
+    db_manager = open_target(args)
+    try:
+        repo = AvanceRepository(db_manager)
+        if args.sqlite:
+            index = SearchIndex(repo)
+            start = time.perf_counter()
+            index.load()
+            print(f"Índice en memoria: {len(index)} trabajos cargados en {time.perf_counter() - start:.1f} s")
+            search = index.search
+        else:
+            search = repo.search_jobs
+        results = run(search, args.query or DEFAULT_QUERIES, args.iterations)
+    finally:
+        db_manager.close_connection()
+
+    print("{:<28} {:>10} {:>10} {:>10}".format("Consulta", "resultados", "p50 ms", "p95 ms"))
+    for query, r in results.items():
+        print("{:<28} {:>10} {:>10.1f} {:>10.1f}".format(query, r['found'], r['p50_ms'], r['p95_ms']))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,162 @@
+# benchmarks/startup.py
+"""
+Mide el arranque de la aplicación interactiva tal como la usa una persona:
+    - tiempo hasta el primer menú: desde que se lanza el proceso hasta que pide
+      "Seleccione una opción",
+    - tiempo hasta la primera consulta: desde el lanzamiento hasta que se muestra
+      la primera página de "Listar Trabajos" (incluye conectar al servidor).
+Se mide el punto de entrada de código fuente (python main.py) y, si existe, el
+ejecutable congelado con PyInstaller (perfil onedir: dist/main/main, onefile:
+dist/main). Usa la base de DB_CONFIG (o la réplica local, si está habilitada).
+
+Uso:
+    python -m benchmarks.startup
+    python -m benchmarks.startup --runs 10 --frozen dist/main/main.exe
+    python -m benchmarks.startup --no-source --frozen dist/main.exe
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_RUNS = 5
+DEFAULT_TIMEOUT = 60
+
+# Marcadores solo ASCII: la consola del ejecutable congelado puede no usar UTF-8.
+MENU_PROMPT = "Seleccione una opci"
+FIRST_PAGE = "--- TRABAJOS:"
+LIST_OPTION = re.compile(r"(\d+)\. Listar Trabajos\r?\n")
+EXIT_OPTION = re.compile(r"(\d+)\. Salir")
+
+
+class _Output:
+    """Acumula la salida del proceso en un hilo y permite esperar un texto."""
+    def __init__(self, stream):
+        self.text = ""
+        self._cond = threading.Condition()
+        self._closed = False
+        threading.Thread(target=self._read, args=(stream,), daemon=True).start()
+
+    def _read(self, stream):
+        while True:
+            chunk = os.read(stream.fileno(), 4096)
+            with self._cond:
+                if not chunk:
+                    self._closed = True
+                    self._cond.notify_all()
+                    return
+                self.text += chunk.decode("utf-8", "replace")
+                self._cond.notify_all()
+
+    def wait_for(self, marker, start_at, timeout):
+        """Espera a que 'marker' aparezca después de la posición start_at; devuelve su posición."""
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while True:
+                position = self.text.find(marker, start_at)
+                if position >= 0:
+                    return position
+                remaining = deadline - time.monotonic()
+                if self._closed or remaining <= 0:
+                    tail = self.text[-300:].strip()
+                    raise RuntimeError(f"No apareció '{marker}'. Últimas líneas:\n{tail}")
+                self._cond.wait(remaining)
+
+
+def measure(command, timeout=DEFAULT_TIMEOUT):
+    """
+    Lanza la aplicación y devuelve (segundos hasta el menú, segundos hasta la primera página).
+    """
+    env = dict(os.environ, PYTHONUNBUFFERED="1", PYTHONIOENCODING="utf-8")
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        command, cwd=ROOT, env=env, stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE, stderr=subprocess.STDOUT, bufsize=0
+    )
+    output = _Output(process.stdout)
+    try:
+        menu_at = output.wait_for(MENU_PROMPT, 0, timeout)
+        to_menu = time.perf_counter() - start
+        menu = output.text[:menu_at]
+        list_option, exit_option = LIST_OPTION.search(menu), EXIT_OPTION.search(menu)
+        if not list_option or not exit_option:
+            raise RuntimeError("No se encontraron las opciones del menú en la salida.")
+
+        process.stdin.write(f"{list_option.group(1)}\n".encode())
+        process.stdin.flush()
+        output.wait_for(FIRST_PAGE, menu_at, timeout)
+        to_query = time.perf_counter() - start
+
+        # Se sale del listado paginado y de la aplicación.
+        process.stdin.write(f"q\n{exit_option.group(1)}\n".encode())
+        process.stdin.flush()
+        process.wait(timeout)
+        return to_menu, to_query
+    finally:
+        if process.poll() is None:
+            process.kill()
+            process.wait()
+
+
+def default_frozen():
+    for candidate in (os.path.join("dist", "main", "main"), os.path.join("dist", "main")):
+        for path in (candidate + ".exe", candidate):
+            if os.path.isfile(os.path.join(ROOT, path)):
+                return os.path.join(ROOT, path)
+    return None
+
+
+def run(entry_points, runs, timeout=DEFAULT_TIMEOUT):
+    results = {}
+    for name, command in entry_points.items():
+        samples = [measure(command, timeout) for _ in range(runs)]
+        menus = [s[0] * 1000 for s in samples]
+        queries = [s[1] * 1000 for s in samples]
+        results[name] = {
+            'runs': runs,
+            'menu_median_ms': statistics.median(menus), 'menu_min_ms': min(menus),
+            'query_median_ms': statistics.median(queries), 'query_min_ms': min(queries),
+        }
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Tiempo hasta el primer menú y la primera consulta.")
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS)
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, help="Segundos por etapa.")
+    parser.add_argument("--frozen", metavar="EJECUTABLE", default=None,
+                        help="Ejecutable de PyInstaller (por defecto dist/main/main o dist/main).")
+    parser.add_argument("--no-source", action="store_true", help="No medir python main.py.")
+    args = parser.parse_args(argv)
+
+    entry_points = {}
+    if not args.no_source:
+        entry_points['fuente'] = [sys.executable, os.path.join(ROOT, "main.py")]
+    frozen = args.frozen or default_frozen()
+    if frozen:
+        entry_points[f"congelado ({os.path.relpath(frozen, ROOT)})"] = [frozen]
+    elif args.no_source:
+        print("No se encontró el ejecutable congelado: compile con pyinstaller main.spec o use --frozen.")
+        return 1
+
+    try:
+        results = run(entry_points, args.runs, args.timeout)
+    except RuntimeError as err:
+        print(f"Error: {err}")
+        return 1
+
+    print("{:<32} {:>6} {:>14} {:>12} {:>14} {:>12}".format(
+        "Punto de entrada", "N", "menú med. ms", "menú mín.", "consulta med.", "consulta mín."))
+    for name, r in results.items():
+        print("{:<32} {:>6} {:>14.0f} {:>12.0f} {:>14.0f} {:>12.0f}".format(
+            name, r['runs'], r['menu_median_ms'], r['menu_min_ms'], r['query_median_ms'], r['query_min_ms']))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,385 @@
+# cli.py
+"""
+Modo de comandos no interactivo para scripts y tareas programadas.
+
+Uso:
+    python main.py list --status Pendiente --building "Av. Rivadavia 1234" --json
+    python main.py add --title "Cambiar cerradura" --building Alpha --technician Cerrajero \\
+                       --status Pendiente --priority Alta --deadline 2025-03-01
+    python main.py update 42 --status Completado
+    python main.py delete 42 43 44
+    python main.py import trabajos.csv
+    python main.py export trabajos.csv.gz --status Pendiente
+    python main.py --batch operaciones.txt --json      # un comando por línea ('-' = stdin)
+
+En modo --batch todas las operaciones comparten una conexión y sus commits se
+agrupan (DatabaseManager.write_behind); con --atomic van en una sola transacción.
+"""
+import argparse
+import contextlib
+import json
+import shlex
+import sys
+from datetime import datetime
+from config import DB_CONFIG, LOOKUP_CACHE_TTL, PRIORIDADES_POSIBLES
+from db_manager import DatabaseManager
+from lookup_cache import LookupCache
+from repositories import (
+    ConsorcioRepository, GremioRepository, EstadoRepository,
+    DepartamentoRepository, AvanceRepository
+)
+from job_import import JobImporter, DATE_FORMAT
+from job_export import JobExporter, EXPORT_FORMATS, COMPRESSIONS
+from job_query import JobFilter, SORT_KEYS
+from transactions import TransactionRolledBack
+
+LIST_COLUMNS = ("ID", "Titulo", "building", "departmentUnit", "technician", "FechaFin", "status", "priority")
+
+
+class CommandError(Exception):
+    """Error de validación de un comando (argumentos o datos inexistentes)."""
+
+
+def _parse_date(value):
+    try:
+        return datetime.strptime(value, DATE_FORMAT).date()
+    except ValueError:
+        raise CommandError(f"Fecha inválida: {value}. Use YYYY-MM-DD.")
+
+
+def _job_filter(args):
+    return JobFilter(
+        building=args.building, technician=args.technician, status=args.status,
+        priority=args.priority, text=args.text,
+        deadline_from=_parse_date(args.deadline_from) if args.deadline_from else None,
+        deadline_to=_parse_date(args.deadline_to) if args.deadline_to else None,
+    )
+
+
+def _job_ids(values):
+    try:
+        return [int(v) for v in values]
+    except ValueError:
+        raise CommandError("Los IDs de trabajo deben ser números enteros.")
+
+
+class BatchCommands:
+    """
+    Ejecuta los comandos sobre los repositorios, sin InputHandler.
+    Cada método recibe los argumentos ya parseados y devuelve un diccionario
+    serializable con el resultado; lanza CommandError ante datos inválidos.
+    """
+    def __init__(self,
+                 avance_repo: AvanceRepository,
+                 consorcio_repo: ConsorcioRepository,
+                 gremio_repo: GremioRepository,
+                 estado_repo: EstadoRepository,
+                 departamento_repo: DepartamentoRepository):
+        self.avance_repo = avance_repo
+        self.consorcio_repo = consorcio_repo
+        self.gremio_repo = gremio_repo
+        self.estado_repo = estado_repo
+        self.departamento_repo = departamento_repo
+        self.importer = JobImporter(avance_repo, consorcio_repo, gremio_repo, estado_repo, departamento_repo)
+        self.exporter = JobExporter(avance_repo)
+
+    def run(self, args):
+        return getattr(self, f"cmd_{args.command}")(args)
+
+    def _iter_filtered(self, job_filter, sort, descending, limit):
+        """Recorre las páginas de find_jobs hasta 'limit' trabajos (None = todos)."""
+        after, remaining = None, limit
+        while remaining is None or remaining > 0:
+            page_size = 500 if remaining is None else min(remaining, 500)
+            jobs, after = self.avance_repo.find_jobs(
+                job_filter, sort=sort, descending=descending, after=after, limit=page_size
+            )
+            yield from jobs
+            if remaining is not None:
+                remaining -= len(jobs)
+            if after is None:
+                return
+
+    def cmd_list(self, args):
+        limit = None if args.all else args.limit
+        jobs = [
+            {column: job.get(column) for column in LIST_COLUMNS}
+            for job in self._iter_filtered(_job_filter(args), args.sort, not args.asc, limit)
+        ]
+        return {'count': len(jobs), 'jobs': jobs}
+
+    def cmd_add(self, args):
+        row = {
+            'Titulo': args.title, 'Descripcion': args.description, 'Edificio': args.building,
+            'Unidad': args.unit, 'Orden': args.order, 'Tecnico': args.technician,
+            'Estado': args.status, 'Prioridad': args.priority,
+            'FechaIni': args.start, 'FechaFin': args.deadline,
+        }
+        job_data, error = self.importer.prepare_row(row)
+        if error:
+            raise CommandError(error)
+        job_id = self.avance_repo.add_job(job_data)
+        if not job_id:
+            raise CommandError("No se pudo añadir el trabajo.")
+        return {'id': job_id if job_id is not True else None}
+
+    def cmd_update(self, args):
+        [job_id] = _job_ids([args.id])
+        current = self.avance_repo.get_job_by_id(job_id)
+        if not current:
+            raise CommandError(f"No se encontró ningún trabajo con ID {job_id}.")
+        if args.title is not None:
+            current.Titulo = args.title
+        if args.description is not None:
+            current.Descripcion = args.description
+        if args.deadline:
+            fecha_fin = _parse_date(args.deadline)
+            current.DiaFin, current.MesFin, current.AnioFin = fecha_fin.day, fecha_fin.month, fecha_fin.year
+        if args.building:
+            current.Consorcio_FK = self._lookup(self.consorcio_repo, args.building, "Edificio")
+            current.Departamento_FK = None
+        if args.unit:
+            edificio = args.building or self.consorcio_repo.get_name_by_id(current.Consorcio_FK)
+            department_id = self.importer.department_id(edificio, args.unit, args.order)
+            if department_id is None:
+                raise CommandError(f"Departamento no encontrado o ambiguo: {edificio} / {args.unit}")
+            current.Departamento_FK = department_id
+        elif args.whole_building:
+            current.Departamento_FK = None
+        if args.technician:
+            current.Gremio_FK = self._lookup(self.gremio_repo, args.technician, "Técnico")
+        if args.status:
+            current.Estado_FK = self._lookup(self.estado_repo, args.status, "Estado")
+        if args.priority:
+            current.Prioridad = args.priority
+
+        # Sin cambios no se escribe nada; update_job envía solo las columnas modificadas.
+        changed = list(current.changes())
+        if changed and not self.avance_repo.update_job(job_id, current):
+            raise CommandError(f"No se pudo actualizar el trabajo {job_id}.")
+        return {'id': job_id, 'changed': changed}
+
+    @staticmethod
+    def _lookup(repo, name, label):
+        value = repo.get_by_name(name)
+        if not value:
+            raise CommandError(f"{label} desconocido: {name}")
+        return value
+
+    def cmd_delete(self, args):
+        job_ids = _job_ids(args.ids)
+        result = self.avance_repo.delete_jobs_bulk(job_ids=job_ids)
+        if result is None:
+            raise CommandError("No se pudieron eliminar los trabajos.")
+        return {'deleted': result.affected}
+
+    def cmd_import(self, args):
+        try:
+            result = self.importer.import_file(args.path)
+        except (OSError, ValueError) as err:
+            raise CommandError(str(err))
+        return {
+            'total': result.total, 'inserted': result.inserted,
+            'errors': [{'line': line, 'error': message} for line, message in result.errors],
+        }
+
+    def cmd_export(self, args):
+        try:
+            result = self.exporter.export(
+                args.path, fmt=args.format, compression=args.compression, job_filter=_job_filter(args)
+            )
+        except ValueError as err:
+            raise CommandError(str(err))
+        except OSError as err:
+            raise CommandError(f"No se pudo escribir {args.path}: {err}")
+        if result is None:
+            raise CommandError("No se pudieron leer los trabajos a exportar.")
+        return {'exported': result.rows, 'path': result.path, 'format': result.format}
+
+
+def _add_filter_arguments(parser):
+    """Criterios de JobFilter; los que admiten varios valores se repiten."""
+    parser.add_argument("--building", action="append")
+    parser.add_argument("--technician", action="append")
+    parser.add_argument("--status", action="append")
+    parser.add_argument("--priority", action="append", choices=PRIORIDADES_POSIBLES)
+    parser.add_argument("--text")
+    parser.add_argument("--from", dest="deadline_from", metavar="YYYY-MM-DD")
+    parser.add_argument("--to", dest="deadline_to", metavar="YYYY-MM-DD")
+
+
+def build_parser(parser_class=argparse.ArgumentParser):
+    # Los subcomandos se crean con la misma clase que el parser principal.
+    parser = parser_class(
+        prog="main.py", description="Gestión de mantenimiento de edificios (modo comandos)."
+    )
+    parser.add_argument("--json", action="store_true", help="Resultados en JSON (uno por línea).")
+    parser.add_argument("--batch", metavar="ARCHIVO",
+                        help="Ejecuta un comando por línea del archivo ('-' para stdin).")
+    parser.add_argument("--atomic", action="store_true",
+                        help="Con --batch: todo en una transacción (si algo falla, no se aplica nada).")
+    parser.add_argument("--stop-on-error", action="store_true", help="Con --batch: se detiene al primer error.")
+    subparsers = parser.add_subparsers(dest="command")
+
+    list_parser = subparsers.add_parser("list", help="Lista trabajos.")
+    _add_filter_arguments(list_parser)
+    list_parser.add_argument("--sort", choices=sorted(SORT_KEYS), default="deadline")
+    list_parser.add_argument("--asc", action="store_true", help="Orden ascendente.")
+    list_parser.add_argument("--limit", type=int, default=50)
+    list_parser.add_argument("--all", action="store_true", help="Sin límite de filas.")
+
+    add_parser = subparsers.add_parser("add", help="Añade un trabajo.")
+    add_parser.add_argument("--title", required=True)
+    add_parser.add_argument("--description", default="")
+    add_parser.add_argument("--building", required=True)
+    add_parser.add_argument("--unit")
+    add_parser.add_argument("--order")
+    add_parser.add_argument("--technician", required=True)
+    add_parser.add_argument("--status", required=True)
+    add_parser.add_argument("--priority", required=True, choices=PRIORIDADES_POSIBLES)
+    add_parser.add_argument("--start", metavar="YYYY-MM-DD")
+    add_parser.add_argument("--deadline", required=True, metavar="YYYY-MM-DD")
+
+    update_parser = subparsers.add_parser("update", help="Actualiza los campos indicados de un trabajo.")
+    update_parser.add_argument("id")
+    update_parser.add_argument("--title")
+    update_parser.add_argument("--description")
+    update_parser.add_argument("--building")
+    update_parser.add_argument("--unit")
+    update_parser.add_argument("--order")
+    update_parser.add_argument("--whole-building", action="store_true", help="Quita el departamento.")
+    update_parser.add_argument("--technician")
+    update_parser.add_argument("--status")
+    update_parser.add_argument("--priority", choices=PRIORIDADES_POSIBLES)
+    update_parser.add_argument("--deadline", metavar="YYYY-MM-DD")
+
+    delete_parser = subparsers.add_parser("delete", help="Elimina trabajos por ID.")
+    delete_parser.add_argument("ids", nargs="+")
+
+    import_parser = subparsers.add_parser("import", help="Importa trabajos desde CSV o JSONL.")
+    import_parser.add_argument("path")
+
+    export_parser = subparsers.add_parser("export", help="Exporta trabajos a CSV, JSONL, Parquet o .jcol.")
+    export_parser.add_argument("path", help="El formato y la compresión se deducen de la extensión (p. ej. .csv.gz).")
+    export_parser.add_argument("--format", choices=EXPORT_FORMATS)
+    export_parser.add_argument("--compression", choices=COMPRESSIONS)
+    _add_filter_arguments(export_parser)
+    return parser
+
+
+class _ArgumentError(Exception):
+    pass
+
+
+class _BatchParser(argparse.ArgumentParser):
+    """En modo --batch un error de sintaxis en una línea no debe terminar el proceso."""
+    def error(self, message):
+        raise _ArgumentError(message)
+
+    def exit(self, status=0, message=None):
+        raise _ArgumentError(message or "ayuda mostrada")
+
+
+def _emit(output, as_json, label, ok, payload):
+    if as_json:
+        output.write(json.dumps({'command': label, 'ok': ok, **payload}, default=str, ensure_ascii=False) + "\n")
+        return
+    if not ok:
+        output.write(f"[ERROR] {label}: {payload['error']}\n")
+    elif 'jobs' in payload:
+        for job in payload['jobs']:
+            output.write("\t".join("" if job[c] is None else str(job[c]) for c in LIST_COLUMNS) + "\n")
+        output.write(f"{payload['count']} trabajos.\n")
+    else:
+        details = ", ".join(f"{k}={v}" for k, v in payload.items() if k != 'errors')
+        output.write(f"[OK] {label}: {details}\n")
+        for error in payload.get('errors', []):
+            output.write(f"  línea {error['line']}: {error['error']}\n")
+    output.flush()
+
+
+def _execute(commands, args, output, label):
+    """Ejecuta un comando y emite su resultado; devuelve True si tuvo éxito."""
+    # Los repositorios informan sus errores con print: se desvían a stderr para no
+    # mezclarlos con la salida (en especial con --json).
+    try:
+        with contextlib.redirect_stdout(sys.stderr):
+            payload = commands.run(args)
+    except CommandError as err:
+        _emit(output, args.json, label, False, {'error': str(err)})
+        return False
+    _emit(output, args.json, label, True, payload)
+    return True
+
+
+def _batch_lines(path):
+    stream = sys.stdin if path == "-" else open(path, encoding="utf-8")
+    try:
+        for line_number, line in enumerate(stream, start=1):
+            line = line.strip()
+            if line and not line.startswith("#"):
+                yield line_number, line
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+
+def run_batch(db_manager, commands, options, output):
+    """Ejecuta los comandos del archivo de --batch sobre una sola conexión."""
+    line_parser = build_parser(_BatchParser)
+
+    failures = 0
+    scope = db_manager.transaction() if options.atomic else db_manager.write_behind()
+    try:
+        with scope:
+            for line_number, line in _batch_lines(options.batch):
+                label = f"{line_number}: {line}"
+                try:
+                    args = line_parser.parse_args(shlex.split(line))
+                    if args.command is None:
+                        raise _ArgumentError("falta el comando")
+                except (_ArgumentError, ValueError) as err:
+                    _emit(output, options.json, label, False, {'error': f"Comando inválido: {err}"})
+                    ok = False
+                else:
+                    args.json = options.json
+                    ok = _execute(commands, args, output, label)
+                if not ok:
+                    failures += 1
+                    if options.stop_on_error or options.atomic:
+                        break
+            if options.atomic and failures:
+                raise TransactionRolledBack("Se revirtió el lote por errores.")
+    except TransactionRolledBack as err:
+        _emit(output, options.json, "batch", False, {'error': str(err)})
+        failures = failures or 1
+    except db_manager.Error as err:
+        _emit(output, options.json, "batch", False, {'error': f"Error de base de datos: {err}"})
+        failures = failures or 1
+    return failures
+
+
+def main(argv=None, output=None):
+    output = output or sys.stdout
+    parser = build_parser()
+    options = parser.parse_args(argv)
+    if options.command is None and not options.batch:
+        parser.error("indique un comando o --batch ARCHIVO")
+
+    db_manager = DatabaseManager(DB_CONFIG)
+    lookup_cache = LookupCache(db_manager, ttl=LOOKUP_CACHE_TTL)
+    commands = BatchCommands(
+        AvanceRepository(db_manager, lookup_cache),
+        ConsorcioRepository(db_manager, lookup_cache),
+        GremioRepository(db_manager, lookup_cache),
+        EstadoRepository(db_manager, lookup_cache),
+        DepartamentoRepository(db_manager),
+    )
+    try:
+        if options.batch:
+            failures = run_batch(db_manager, commands, options, output)
+        else:
+            failures = 0 if _execute(commands, options, output, options.command) else 1
+    finally:
+        db_manager.close_connection()
+    return 1 if failures else 0
@@ -10,6 +10,114 @@ DB_CONFIG = {
     'port': 3306              # Puerto estándar de MySQL
 }
 
+# --- POOL DE CONEXIONES ---
+# min_size/max_size: conexiones mantenidas abiertas / máximo simultáneo.
+# health_check_interval: segundos de inactividad tras los que se hace ping a una conexión libre.
+# max_lifetime: segundos tras los que una conexión se cierra y se reemplaza.
+# acquire_timeout: segundos de espera máxima por una conexión libre.
+POOL_CONFIG = {
+    'min_size': 1,
+    'max_size': 5,
+    'health_check_interval': 60,
+    'max_lifetime': 1800,
+    'acquire_timeout': 10
+}
+
+# --- INSTRUMENTACIÓN DE CONSULTAS ---
+# Con 'enabled' se mide cada sentencia (latencia, filas) y la espera por conexiones;
+# las que superan 'slow_query_ms' se anotan en 'slow_log_path'. Al salir, las métricas
+# se exportan a 'export_path' (texto de Prometheus si termina en .prom, si no JSON).
+INSTRUMENTATION = {
+    'enabled': False,
+    'slow_query_ms': 200,
+    'slow_log_path': 'consultas_lentas.log',
+    'export_path': 'metricas_db.json'
+}
+
+# --- SENTENCIAS PREPARADAS ---
+# Sentencias preparadas que se conservan por conexión del pool (LRU); 0 las desactiva.
+# Desactivadas por defecto: mysql.connector (puro y extensión C) envía un
+# COM_STMT_RESET antes de cada ejecución, así que cada consulta preparada cuesta dos
+# viajes al servidor contra uno del protocolo de texto. Solo conviene activarlas si
+# benchmarks/prepared_statements.py, corrido sobre el enlace real, muestra que
+# ahorrar el análisis compensa el viaje extra (p. ej. servidor local por socket).
+STATEMENT_CACHE_SIZE = 0
+
+# --- CACHÉ DE TABLAS DE CONSULTA ---
+# Segundos que se conservan en memoria Consorcios, Gremios y Estado antes de recargarlos.
+LOOKUP_CACHE_TTL = 300
+
+# --- LECTURA EN STREAMING ---
+# Filas que se traen del servidor por cada fetchmany() al recorrer listados grandes.
+STREAM_BATCH_SIZE = 500
+
+# --- REFRESCO INCREMENTAL DEL LISTADO ---
+# Segundos que se retrocede la marca de agua al pedir cambios, para no perder filas
+# modificadas por transacciones que confirmaron después de la última lectura.
+JOB_CACHE_WATERMARK_LAG = 5
+
+# --- IMPORTACIÓN EN BLOQUE ---
+# Filas por cada INSERT multi-fila al importar trabajos (todas en una sola transacción).
+BULK_CHUNK_SIZE = 500
+
+# --- EXPORTACIÓN ---
+# Filas que se acumulan antes de escribirlas: un grupo de filas en los formatos
+# columnares, una escritura en CSV/JSONL. Acota la memoria de la exportación.
+EXPORT_BATCH_SIZE = 5000
+
+# --- BÚSQUEDA DE TEXTO ---
+# Resultados por búsqueda. En el índice en memoria de la réplica local (search_index.py)
+# las palabras del título pesan SEARCH_TITLE_WEIGHT veces más que las de la descripción
+# y las de SEARCH_MIN_PREFIX letras o más también buscan por prefijo, con todas las
+# palabras del índice que empiecen así (las más cortas solo coinciden exactas).
+SEARCH_LIMIT = 50
+SEARCH_TITLE_WEIGHT = 2
+SEARCH_MIN_PREFIX = 3
+
+# --- TABLERO ---
+# Con 'use_summary' los conteos por estado salen de la tabla ResumenAvance (migración 5)
+# en lugar de agrupar Avance; 'top' limita las filas por edificio y por técnico.
+# Los trabajos en ESTADOS_CERRADOS no cuentan como pendientes ni como vencidos.
+DASHBOARD = {
+    'use_summary': True,
+    'top': 15
+}
+ESTADOS_CERRADOS = ["Completado", "Cancelado"]
+
+# --- ALERTAS DE VENCIMIENTO ---
+# Con 'enabled' el menú principal avisa cuántos trabajos abiertos están vencidos y
+# cuántos vencen en los próximos 'days' días, y muestra los 'top' más urgentes.
+# Si la carga del índice falla se reintenta pasados 'retry_seconds' segundos.
+ALERTS = {
+    'enabled': True,
+    'days': 7,
+    'top': 3,
+    'retry_seconds': 60
+}
+
+# --- ESCRITURA DIFERIDA ---
+# Con DatabaseManager.write_behind(), los commits se agrupan: se confirma cada
+# tantas escrituras o a los tantos segundos de la primera pendiente.
+WRITE_BEHIND_MAX_DELAY = 0.5
+WRITE_BEHIND_MAX_WRITES = 500
+
+# --- CONSULTAS EN SEGUNDO PLANO ---
+# Hilos que precargan las listas de los formularios mientras el usuario escribe.
+PREFETCH_WORKERS = 4
+
+# --- LISTADO PAGINADO ---
+# Trabajos por página y páginas visitadas que se conservan en memoria (LRU).
+PAGER_PAGE_SIZE = 20
+PAGER_CACHE_PAGES = 8
+
+# --- RÉPLICA LOCAL (MODO SIN CONEXIÓN) ---
+# Con 'enabled' las lecturas se sirven desde una copia SQLite en 'path' y las
+# escrituras se encolan hasta sincronizar con el servidor.
+OFFLINE_MIRROR = {
+    'enabled': False,
+    'path': 'replica_local.sqlite3'
+}
+
 # --- ESTADOS POSIBLES ---
 ESTADOS_POSIBLES = ["Pendiente", "En Progreso", "Completado", "Cancelado", "Revisión"]
 
@@ -1,63 +1,332 @@
 # db_manager.py
-import mysql.connector
-from config import DB_CONFIG
+import threading
+import time
+from contextlib import contextmanager
+from config import DB_CONFIG, POOL_CONFIG, STATEMENT_CACHE_SIZE
+from transactions import TransactionMixin
+from statement_cache import StatementCacheRegistry
+from instrumentation import InstrumentedConnection, QueryStats
+from models import row_mapper
 """ Codigo copiado de motores externos e IA"""
-class DatabaseManager:
+
+_mysql = None
+
+
+def _driver():
     """
-    Gestiona la conexión y desconexión a la base de datos MySQL.
+    mysql.connector se importa en el primer uso y no al cargar el módulo: es la
+    importación más pesada del arranque y el menú no la necesita para mostrarse.
     """
-    def __init__(self, db_config):
-        """
-        Inicializa  la configuración de la Base de Datos.
-        """
+    global _mysql
+    if _mysql is None:
+        import mysql.connector
+        _mysql = mysql.connector
+    return _mysql
+
+
+class _DriverAttribute:
+    """Atributo de clase que resuelve un nombre de mysql.connector recién al leerlo."""
+    def __init__(self, name):
+        self.name = name
+
+    def __get__(self, instance, owner):
+        return getattr(_driver(), self.name)
+
+
+class _PooledConnection:
+    """
+    Envoltorio interno de una conexión del pool con sus marcas de tiempo.
+    """
+    __slots__ = ("raw", "created_at", "last_used", "proxy")
+
+    def __init__(self, raw):
+        self.raw = raw
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+        self.proxy = None   # InstrumentedConnection, si hay instrumentación
+
+
+class ConnectionPool:
+    """
+    Pool de conexiones MySQL seguro entre hilos.
+    Mantiene entre min_size y max_size conexiones, descarta las que superan
+    max_lifetime y verifica las inactivas con un ping periódico en segundo plano,
+    en lugar de hacer un ping en cada préstamo.
+    """
+    def __init__(self, db_config, min_size=1, max_size=5, health_check_interval=60,
+                 max_lifetime=1800, acquire_timeout=10):
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise ValueError("Tamaños de pool inválidos: se requiere 0 <= min_size <= max_size y max_size >= 1.")
         self.db_config = db_config
-        self._connection = None
+        self.min_size = min_size
+        self.max_size = max_size
+        self.health_check_interval = health_check_interval
+        self.max_lifetime = max_lifetime
+        self.acquire_timeout = acquire_timeout
+
+        self._idle = []          # Conexiones libres (LIFO: la más reciente está "caliente")
+        self._size = 0           # Conexiones abiertas (libres + prestadas)
+        self._closed = False
+        self._cond = threading.Condition()
+
+        for _ in range(min_size):
+            self._idle.append(self._open())
+            self._size += 1
+
+        self._stop = threading.Event()
+        self._health_thread = None
+        if health_check_interval:
+            self._health_thread = threading.Thread(
+                target=self._health_loop, name="db-pool-health", daemon=True
+            )
+            self._health_thread.start()
+
+    def _open(self):
+        # Con autocommit las lecturas no dejan una instantánea abierta en la conexión
+        # que vuelve al pool; las transacciones explícitas usan start_transaction().
+        config = {'autocommit': True, **self.db_config}
+        return _PooledConnection(_driver().connect(**config))
 
-    def get_connection(self):
+    def _expired(self, pooled, now):
+        return bool(self.max_lifetime) and now - pooled.created_at > self.max_lifetime
+
+    @staticmethod
+    def _close_quietly(pooled):
+        try:
+            pooled.raw.close()
+        except _driver().Error:
+            pass
+
+    def acquire(self):
         """
-        Establece y devuelve una conexión a la base de datos.
-        Si la conexión ya existe y está activa, la devuelve.
+        Presta una conexión del pool. Bloquea hasta acquire_timeout segundos si
+        ya se alcanzó max_size. Lanza el Error del driver si no puede conectar.
         """
-        if self._connection and self._connection.is_connected():
-            return self._connection
+        deadline = time.monotonic() + self.acquire_timeout
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise _driver().InterfaceError("El pool de conexiones está cerrado.")
+                now = time.monotonic()
+                while self._idle:
+                    pooled = self._idle.pop()
+                    if self._expired(pooled, now):
+                        self._size -= 1
+                        self._close_quietly(pooled)
+                        continue
+                    return pooled
+                if self._size < self.max_size:
+                    self._size += 1
+                    break
+                remaining = deadline - now
+                if remaining <= 0:
+                    raise _driver().PoolError("No hay conexiones disponibles en el pool.")
+                self._cond.wait(remaining)
+
+        # La conexión nueva se abre fuera del lock para no bloquear al resto de hilos.
         try:
-            self._connection = mysql.connector.connect(**self.db_config)
-            return self._connection
-        except mysql.connector.Error as err:
-            print(f"Error al conectar a la base de datos: {err}")
-            self._connection = None  # Asegurarse de que no queda una conexión rota
-            return None
+            return self._open()
+        except BaseException:
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            raise
 
-    def close_connection(self):
+    def release(self, pooled, discard=False):
         """
-        Cierra la conexión a la base de datos si está abierta.
+        Devuelve una conexión al pool. Con discard=True (o si expiró) se cierra.
         """
-        if self._connection and self._connection.is_connected():
-            self._connection.close()
-            self._connection = None
-            # print("Conexión a la base de datos cerrada.")
+        now = time.monotonic()
+        with self._cond:
+            if discard or self._closed or self._expired(pooled, now):
+                self._size -= 1
+                self._close_quietly(pooled)
+            else:
+                pooled.last_used = now
+                self._idle.append(pooled)
+            self._cond.notify()
 
-    def get_cursor(self, dictionary=False):
+    def _health_loop(self):
+        while not self._stop.wait(self.health_check_interval):
+            self._check_idle()
+
+    def _check_idle(self):
+        """
+        Hace ping a las conexiones que llevan inactivas al menos un intervalo,
+        descarta las rotas o expiradas y repone hasta min_size.
+        """
+        now = time.monotonic()
+        with self._cond:
+            to_check = [p for p in self._idle if now - p.last_used >= self.health_check_interval]
+            for pooled in to_check:
+                self._idle.remove(pooled)
+
+        for pooled in to_check:
+            healthy = not self._expired(pooled, now)
+            if healthy:
+                try:
+                    pooled.raw.ping(reconnect=False)
+                except _driver().Error:
+                    healthy = False
+            if healthy:
+                pooled.last_used = time.monotonic()
+                with self._cond:
+                    if not self._closed:
+                        self._idle.append(pooled)
+                        self._cond.notify()
+                        continue
+            self.release(pooled, discard=True)
+
+        while True:
+            with self._cond:
+                if self._closed or self._size >= self.min_size:
+                    return
+                self._size += 1
+            try:
+                pooled = self._open()
+            except _driver().Error:
+                with self._cond:
+                    self._size -= 1
+                return
+            self.release(pooled)
+
+    def close_all(self):
+        """Cierra todas las conexiones libres; las prestadas se cierran al devolverse."""
+        self._stop.set()
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._size -= len(idle)
+            self._cond.notify_all()
+        for pooled in idle:
+            self._close_quietly(pooled)
+
+
+class DatabaseManager(TransactionMixin):
+    """
+    Gestiona las conexiones a la base de datos MySQL a través de un pool.
+    Los repositorios toman una conexión con el context manager connection()
+    y la devuelven al salir, por lo que pueden compartirse entre hilos.
+    Error es la excepción base del motor, para que los repositorios no dependan del driver.
+    transaction() y write_behind() (de TransactionMixin) agrupan varias escrituras.
+    """
+    Error = _DriverAttribute("Error")
+
+    def __init__(self, db_config, pool_config=None, statement_cache_size=STATEMENT_CACHE_SIZE,
+                 instrumentation: QueryStats = None):
+        """
+        Inicializa  la configuración de la Base de Datos y del pool.
+        El pool se crea de forma perezosa en la primera conexión.
+        Con 'instrumentation' (QueryStats) las conexiones prestadas entregan cursores
+        que registran latencia y filas de cada sentencia, y se mide la espera del pool.
+        """
+        self.db_config = db_config
+        self.pool_config = dict(POOL_CONFIG if pool_config is None else pool_config)
+        self._pool = None
+        self._pool_lock = threading.Lock()
+        self._tx_local = threading.local()
+        self.statement_caches = StatementCacheRegistry(statement_cache_size) if statement_cache_size else None
+        self.instrumentation = instrumentation
+
+    def _get_pool(self):
+        if self._pool is None:
+            with self._pool_lock:
+                if self._pool is None:
+                    self._pool = ConnectionPool(self.db_config, **self.pool_config)
+        return self._pool
+
+    def warm_up(self):
         """
-        Obtiene un cursor de la conexión actual.
+        Importa el driver y abre el pool en un hilo aparte, para que la conexión
+        TCP/TLS se establezca mientras se muestra el menú y no en la primera
+        consulta. Si falla no se informa aquí: el primer connection() lo reintenta
+        y muestra el error. Devuelve el hilo.
         """
-        conn = self.get_connection()
-        if conn:
-            return conn.cursor(dictionary=dictionary)
-        return None
+        def open_pool():
+            try:
+                self._get_pool()
+            except Exception:
+                pass
+
+        thread = threading.Thread(target=open_pool, name="db-warm-up", daemon=True)
+        thread.start()
+        return thread
 
-    def commit(self):
+    @contextmanager
+    def _lend(self):
+        """
+        Presta una conexión del pool durante el bloque 'with' y la devuelve al salir.
+        Entrega None si no se pudo conectar.
+        Si el bloque termina con una excepción se revierte la transacción pendiente;
+        si el rollback falla o quedaron filas sin leer, la conexión se descarta.
+        """
+        try:
+            pool = self._get_pool()
+            start = time.perf_counter()
+            pooled = pool.acquire()
+            if self.instrumentation is not None:
+                self.instrumentation.record_acquire(time.perf_counter() - start)
+        except _driver().Error as err:
+            print(f"Error al conectar a la base de datos: {err}")
+            yield None
+            return
+
+        discard = False
+        try:
+            yield self._lent(pooled)
+        except BaseException:
+            # Un cursor sin buffer abandonado a mitad deja filas sin leer: no se
+            # drena la conexión, se descarta (lo mismo si el rollback falla).
+            if not pooled.raw.unread_result:
+                try:
+                    pooled.raw.rollback()
+                except _driver().Error:
+                    discard = True
+            raise
+        finally:
+            pool.release(pooled, discard=discard or pooled.raw.unread_result)
+
+    def _lent(self, pooled):
+        """Conexión que ven los repositorios: la física o su envoltorio instrumentado."""
+        if self.instrumentation is None:
+            return pooled.raw
+        if pooled.proxy is None:
+            pooled.proxy = InstrumentedConnection(pooled.raw, self.instrumentation)
+        return pooled.proxy
+
+    def close_connection(self):
         """
-        Confirma los cambios pendientes en la base de datos.
+        Cierra todas las conexiones del pool si está abierto.
         """
-        conn = self.get_connection()
-        if conn:
-            conn.commit()
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.close_all()
+                self._pool = None
+                # print("Conexiones a la base de datos cerradas.")
 
-    def rollback(self):
+    def execute_prepared(self, conn, sql, params=(), dictionary=False, model=None):
         """
-        Revierte los cambios pendientes en la base de datos.
+        Ejecuta una consulta frecuente y devuelve todas sus filas, como tuplas, como
+        diccionarios o, con 'model', como objetos de models.py. Sin caché de
+        sentencias (STATEMENT_CACHE_SIZE = 0, el valor por defecto) usa un cursor
+        común: un solo viaje por el protocolo de texto. Con caché la ejecuta como
+        sentencia preparada de la conexión (el servidor la analiza una sola vez,
+        pero el driver agrega un COM_STMT_RESET por ejecución).
+        Los errores del motor se propagan como self.Error.
         """
-        conn = self.get_connection()
-        if conn:
-            conn.rollback()
+        if self.statement_caches is None:
+            cursor = conn.cursor()
+            try:
+                cursor.execute(sql, params)
+                rows = cursor.fetchall()
+                columns = [col[0] for col in cursor.description] if cursor.description else []
+            finally:
+                cursor.close()
+        else:
+            cache = self.statement_caches.for_connection(conn)
+            columns, rows = cache.execute(conn, sql, params, error_class=self.Error)
+        if model is not None:
+            return list(map(row_mapper(model, columns), rows))
+        if dictionary:
+            return [dict(zip(columns, row)) for row in rows]
+        return rows
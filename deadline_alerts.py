@@ -0,0 +1,178 @@
+# deadline_alerts.py
+import threading
+import time
+from bisect import bisect_left, insort
+from datetime import date, timedelta
+from config import ALERTS, ESTADOS_CERRADOS, PRIORIDADES_POSIBLES
+from prefetch import PrefetchExecutor
+from repositories import AvanceRepository
+
+# Rango de cada prioridad para desempatar la misma fecha límite: la más alta primero.
+PRIORITY_RANK = {priority: rank for rank, priority in enumerate(reversed(PRIORIDADES_POSIBLES))}
+
+
+def _urgency_key(job):
+    return (job.FechaFin, PRIORITY_RANK.get(job.priority, len(PRIORITY_RANK)), job.ID)
+
+
+class DeadlineSummary:
+    """Resultado de DeadlineAlerts.summary(): conteos y los trabajos más urgentes."""
+    __slots__ = ('overdue', 'due_soon', 'days', 'urgent')
+
+    def __init__(self, overdue, due_soon, days, urgent):
+        self.overdue = overdue
+        self.due_soon = due_soon
+        self.days = days
+        self.urgent = urgent
+
+
+class DeadlineAlerts:
+    """
+    Índice en memoria de los trabajos abiertos (estado fuera de closed_statuses) con
+    fecha límite, ordenados por (FechaFin, prioridad, ID). La lista ordenada cumple
+    la propiedad de un min-heap y además permite contar con bisect: los vencidos y
+    los que vencen en N días salen en O(log n) y los K más urgentes en O(K), sin
+    consultar la base en cada render del menú.
+
+    Se carga con una sola consulta (AvanceRepository.get_open_deadlines) y luego se
+    mantiene con apply_change(), que se registra como listener de cambios del
+    repositorio. Con un prefetcher la carga se hace en segundo plano y summary()
+    devuelve None hasta que termina, así el menú no espera. Si la carga falla (por
+    ejemplo, la base no responde) no se vuelve a consultar hasta pasados
+    retry_seconds, para no repetir el error en cada render.
+    """
+    def __init__(self,
+                 avance_repo: AvanceRepository,
+                 prefetcher: PrefetchExecutor = None,
+                 closed_statuses=ESTADOS_CERRADOS,
+                 retry_seconds=ALERTS['retry_seconds']):
+        self.avance_repo = avance_repo
+        self.prefetcher = prefetcher
+        self.closed_statuses = list(closed_statuses)
+        self.retry_seconds = retry_seconds
+        self._keys = None               # (FechaFin, prioridad, ID) ordenadas
+        self._jobs = {}                 # ID -> Job, para mostrar y para quitarlo
+        self._loading = None            # Future de la carga en segundo plano
+        self._failed_at = None          # time.monotonic() del último fallo de carga
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._jobs)
+
+    def invalidate(self):
+        """Descarta el índice; se vuelve a cargar en la próxima consulta."""
+        with self._lock:
+            self._keys = None
+            self._jobs = {}
+            self._failed_at = None
+
+    def load(self):
+        """
+        Carga el índice si no está cargado. Devuelve False si falló la consulta o si
+        falló hace menos de retry_seconds.
+        """
+        with self._lock:
+            return self._ensure_loaded()
+
+    def _retry_due(self):
+        return self._failed_at is None or time.monotonic() - self._failed_at >= self.retry_seconds
+
+    def _ensure_loaded(self):
+        if self._keys is not None:
+            return True
+        if not self._retry_due():
+            return False
+        jobs = self.avance_repo.get_open_deadlines(self.closed_statuses)
+        if jobs is None:
+            self._failed_at = time.monotonic()
+            return False
+        self._failed_at = None
+        self._jobs = {job.ID: job for job in jobs}
+        self._keys = sorted(map(_urgency_key, jobs))
+        return True
+
+    def _is_open(self, job):
+        return job.FechaFin is not None and job.status not in self.closed_statuses
+
+    def _add(self, job):
+        self._jobs[job.ID] = job
+        insort(self._keys, _urgency_key(job))
+
+    def _remove(self, job_id):
+        job = self._jobs.pop(job_id, None)
+        if job is None:
+            return
+        key = _urgency_key(job)
+        position = bisect_left(self._keys, key)
+        if position < len(self._keys) and self._keys[position] == key:
+            del self._keys[position]
+
+    def apply_change(self, operation, job_ids):
+        """
+        Listener de AvanceRepository.add_change_listener: vuelve a leer los trabajos
+        agregados o modificados (solo esos IDs) y quita los eliminados o cerrados.
+        Sin IDs (cambio en bloque sin detalle) se descarta el índice.
+        """
+        with self._lock:
+            if self._keys is None:
+                return  # Todavía no se cargó: tomará los cambios al cargarse
+            if job_ids is None:
+                self._keys, self._jobs = None, {}
+                return
+            for job_id in job_ids:
+                self._remove(job_id)
+            if operation != 'delete':
+                for job in self.avance_repo.get_jobs_by_ids(job_ids):
+                    if self._is_open(job):
+                        self._add(job)
+
+    def _count_before(self, day):
+        return bisect_left(self._keys, (day,))
+
+    def overdue(self, today=None):
+        """Cantidad de trabajos abiertos con fecha límite anterior a 'today'."""
+        with self._lock:
+            if not self._ensure_loaded():
+                return None
+            return self._count_before(today or date.today())
+
+    def due_within(self, days, today=None):
+        """Cantidad de trabajos abiertos que vencen entre 'today' y 'days' días después."""
+        today = today or date.today()
+        with self._lock:
+            if not self._ensure_loaded():
+                return None
+            return self._count_before(today + timedelta(days=days + 1)) - self._count_before(today)
+
+    def most_urgent(self, k):
+        """Los k trabajos abiertos de fecha límite más próxima (o más vencida)."""
+        with self._lock:
+            if not self._ensure_loaded():
+                return None
+            return [self._jobs[job_id] for _, _, job_id in self._keys[:k]]
+
+    def summary(self, days=ALERTS['days'], top=ALERTS['top'], today=None):
+        """
+        Vencidos, los que vencen en 'days' días y los 'top' más urgentes en un solo
+        paso. No espera: None si el índice se está cargando o no se pudo cargar
+        (tras un error se vuelve a intentar pasados retry_seconds).
+        """
+        today = today or date.today()
+        if not self._lock.acquire(blocking=False):
+            return None  # Se está cargando (o actualizando) en otro hilo
+        try:
+            if self._keys is None and self.prefetcher is not None:
+                pending = self._retry_due() and (self._loading is None or self._loading.done())
+            elif not self._ensure_loaded():
+                return None
+            else:
+                overdue = self._count_before(today)
+                due_soon = self._count_before(today + timedelta(days=days + 1)) - overdue
+                urgent = [self._jobs[job_id] for _, _, job_id in self._keys[:top]]
+                return DeadlineSummary(overdue, due_soon, days, urgent)
+        finally:
+            self._lock.release()
+        # La carga se lanza fuera del lock: tras shutdown() el prefetcher la ejecuta en este hilo.
+        if pending:
+            self._loading = self.prefetcher.submit(self.load)
+        return None
@@ -1,5 +1,6 @@
 # input_handler.py
 from datetime import datetime
+from prefetch import resolve
 
 class InputHandler:
     """
@@ -12,23 +13,28 @@ class InputHandler:
             return input(f"{prompt} (actual: {default_value}, dejar vacío para no cambiar): ") or default_value
         return input(prompt)
 
-    def get_choice_from_list(self, prompt_list, available_options, current_selection=None, allow_empty=False):
+    def get_choice_from_list(self, prompt_list, available_options, current_selection=None, allow_empty=False,
+                             labels=None):
         """
         Permite al usuario seleccionar una opción de una lista numerada.
         Args:
             prompt_list (str): El mensaje a mostrar antes de listar las opciones.
-            available_options (list): Una lista de cadenas de texto con las opciones disponibles.
+            available_options (list | Future): Una lista de cadenas de texto con las opciones disponibles,
+                o un Future que la devuelve (se espera recién al mostrar el menú).
             current_selection (str, optional): La opción actualmente seleccionada para mostrar como "actual".
             allow_empty (bool, optional): Si se permite al usuario dejar la entrada vacía.
+            labels (list, optional): Texto a mostrar por cada opción. Con labels, las opciones
+                pueden ser objetos cualquiera (p. ej. Department) y se devuelve el objeto elegido.
         Returns:
-            str: La opción seleccionada o None si se permite vacío y el usuario lo deja así.
+            La opción seleccionada o None si se permite vacío y el usuario lo deja así.
         """
+        available_options = resolve(available_options)
         if not available_options:
             print("No hay opciones disponibles.")
             return None
 
         print(prompt_list)
-        for i, opt in enumerate(available_options):
+        for i, opt in enumerate(labels if labels is not None else available_options):
             print(f"{i+1}. {opt}")
 
         while True:
@@ -0,0 +1,274 @@
+# instrumentation.py
+import json
+import re
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+# Límites superiores (en milisegundos) de los buckets de los histogramas.
+LATENCY_BUCKETS_MS = (0.5, 1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+_STRING_LITERAL = re.compile(r"'(?:[^'\\]|\\.)*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_sql(sql):
+    """
+    Reduce una sentencia a su forma genérica para agrupar métricas: sin literales,
+    con los parámetros como '?', las listas IN (?, ?, ...) colapsadas y espacios simples.
+    """
+    if isinstance(sql, bytes):
+        sql = sql.decode("utf-8", "replace")
+    sql = _STRING_LITERAL.sub("?", sql)
+    sql = sql.replace("%s", "?")
+    sql = _NUMBER_LITERAL.sub("?", sql)
+    sql = _PLACEHOLDER_LIST.sub("(?+)", sql)
+    return _WHITESPACE.sub(" ", sql).strip()
+
+
+class Histogram:
+    """Histograma acumulado de latencias con los buckets de LATENCY_BUCKETS_MS."""
+    __slots__ = ("counts", "count", "total_ms", "max_ms", "rows")
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)   # El último es +Inf
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.rows = 0
+
+    def observe(self, ms):
+        for i, bound in enumerate(LATENCY_BUCKETS_MS):
+            if ms <= bound:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.count += 1
+        self.total_ms += ms
+        if ms > self.max_ms:
+            self.max_ms = ms
+
+    def to_dict(self):
+        cumulative, buckets = 0, {}
+        for bound, count in zip(LATENCY_BUCKETS_MS + ("+Inf",), self.counts):
+            cumulative += count
+            buckets[str(bound)] = cumulative
+        return {
+            'count': self.count,
+            'total_ms': round(self.total_ms, 3),
+            'avg_ms': round(self.total_ms / self.count, 3) if self.count else 0.0,
+            'max_ms': round(self.max_ms, 3),
+            'rows': self.rows,
+            'buckets': buckets,
+        }
+
+
+class QueryStats:
+    """
+    Métricas de acceso a la base de datos: latencia y filas por sentencia
+    normalizada, latencia por acción del menú y tiempo de espera por una conexión
+    del pool. Las sentencias que superan slow_query_ms se agregan a slow_log_path.
+    Es seguro entre hilos.
+    """
+    def __init__(self, slow_query_ms=200, slow_log_path=None):
+        self.slow_query_ms = slow_query_ms
+        self.slow_log_path = slow_log_path
+        self.statements = {}    # sql normalizado -> Histogram
+        self.actions = {}       # acción del menú -> Histogram (tiempo en base de datos)
+        self.acquire = Histogram()
+        self.started_at = datetime.now()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    @contextmanager
+    def action(self, name):
+        """Atribuye a 'name' las sentencias que ejecute este hilo dentro del bloque."""
+        previous = getattr(self._local, "action", None)
+        self._local.action = name
+        try:
+            yield
+        finally:
+            self._local.action = previous
+
+    def record_acquire(self, seconds):
+        with self._lock:
+            self.acquire.observe(seconds * 1000)
+
+    def record_statement(self, sql, seconds, rows=0):
+        """Registra una ejecución; devuelve la clave normalizada para sumarle filas luego."""
+        key = normalize_sql(sql)
+        ms = seconds * 1000
+        action = getattr(self._local, "action", None)
+        with self._lock:
+            histogram = self.statements.get(key)
+            if histogram is None:
+                histogram = self.statements[key] = Histogram()
+            histogram.observe(ms)
+            histogram.rows += rows
+            if action is not None:
+                action_histogram = self.actions.get(action)
+                if action_histogram is None:
+                    action_histogram = self.actions[action] = Histogram()
+                action_histogram.observe(ms)
+                action_histogram.rows += rows
+        if self.slow_log_path and ms >= self.slow_query_ms:
+            self._log_slow(key, ms, action)
+        return key, action
+
+    def add_rows(self, key, action, rows):
+        """Suma filas leídas después del execute (fetch) a la sentencia y la acción."""
+        with self._lock:
+            histogram = self.statements.get(key)
+            if histogram is not None:
+                histogram.rows += rows
+            if action is not None and action in self.actions:
+                self.actions[action].rows += rows
+
+    def _log_slow(self, key, ms, action):
+        # Solo la sentencia normalizada: los parámetros pueden tener datos personales.
+        line = f"{datetime.now().isoformat(timespec='milliseconds')}\t{ms:.1f} ms\t{action or '-'}\t{key}\n"
+        with self._lock:
+            try:
+                with open(self.slow_log_path, "a", encoding="utf-8") as f:
+                    f.write(line)
+            except OSError as err:
+                print(f"Error al escribir el registro de consultas lentas: {err}")
+
+    # --- EXPORTACIÓN ---
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'started_at': self.started_at.isoformat(timespec="seconds"),
+                'taken_at': datetime.now().isoformat(timespec="seconds"),
+                'acquire': self.acquire.to_dict(),
+                'actions': {name: h.to_dict() for name, h in self.actions.items()},
+                'statements': {
+                    sql: h.to_dict()
+                    for sql, h in sorted(self.statements.items(), key=lambda item: -item[1].total_ms)
+                },
+            }
+
+    def to_prometheus(self):
+        """Snapshot en el formato de texto de exposición de Prometheus."""
+        snapshot = self.snapshot()
+        lines = []
+
+        def histogram(name, help_text, label_name, entries):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} histogram")
+            for label, data in entries:
+                labels = f'{label_name}="{_escape_label(label)}",' if label_name else ""
+                for bound, count in data['buckets'].items():
+                    lines.append(f'{name}_bucket{{{labels}le="{bound}"}} {count}')
+                plain = f"{{{labels[:-1]}}}" if labels else ""
+                lines.append(f"{name}_sum{plain} {data['total_ms']}")
+                lines.append(f"{name}_count{plain} {data['count']}")
+
+        def counter(name, help_text, label_name, entries):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} counter")
+            for label, data in entries:
+                lines.append(f'{name}{{{label_name}="{_escape_label(label)}"}} {data["rows"]}')
+
+        histogram("db_statement_duration_ms", "Latencia por sentencia normalizada.", "statement",
+                  snapshot['statements'].items())
+        counter("db_statement_rows_total", "Filas devueltas o afectadas por sentencia.", "statement",
+                snapshot['statements'].items())
+        histogram("db_action_duration_ms", "Tiempo en base de datos por acción del menú.", "action",
+                  snapshot['actions'].items())
+        histogram("db_pool_acquire_ms", "Espera por una conexión del pool.", None,
+                  [(None, snapshot['acquire'])])
+        return "\n".join(lines) + "\n"
+
+    def export(self, path):
+        """Escribe el snapshot en 'path': texto de Prometheus si termina en .prom, si no JSON."""
+        try:
+            with open(path, "w", encoding="utf-8") as f:
+                if path.endswith(".prom"):
+                    f.write(self.to_prometheus())
+                else:
+                    json.dump(self.snapshot(), f, indent=2, ensure_ascii=False)
+            return True
+        except OSError as err:
+            print(f"Error al exportar las métricas de base de datos: {err}")
+            return False
+
+
+def _escape_label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", " ")
+
+
+class InstrumentedCursor:
+    """Cursor que mide cada execute y cuenta las filas leídas; delega el resto."""
+    def __init__(self, cursor, stats):
+        self._cursor = cursor
+        self._stats = stats
+        self._key = None
+        self._action = None
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        for row in self._cursor:
+            self._count(1)
+            yield row
+
+    def _timed(self, method, sql, *args):
+        start = time.perf_counter()
+        try:
+            return method(sql, *args)
+        finally:
+            elapsed = time.perf_counter() - start
+            # Para INSERT/UPDATE/DELETE se cuentan las filas afectadas.
+            affected = 0
+            if self._cursor.description is None:
+                affected = max(getattr(self._cursor, "rowcount", 0) or 0, 0)
+            self._key, self._action = self._stats.record_statement(sql, elapsed, affected)
+
+    def execute(self, sql, params=(), *args, **kwargs):
+        return self._timed(lambda s, p: self._cursor.execute(s, p, *args, **kwargs), sql, params)
+
+    def executemany(self, sql, seq_params, *args, **kwargs):
+        return self._timed(lambda s, p: self._cursor.executemany(s, p, *args, **kwargs), sql, seq_params)
+
+    def _count(self, rows):
+        if self._key is not None and rows:
+            self._stats.add_rows(self._key, self._action, rows)
+
+    def fetchone(self):
+        row = self._cursor.fetchone()
+        self._count(1 if row is not None else 0)
+        return row
+
+    def fetchmany(self, *args, **kwargs):
+        rows = self._cursor.fetchmany(*args, **kwargs)
+        self._count(len(rows))
+        return rows
+
+    def fetchall(self):
+        rows = self._cursor.fetchall()
+        self._count(len(rows))
+        return rows
+
+
+class InstrumentedConnection:
+    """
+    Envoltorio de una conexión que entrega cursores instrumentados.
+    Se crea uno por conexión física, así la identidad de la conexión se mantiene
+    entre préstamos (la usan las transacciones y el caché de sentencias).
+    """
+    def __init__(self, raw, stats):
+        self.raw = raw
+        self._stats = stats
+
+    def __getattr__(self, name):
+        return getattr(self.raw, name)
+
+    def cursor(self, *args, **kwargs):
+        return InstrumentedCursor(self.raw.cursor(*args, **kwargs), self._stats)
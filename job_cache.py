@@ -0,0 +1,82 @@
+# job_cache.py
+import threading
+from datetime import date, timedelta
+from repositories import AvanceRepository
+from config import JOB_CACHE_WATERMARK_LAG
+
+
+def _deadline_key(job):
+    # Mismo orden que AvanceRepository.JOBS_ORDER_BY (FechaFin DESC, NULL al final),
+    # con el ID como desempate para que el listado sea estable.
+    fecha_fin = job.FechaFin
+    return (fecha_fin is not None, fecha_fin or date.min, job.ID)
+
+
+class JobCache:
+    """
+    Caché en memoria del listado de trabajos, indexada por ID.
+    La primera carga trae todo; cada refresh() posterior pide solo las filas con
+    ActualizadoEn posterior a la marca de agua (la mayor vista, menos un margen)
+    y detecta bajas comparando cantidad y suma de IDs con el servidor; solo si no
+    coinciden se trae la lista de IDs para quitar los eliminados.
+    """
+    def __init__(self, avance_repo: AvanceRepository, watermark_lag=JOB_CACHE_WATERMARK_LAG):
+        self.avance_repo = avance_repo
+        self.watermark_lag = timedelta(seconds=watermark_lag)
+        self._jobs = None
+        self._watermark = None
+        self._lock = threading.Lock()
+
+    def invalidate(self):
+        """Descarta el contenido; el próximo refresh() vuelve a cargar todo."""
+        with self._lock:
+            self._jobs = None
+            self._watermark = None
+
+    def _apply_changes(self, jobs, rows):
+        changed = 0
+        for job in rows:
+            jobs[job.ID] = job
+            if self._watermark is None or job.ActualizadoEn > self._watermark:
+                self._watermark = job.ActualizadoEn
+            changed += 1
+        return changed
+
+    def _reconcile(self, jobs):
+        """Quita los trabajos eliminados y trae los que falten si el checksum no coincide."""
+        checksum = self.avance_repo.get_jobs_checksum()
+        if checksum is None or checksum == (len(jobs), sum(jobs)):
+            return 0
+        server_ids = self.avance_repo.get_all_job_ids()
+        if server_ids is None:
+            return 0
+        removed = [job_id for job_id in jobs if job_id not in server_ids]
+        for job_id in removed:
+            del jobs[job_id]
+        missing = server_ids - jobs.keys()
+        self._apply_changes(jobs, self.avance_repo.get_jobs_by_ids(missing))
+        return len(removed) + len(missing)
+
+    def refresh(self):
+        """
+        Actualiza la caché con los cambios del servidor.
+        Returns:
+            int: Cantidad de filas recibidas del servidor o quitadas de la caché.
+        """
+        with self._lock:
+            if self._jobs is None:
+                jobs = {}
+                self._watermark = None
+                changed = self._apply_changes(jobs, self.avance_repo.iter_jobs_changed_since(None))
+                self._jobs = jobs
+                return changed
+
+            since = self._watermark - self.watermark_lag if self._watermark else None
+            changed = self._apply_changes(self._jobs, self.avance_repo.iter_jobs_changed_since(since))
+            return changed + self._reconcile(self._jobs)
+
+    def jobs(self):
+        """Refresca y devuelve los trabajos ordenados como el listado (fecha límite descendente)."""
+        self.refresh()
+        with self._lock:
+            return sorted(self._jobs.values(), key=_deadline_key, reverse=True)
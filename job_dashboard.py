@@ -0,0 +1,125 @@
+# job_dashboard.py
+from config import DASHBOARD, ESTADOS_CERRADOS, ESTADOS_POSIBLES, PRIORIDADES_POSIBLES
+from prefetch import PrefetchExecutor, completed_future, resolve
+from repositories import AvanceRepository
+
+# Dimensiones del tablero en el orden en que se muestran: (clave, título).
+# Estados y prioridades se listan en su orden habitual; edificios y técnicos, de
+# más a menos vencidos (y abiertos), solo los primeros 'top'.
+FIXED_ORDER = {'status': ESTADOS_POSIBLES, 'priority': PRIORIDADES_POSIBLES}
+DASHBOARD_DIMENSIONS = [
+    ('status', "Por estado"),
+    ('priority', "Por prioridad"),
+    ('building', "Por edificio"),
+    ('technician', "Por técnico"),
+]
+
+
+class DashboardRow:
+    """Conteos de un edificio, técnico, estado o prioridad."""
+    __slots__ = ('name', 'by_status', 'open', 'overdue', 'total')
+
+    def __init__(self, name, by_status, open_count, overdue):
+        self.name = name
+        self.by_status = by_status
+        self.open = open_count
+        self.overdue = overdue
+        self.total = sum(by_status.values())
+
+
+class DashboardTable:
+    """
+    Una dimensión del tablero: rows en el orden en que se muestran, statuses las
+    columnas de estado y hidden las filas que quedaron fuera del 'top'.
+    """
+    def __init__(self, dimension, title, statuses, rows, hidden=0):
+        self.dimension = dimension
+        self.title = title
+        self.statuses = statuses
+        self.rows = rows
+        self.hidden = hidden
+
+
+class JobDashboard:
+    """
+    Cantidad de trabajos por estado, prioridad, edificio y técnico, con los abiertos
+    y los vencidos de cada uno, calculados en el servidor con GROUP BY.
+    Con use_summary los conteos por estado se leen de ResumenAvance (migración 5);
+    si la tabla no está disponible se agrupa Avance y se avisa una sola vez.
+    Con un prefetcher las consultas de todas las dimensiones se lanzan juntas.
+    """
+    def __init__(self,
+                 avance_repo: AvanceRepository,
+                 prefetcher: PrefetchExecutor = None,
+                 use_summary=DASHBOARD['use_summary'],
+                 top=DASHBOARD['top'],
+                 closed_statuses=ESTADOS_CERRADOS):
+        self.avance_repo = avance_repo
+        self.prefetcher = prefetcher
+        self.use_summary = use_summary
+        self.top = top
+        self.closed_statuses = list(closed_statuses)
+
+    def _submit(self, fn, *args, **kwargs):
+        if self.prefetcher is None:
+            return completed_future(fn, *args, **kwargs)
+        return self.prefetcher.submit(fn, *args, **kwargs)
+
+    def _counts(self, dimension):
+        if self.use_summary:
+            counts = self.avance_repo.get_job_counts(dimension, use_summary=True)
+            if counts is not None:
+                return counts
+            print("Aviso: no se pudo leer ResumenAvance (¿falta la migración 5?). Se agrupará Avance.")
+            self.use_summary = False
+        return self.avance_repo.get_job_counts(dimension)
+
+    def _table(self, dimension, title, counts, overdue):
+        grouped = {}
+        for name, status, count in counts:
+            by_status = grouped.setdefault(name, {})
+            by_status[status] = by_status.get(status, 0) + count
+        statuses = [s for s in ESTADOS_POSIBLES if any(s in by_status for by_status in grouped.values())]
+        statuses += sorted({s for by_status in grouped.values() for s in by_status} - set(statuses))
+
+        rows = [
+            DashboardRow(
+                name, by_status,
+                sum(count for status, count in by_status.items() if status not in self.closed_statuses),
+                overdue.get(name, 0)
+            )
+            for name, by_status in grouped.items()
+        ]
+        hidden = 0
+        order = FIXED_ORDER.get(dimension)
+        if order is not None:
+            rows.sort(key=lambda row: order.index(row.name) if row.name in order else len(order))
+        else:
+            rows.sort(key=lambda row: (row.overdue, row.open, row.total), reverse=True)
+        if order is None and self.top and len(rows) > self.top:
+            hidden = len(rows) - self.top
+            rows = rows[:self.top]
+        return DashboardTable(dimension, title, statuses, rows, hidden)
+
+    def build(self):
+        """
+        Devuelve una DashboardTable por dimensión (DASHBOARD_DIMENSIONS), o None si
+        alguna consulta falló.
+        """
+        # La primera dimensión decide si el resumen está disponible antes de lanzar el resto.
+        first = DASHBOARD_DIMENSIONS[0][0]
+        counts = {first: completed_future(self._counts, first)}
+        for dimension, _ in DASHBOARD_DIMENSIONS[1:]:
+            counts[dimension] = self._submit(self._counts, dimension)
+        overdue = {
+            dimension: self._submit(self.avance_repo.get_overdue_counts, dimension, self.closed_statuses)
+            for dimension, _ in DASHBOARD_DIMENSIONS
+        }
+
+        tables = []
+        for dimension, title in DASHBOARD_DIMENSIONS:
+            dimension_counts, dimension_overdue = resolve(counts[dimension]), resolve(overdue[dimension])
+            if dimension_counts is None or dimension_overdue is None:
+                return None
+            tables.append(self._table(dimension, title, dimension_counts, dimension_overdue))
+        return tables
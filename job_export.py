@@ -0,0 +1,313 @@
+# job_export.py
+"""
+Exportación de trabajos a CSV, JSONL y formatos columnares.
+Las filas se leen con AvanceRepository.iter_all_jobs (cursor sin buffer) y se
+escriben en lotes de EXPORT_BATCH_SIZE, así la memoria no depende del tamaño
+de la tabla.
+
+Formatos (se deducen de la extensión si no se indican):
+    .csv                 CSV con encabezado.
+    .jsonl / .json       un objeto JSON por línea.
+    .parquet             Parquet, si está instalado pyarrow; si no, se exporta
+                         en el formato columnar propio (.jcol).
+    .jcol                columnar propio: un bloque comprimido por lote, con los
+                         valores agrupados por columna (ver read_jcol).
+Compresión: gzip o zstd (.gz / .zst al final de la ruta, o explícita). zstd
+requiere el paquete zstandard; en Parquet se usa el códec interno de pyarrow.
+"""
+import csv
+import gzip
+import importlib
+import io
+import json
+import os
+import struct
+import zlib
+from datetime import date, datetime
+from itertools import islice
+from config import EXPORT_BATCH_SIZE
+from repositories import AvanceRepository
+
+_optional_modules = {}
+
+
+def _optional(name):
+    """
+    Importa un paquete opcional en el primer uso (None si no está instalado).
+    pyarrow tarda en importarse: no debe pagarlo el arranque de la aplicación.
+    """
+    if name not in _optional_modules:
+        try:
+            _optional_modules[name] = importlib.import_module(name)
+        except ImportError:
+            _optional_modules[name] = None
+    return _optional_modules[name]
+
+# Columnas exportadas (claves de AvanceRepository.JOBS_SELECT) y su tipo.
+EXPORT_COLUMNS = (
+    ('ID', 'int'),
+    ('Titulo', 'str'),
+    ('Descripcion', 'str'),
+    ('FechaFin', 'date'),
+    ('priority', 'str'),
+    ('building', 'str'),
+    ('departmentId', 'int'),
+    ('departmentUnit', 'str'),
+    ('departmentOrder', 'int'),
+    ('technician', 'str'),
+    ('status', 'str'),
+)
+EXPORT_FORMATS = ('csv', 'jsonl', 'parquet', 'jcol')
+COMPRESSIONS = ('gzip', 'zstd')
+
+_FORMAT_EXTENSIONS = {'.csv': 'csv', '.jsonl': 'jsonl', '.json': 'jsonl', '.parquet': 'parquet', '.jcol': 'jcol'}
+_COMPRESSION_EXTENSIONS = {'.gz': 'gzip', '.zst': 'zstd', '.zstd': 'zstd'}
+
+JCOL_MAGIC = b"JCOL1\n"
+_BLOCK_LENGTH = struct.Struct(">I")
+
+
+def detect_format(path):
+    """Deduce (formato, compresión) de la extensión; cualquiera puede ser None."""
+    base, extension = os.path.splitext(path.lower())
+    compression = _COMPRESSION_EXTENSIONS.get(extension)
+    if compression:
+        extension = os.path.splitext(base)[1]
+    return _FORMAT_EXTENSIONS.get(extension), compression
+
+
+def _to_date(value):
+    # MySQL devuelve date; SQLite, texto ISO.
+    if value is None or type(value) is date:
+        return value
+    if isinstance(value, datetime):
+        return value.date()
+    return date.fromisoformat(str(value)[:10])
+
+
+def _to_int(value):
+    return None if value is None else int(value)
+
+
+def _to_str(value):
+    return None if value is None else str(value)
+
+
+_CONVERTERS = {'int': _to_int, 'str': _to_str, 'date': _to_date}
+
+
+def _zstd_module():
+    zstandard = _optional("zstandard")
+    if zstandard is None:
+        raise ValueError("La compresión zstd requiere el paquete 'zstandard' (pip install zstandard).")
+    return zstandard
+
+
+def _open_text(path, compression):
+    if compression == 'gzip':
+        return gzip.open(path, "wt", encoding="utf-8", newline="")
+    if compression == 'zstd':
+        writer = _zstd_module().ZstdCompressor().stream_writer(open(path, "wb"), closefd=True)
+        return io.TextIOWrapper(writer, encoding="utf-8", newline="")
+    return open(path, "w", encoding="utf-8", newline="")
+
+
+def _discard(path):
+    """Borra un archivo de exportación incompleto (si llegó a crearse)."""
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+class _CsvWriter:
+    def __init__(self, path, compression):
+        self.stream = _open_text(path, compression)
+        self.writer = csv.writer(self.stream)
+        self.writer.writerow([name for name, _ in EXPORT_COLUMNS])
+
+    def write_batch(self, jobs):
+        self.writer.writerows([job.get(name) for name, _ in EXPORT_COLUMNS] for job in jobs)
+
+    def close(self):
+        self.stream.close()
+
+
+class _JsonlWriter:
+    def __init__(self, path, compression):
+        self.stream = _open_text(path, compression)
+
+    def write_batch(self, jobs):
+        self.stream.writelines(
+            json.dumps({name: job.get(name) for name, _ in EXPORT_COLUMNS}, default=str, ensure_ascii=False) + "\n"
+            for job in jobs
+        )
+
+    def close(self):
+        self.stream.close()
+
+
+class _ParquetWriter:
+    """Un grupo de filas de Parquet por lote."""
+    _TYPES = {'int': 'int64', 'str': 'string', 'date': 'date32'}
+
+    def __init__(self, path, compression):
+        pa, pq = _optional("pyarrow"), _optional("pyarrow.parquet")
+        self.table_class = pa.Table
+        self.schema = pa.schema([(name, getattr(pa, self._TYPES[kind])()) for name, kind in EXPORT_COLUMNS])
+        self.writer = pq.ParquetWriter(path, self.schema, compression=compression or "snappy")
+
+    def write_batch(self, jobs):
+        columns = {
+            name: [_CONVERTERS[kind](job.get(name)) for job in jobs]
+            for name, kind in EXPORT_COLUMNS
+        }
+        self.writer.write_table(self.table_class.from_pydict(columns, schema=self.schema))
+
+    def close(self):
+        self.writer.close()
+
+
+class _JcolWriter:
+    """
+    Formato columnar propio, sin dependencias:
+        JCOL_MAGIC
+        una línea JSON con {"columns": [[nombre, tipo], ...], "compression": "zlib"|"zstd"}
+        bloques: longitud (4 bytes, big-endian) + JSON comprimido {"rows": n, "columns": {nombre: [valores]}}
+    Agrupar por columna hace que los valores repetidos (edificio, técnico,
+    estado) queden contiguos y se compriman mucho mejor que fila por fila.
+    """
+    def __init__(self, path, compression):
+        self.codec = 'zstd' if compression == 'zstd' else 'zlib'
+        self.compress = (_zstd_module().ZstdCompressor().compress if self.codec == 'zstd'
+                         else lambda data: zlib.compress(data, 6))
+        self.stream = open(path, "wb")
+        self.stream.write(JCOL_MAGIC)
+        header = {'columns': [list(column) for column in EXPORT_COLUMNS], 'compression': self.codec}
+        self.stream.write(json.dumps(header).encode("utf-8") + b"\n")
+
+    def write_batch(self, jobs):
+        columns = {}
+        for name, kind in EXPORT_COLUMNS:
+            values = [_CONVERTERS[kind](job.get(name)) for job in jobs]
+            if kind == 'date':
+                values = [None if v is None else v.isoformat() for v in values]
+            columns[name] = values
+        payload = json.dumps({'rows': len(jobs), 'columns': columns}, ensure_ascii=False).encode("utf-8")
+        block = self.compress(payload)
+        self.stream.write(_BLOCK_LENGTH.pack(len(block)))
+        self.stream.write(block)
+
+    def close(self):
+        self.stream.close()
+
+
+def read_jcol(path):
+    """Lee un archivo .jcol y entrega un dict por fila (las fechas como date)."""
+    with open(path, "rb") as f:
+        if f.read(len(JCOL_MAGIC)) != JCOL_MAGIC:
+            raise ValueError(f"{path} no es un archivo .jcol")
+        header = json.loads(f.readline())
+        if header['compression'] == 'zstd':
+            decompress = _zstd_module().ZstdDecompressor().decompress
+        else:
+            decompress = zlib.decompress
+        columns = header['columns']
+        while True:
+            length = f.read(_BLOCK_LENGTH.size)
+            if not length:
+                return
+            block = json.loads(decompress(f.read(_BLOCK_LENGTH.unpack(length)[0])))
+            data = block['columns']
+            for name, kind in columns:
+                if kind == 'date':
+                    data[name] = [None if v is None else date.fromisoformat(v) for v in data[name]]
+            names = [name for name, _ in columns]
+            for values in zip(*(data[name] for name in names)):
+                yield dict(zip(names, values))
+
+
+_WRITERS = {'csv': _CsvWriter, 'jsonl': _JsonlWriter, 'parquet': _ParquetWriter, 'jcol': _JcolWriter}
+
+
+class ExportResult:
+    """Resultado de una exportación: ruta y formato efectivos y filas escritas."""
+    def __init__(self, path, fmt, compression, rows):
+        self.path = path
+        self.format = fmt
+        self.compression = compression
+        self.rows = rows
+
+
+class JobExporter:
+    """
+    Exporta el listado de trabajos (con los mismos JOIN que get_all_jobs)
+    leyéndolo en streaming y escribiéndolo por lotes.
+    """
+    def __init__(self, avance_repo: AvanceRepository, batch_size=EXPORT_BATCH_SIZE):
+        self.avance_repo = avance_repo
+        self.batch_size = batch_size
+
+    @staticmethod
+    def resolve(path, fmt=None, compression=None):
+        """
+        Valida y completa formato y compresión a partir de la ruta.
+        Returns:
+            tuple: (ruta, formato, compresión) efectivos.
+        Raises:
+            ValueError: Formato o compresión no soportados.
+        """
+        detected_format, detected_compression = detect_format(path)
+        fmt = fmt or detected_format
+        compression = compression or detected_compression
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"Formato no soportado: {path}. Use .csv, .jsonl, .parquet o .jcol")
+        if compression is not None and compression not in COMPRESSIONS:
+            raise ValueError(f"Compresión no soportada: {compression}. Use gzip o zstd.")
+        if compression == 'zstd' and fmt != 'parquet':
+            _zstd_module()
+        if fmt == 'parquet' and _optional("pyarrow.parquet") is None:
+            base, extension = os.path.splitext(path)
+            if extension.lower() in _COMPRESSION_EXTENSIONS:
+                base, extension = os.path.splitext(base)
+            if extension.lower() != ".parquet":
+                base += extension
+            path, fmt = base + ".jcol", 'jcol'
+            print(f"Aviso: pyarrow no está instalado; se exportará en formato columnar propio a {path}.")
+        return path, fmt, compression
+
+    def export(self, path, fmt=None, compression=None, job_filter=None):
+        """
+        Exporta los trabajos que cumplen job_filter (todos si es None).
+        Si la lectura falla a mitad de camino se borra el archivo incompleto.
+        Returns:
+            ExportResult, o None si no se pudieron leer los trabajos.
+        Raises:
+            ValueError: Formato o compresión no soportados.
+            OSError: No se pudo escribir el archivo.
+        """
+        path, fmt, compression = self.resolve(path, fmt, compression)
+        writer = _WRITERS[fmt](path, compression)
+        rows = 0
+        jobs = self.avance_repo.iter_all_jobs(job_filter=job_filter, raise_errors=True)
+        completed = False
+        try:
+            while True:
+                batch = list(islice(jobs, self.batch_size))
+                if not batch:
+                    break
+                writer.write_batch(batch)
+                rows += len(batch)
+            completed = True
+        except self.avance_repo.db_manager.Error as err:
+            print(f"Error al leer los trabajos a exportar: {err}")
+        finally:
+            # Cerrar el generador libera el cursor sin buffer y la conexión del pool
+            # aunque el escritor haya fallado.
+            jobs.close()
+            writer.close()
+            if not completed:
+                _discard(path)
+        if not completed:
+            return None
+        return ExportResult(path, fmt, compression, rows)
@@ -0,0 +1,160 @@
+# job_import.py
+import csv
+import json
+import os
+from datetime import datetime
+from repositories import (
+    ConsorcioRepository, GremioRepository, EstadoRepository,
+    DepartamentoRepository, AvanceRepository
+)
+from lookup_cache import DepartmentIndex
+from config import PRIORIDADES_POSIBLES, BULK_CHUNK_SIZE
+
+# Columnas del archivo de importación (encabezado CSV o claves JSONL).
+# Unidad/Orden son opcionales: si faltan el trabajo es para el edificio completo.
+# FechaIni es opcional: por defecto se usa la fecha del día.
+REQUIRED_FIELDS = ("Titulo", "Edificio", "Tecnico", "Estado", "Prioridad", "FechaFin")
+DATE_FORMAT = "%Y-%m-%d"
+
+
+class ImportResult:
+    """
+    Resultado de una importación: filas insertadas y errores por fila.
+    errors es una lista de (número de línea, mensaje).
+    """
+    def __init__(self):
+        self.total = 0
+        self.inserted = 0
+        self.errors = []
+
+    @property
+    def ok(self):
+        return not self.errors
+
+
+class JobImporter:
+    """
+    Importa trabajos desde archivos CSV o JSONL.
+    Valida y resuelve nombres a IDs fila por fila contra las tablas de consulta
+    (en memoria gracias al LookupCache) y luego inserta las filas válidas con
+    AvanceRepository.add_jobs_bulk. Las filas inválidas se informan sin abortar
+    la importación del resto.
+    """
+    def __init__(self,
+                 avance_repo: AvanceRepository,
+                 consorcio_repo: ConsorcioRepository,
+                 gremio_repo: GremioRepository,
+                 estado_repo: EstadoRepository,
+                 departamento_repo: DepartamentoRepository):
+        self.avance_repo = avance_repo
+        self.consorcio_repo = consorcio_repo
+        self.gremio_repo = gremio_repo
+        self.estado_repo = estado_repo
+        self.departamento_repo = departamento_repo
+        self._departments = None
+
+    @staticmethod
+    def read_rows(path):
+        """
+        Lee el archivo y entrega (número de línea, dict) por fila.
+        El formato se deduce de la extensión: .csv o .jsonl/.json.
+        """
+        extension = os.path.splitext(path)[1].lower()
+        if extension == ".csv":
+            with open(path, newline="", encoding="utf-8-sig") as f:
+                reader = csv.DictReader(f)
+                for row in reader:
+                    yield reader.line_num, row
+        elif extension in (".jsonl", ".json"):
+            with open(path, encoding="utf-8") as f:
+                for line_number, line in enumerate(f, start=1):
+                    if not line.strip():
+                        continue
+                    try:
+                        row = json.loads(line)
+                    except json.JSONDecodeError as err:
+                        row = err
+                    yield line_number, row
+        else:
+            raise ValueError(f"Formato no soportado: {extension}. Use .csv o .jsonl")
+
+    def department_id(self, edificio, unidad, orden):
+        """ID del departamento por (edificio, unidad[, orden]); None si no existe o es ambiguo."""
+        if self._departments is None:
+            # Una sola consulta con todos los departamentos, indexada por edificio.
+            self._departments = DepartmentIndex.group_by_consorcio(self.departamento_repo.get_all_by_consorcio())
+        index = self._departments.get(edificio)
+        department = index.find(unidad, orden) if index is not None else None
+        return department.ID if department is not None else None
+
+    def prepare_row(self, row):
+        """
+        Valida una fila y la convierte al formato de AvanceRepository.add_job.
+        Returns:
+            tuple: (job_data, None) si es válida, o (None, mensaje de error).
+        """
+        if not isinstance(row, dict):
+            return None, f"Fila ilegible: {row}"
+        row = {k.strip(): (v.strip() if isinstance(v, str) else v) for k, v in row.items() if k}
+
+        missing = [field for field in REQUIRED_FIELDS if not row.get(field)]
+        if missing:
+            return None, f"Faltan campos obligatorios: {', '.join(missing)}"
+
+        try:
+            fecha_fin = datetime.strptime(str(row['FechaFin']), DATE_FORMAT).date()
+            fecha_ini = (datetime.strptime(str(row['FechaIni']), DATE_FORMAT).date()
+                         if row.get('FechaIni') else datetime.now().date())
+        except ValueError:
+            return None, "Formato de fecha incorrecto. Use YYYY-MM-DD."
+
+        if row['Prioridad'] not in PRIORIDADES_POSIBLES:
+            return None, f"Prioridad no válida: {row['Prioridad']}"
+
+        consorcio_id = self.consorcio_repo.get_by_name(row['Edificio'])
+        if not consorcio_id:
+            return None, f"Edificio desconocido: {row['Edificio']}"
+        gremio_id = self.gremio_repo.get_by_name(row['Tecnico'])
+        if not gremio_id:
+            return None, f"Técnico desconocido: {row['Tecnico']}"
+        estado_id = self.estado_repo.get_by_name(row['Estado'])
+        if not estado_id:
+            return None, f"Estado desconocido: {row['Estado']}"
+
+        department_id = None
+        if row.get('Unidad'):
+            department_id = self.department_id(row['Edificio'], row['Unidad'], row.get('Orden'))
+            if department_id is None:
+                return None, f"Departamento no encontrado o ambiguo: {row['Edificio']} / {row['Unidad']}"
+
+        job_data = {
+            'DiaIni': fecha_ini.day, 'MesIni': fecha_ini.month, 'AnioIni': fecha_ini.year,
+            'Consorcio_FK': consorcio_id, 'Departamento_FK': department_id,
+            'Titulo': row['Titulo'], 'Descripcion': row.get('Descripcion') or "",
+            'Gremio_FK': gremio_id,
+            'DiaFin': fecha_fin.day, 'MesFin': fecha_fin.month, 'AnioFin': fecha_fin.year,
+            'Estado_FK': estado_id, 'Prioridad': row['Prioridad']
+        }
+        return job_data, None
+
+    def import_rows(self, numbered_rows, chunk_size=BULK_CHUNK_SIZE):
+        """Valida todas las filas y luego inserta las válidas en una sola transacción."""
+        result = ImportResult()
+        jobs = []
+        for line_number, row in numbered_rows:
+            result.total += 1
+            job_data, error = self.prepare_row(row)
+            if error:
+                result.errors.append((line_number, error))
+            else:
+                jobs.append(job_data)
+
+        inserted = self.avance_repo.add_jobs_bulk(jobs, chunk_size=chunk_size)
+        if inserted is None:
+            result.errors.append((None, "Error de base de datos: no se insertó ninguna fila."))
+        else:
+            result.inserted = inserted
+        return result
+
+    def import_file(self, path, chunk_size=BULK_CHUNK_SIZE):
+        return self.import_rows(self.read_rows(path), chunk_size=chunk_size)
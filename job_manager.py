@@ -1,12 +1,22 @@
 # job_manager.py
 from datetime import datetime
+from itertools import chain
 from repositories import (
     ConsorcioRepository, GremioRepository, EstadoRepository,
     DepartamentoRepository, AvanceRepository
 )
 from input_handler import InputHandler
+from job_import import JobImporter
+from job_export import JobExporter
+from job_cache import JobCache
+from job_query import JobFilter, SORT_KEYS
+from job_pager import JobPager
+from prefetch import PrefetchExecutor, completed_future, resolve
 from config import ESTADOS_POSIBLES, PRIORIDADES_POSIBLES
 
+BULK_OPERATIONS = ["Cambiar estado", "Reasignar técnico", "Eliminar trabajos"]
+
+
 class JobManager:
     """
     Clase que contiene la lógica de negocio para gestionar los trabajos de mantenimiento.
@@ -20,10 +30,14 @@ class JobManager:
                  gremio_repo: GremioRepository,
                  estado_repo: EstadoRepository,
                  departamento_repo: DepartamentoRepository,
-                 input_handler: InputHandler):
+                 input_handler: InputHandler,
+                 prefetcher: PrefetchExecutor = None,
+                 job_cache: JobCache = None):
         """
         Inicializa el JobManager con las dependencias necesarias (repositorios y input handler).
-        Esto es Inyección de Dependencias.
+        Esto es Inyección de Dependencias. Con un prefetcher, las listas de opciones de
+        los formularios se consultan en segundo plano mientras el usuario escribe.
+        Con un job_cache, el listado solo pide al servidor los cambios desde el anterior.
         """
         self.avance_repo = avance_repo
         self.consorcio_repo = consorcio_repo
@@ -31,50 +45,150 @@ class JobManager:
         self.estado_repo = estado_repo
         self.departamento_repo = departamento_repo
         self.input_handler = input_handler
+        self.prefetcher = prefetcher
+        self.job_cache = job_cache
+
+    def _prefetch(self, fn, *args):
+        """Lanza fn(*args) en segundo plano si hay prefetcher; si no, la ejecuta ya."""
+        if self.prefetcher is None:
+            return completed_future(fn, *args)
+        return self.prefetcher.submit(fn, *args)
 
     def display_jobs(self):
         """Muestra todos los trabajos de mantenimiento."""
-        jobs = self.avance_repo.get_all_jobs()
+        if self.job_cache is not None:
+            jobs = iter(self.job_cache.jobs())
+        else:
+            # Se consume en streaming: la primera fila se muestra sin esperar al resto.
+            jobs = self.avance_repo.iter_all_jobs()
+        first_job = next(jobs, None)
 
-        if not jobs:
+        if first_job is None:
             print("\nNo hay trabajos de mantenimiento registrados.")
             return
 
         print("\n--- LISTA DE TRABAJOS DE MANTENIMIENTO ---")
+        self._print_jobs_table(chain([first_job], jobs))
+
+    @staticmethod
+    def _print_jobs_table(jobs):
         print("{:<5} {:<30} {:<20} {:<15} {:<15} {:<10} {:<15}".format(
             "ID", "Título", "Edificio/Depto.", "Técnico", "Fecha Límite", "Estado", "Prioridad"))
         print("-" * 120)
 
         for job in jobs:
-            building_dept_info = job['building']
-            if job['departmentUnit'] and job['departmentOrder']:
-                building_dept_info += f" / {job['departmentUnit']} ({job['departmentOrder']})"
+            building_dept_info = job.building
+            if job.departmentUnit and job.departmentOrder:
+                building_dept_info += f" / {job.departmentUnit} ({job.departmentOrder})"
             
-            # Reconstruir fecha límite
-            dia_fin = job['DiaFin'] if job['DiaFin'] is not None else 'N/A'
-            mes_fin = job['MesFin'] if job['MesFin'] is not None else 'N/A'
-            anio_fin = job['AnioFin'] if job['AnioFin'] is not None else 'N/A'
-            fecha_limite = f"{dia_fin}/{mes_fin}/{anio_fin}" if all(x != 'N/A' for x in [dia_fin, mes_fin, anio_fin]) else 'N/A'
+            fecha_fin = job.FechaFin
+            fecha_limite = f"{fecha_fin.day}/{fecha_fin.month}/{fecha_fin.year}" if fecha_fin else 'N/A'
 
             print("{:<5} {:<30} {:<20} {:<15} {:<15} {:<10} {:<15}".format(
-                job['ID'],
-                job['Titulo'][:28] + '...' if len(job['Titulo']) > 28 else job['Titulo'],
+                job.ID,
+                job.Titulo[:28] + '...' if len(job.Titulo) > 28 else job.Titulo,
                 building_dept_info[:18] + '...' if len(building_dept_info) > 18 else building_dept_info,
-                job['technician'][:13] + '...' if len(job['technician']) > 13 else job['technician'],
+                job.technician[:13] + '...' if len(job.technician) > 13 else job.technician,
                 fecha_limite,
-                job['status'],
-                job['priority']
+                job.status,
+                job.priority
             ))
         print("-" * 120)
 
+    def browse_jobs(self):
+        """
+        Listado paginado: las páginas se piden al servidor a medida que se recorren,
+        la siguiente se precarga mientras se muestra la actual y las visitadas
+        quedan en memoria. Permite filtrar y reordenar sin salir del listado.
+        """
+        pager = JobPager(self.avance_repo, self.prefetcher)
+        index = 0
+        jobs = pager.page(index)
+        while True:
+            page_count = pager.page_count
+            print(f"\n--- TRABAJOS: página {index + 1} de {page_count or '?'} ({pager.total or 0} en total) ---")
+            if jobs:
+                self._print_jobs_table(jobs)
+            else:
+                print("No hay trabajos que coincidan con el filtro.")
+            command = self.input_handler.get_string_input(
+                "[Enter/n] siguiente  [p] anterior  [número] ir a página  [f] filtrar  [b texto] buscar\n"
+                "[o campo] ordenar  [i] invertir orden  [c] quitar filtros  [r] recargar  [q] volver: "
+            ).strip()
+            action, _, argument = command.partition(" ")
+            action = action.lower()
+
+            if action == 'q':
+                return
+            if action in ('', 'n', 'p') or action.isdigit():
+                if action.isdigit():
+                    target = int(action) - 1
+                else:
+                    target = index - 1 if action == 'p' else index + 1
+                page = pager.page(target)
+                if page is None:
+                    print("No hay más páginas en esa dirección." if not action.isdigit()
+                          else f"La página {action} no existe.")
+                    continue
+                index, jobs = target, page
+                continue
+
+            if action == 'f':
+                job_filter = self.ask_filter()
+                if job_filter is None:
+                    continue
+                job_filter.text = pager.job_filter.text
+                pager.set_query(job_filter=job_filter)
+            elif action == 'b':
+                current = pager.job_filter
+                pager.set_query(job_filter=JobFilter(
+                    building=current.building, technician=current.technician,
+                    status=current.status, text=argument.strip() or None))
+            elif action == 'o':
+                if argument.strip() not in SORT_KEYS:
+                    print(f"Campo de orden no válido. Opciones: {', '.join(SORT_KEYS)}")
+                    continue
+                pager.set_query(sort=argument.strip())
+            elif action == 'i':
+                pager.set_query(descending=not pager.descending)
+            elif action == 'c':
+                pager.set_query(job_filter=JobFilter())
+            elif action == 'r':
+                pager.reset()
+            else:
+                print("Comando no válido.")
+                continue
+            index, jobs = 0, pager.page(0)
+
+    def search_jobs(self):
+        """
+        Búsqueda de texto en título y descripción, ordenada por relevancia. A diferencia
+        del filtro [b] del listado (una coincidencia literal), no distingue acentos y
+        acepta palabras incompletas: 'filtr asc' encuentra 'Filtración en ascensor'.
+        """
+        text = self.input_handler.get_string_input("\nPalabras a buscar: ").strip()
+        if not text:
+            print("Búsqueda cancelada.")
+            return
+        jobs = self.avance_repo.search_jobs(text)
+        if not jobs:
+            print(f"No se encontraron trabajos para '{text}'.")
+            return
+        print(f"\n--- RESULTADOS PARA '{text}' ({len(jobs)}) ---")
+        self._print_jobs_table(jobs)
+
     def add_job(self):
         """Permite al usuario añadir un nuevo trabajo."""
         print("\n--- AÑADIR NUEVO TRABAJO ---")
+        # Las listas se consultan mientras el usuario escribe título y descripción.
+        consorcios_future = self._prefetch(self.consorcio_repo.get_all)
+        gremios_future = self._prefetch(self.gremio_repo.get_all)
+
         titulo = self.input_handler.get_string_input("Título del trabajo: ")
         descripcion = self.input_handler.get_string_input("Descripción: ")
 
         # --- SELECCIÓN DE EDIFICIO/DEPARTAMENTO ---
-        consorcios_disp = self.consorcio_repo.get_all()
+        consorcios_disp = resolve(consorcios_future)
         if not consorcios_disp:
             print("No hay consorcios disponibles. Por favor, añada consorcios primero.")
             return
@@ -90,26 +204,25 @@ class JobManager:
             print("Error: No se pudo obtener el ID del consorcio seleccionado.")
             return
 
+        # Los departamentos del edificio elegido se consultan mientras se responde E/D.
+        deptos_future = self._prefetch(self.departamento_repo.get_index, selected_consorcio_nombre)
+
         department_id = None
         target_type = self.input_handler.get_string_input("¿Es para un (E)dificio completo o (D)epartamento específico? (E/D): ").upper()
         if target_type == 'D':
-            deptos_disp = self.departamento_repo.get_all_by_consorcio(selected_consorcio_nombre)
-            if not deptos_disp:
+            deptos = resolve(deptos_future)
+            if not deptos:
                 print(f"No hay departamentos para {selected_consorcio_nombre}. Se asignará al edificio completo.")
             else:
-                selected_depto_info = self.input_handler.get_choice_from_list(
+                selected_depto = self.input_handler.get_choice_from_list(
                     f"\nDepartamentos en {selected_consorcio_nombre}:",
-                    [f"Unidad: {d['Unidad']} (Orden: {d['Orden']}) - {d['dept_nombre']}" for d in deptos_disp]
+                    deptos.departments, labels=deptos.labels
                 )
-                if selected_depto_info:
-                    # Encuentra el ID del departamento seleccionado
-                    for d in deptos_disp:
-                        if f"Unidad: {d['Unidad']} (Orden: {d['Orden']}) - {d['dept_nombre']}" == selected_depto_info:
-                            department_id = d['ID']
-                            break
+                if selected_depto:
+                    department_id = selected_depto.ID
         
         # --- SELECCIÓN DE TÉCNICO ---
-        gremios_disp = self.gremio_repo.get_all()
+        gremios_disp = resolve(gremios_future)
         if not gremios_disp:
             print("No hay gremios disponibles. Por favor, añada gremios primero.")
             return
@@ -163,37 +276,40 @@ class JobManager:
     def update_job(self):
         """Permite al usuario actualizar un trabajo existente."""
         job_id = self.input_handler.get_string_input("\nIngrese el ID del trabajo a actualizar: ")
-        job_existente = self.avance_repo.get_job_by_id(job_id)
+        # Trabajo, nombres actuales y opciones del formulario en un solo viaje.
+        form = self.avance_repo.get_edit_form(job_id)
 
-        if not job_existente:
+        if not form:
             print(f"No se encontró ningún trabajo con ID {job_id}.")
             return
-        
+        job_existente = form.job
+
         print("\n--- ACTUALIZAR TRABAJO ---")
-        print(f"Trabajo actual: Título '{job_existente['Titulo']}', Descripción '{job_existente['Descripcion']}'")
+        print(f"Trabajo actual: Título '{job_existente.Titulo}', Descripción '{job_existente.Descripcion}'")
 
         # Recopilar datos actualizados
-        titulo = self.input_handler.get_string_input(f"Nuevo título", default_value=job_existente['Titulo'])
-        descripcion = self.input_handler.get_string_input(f"Nueva descripción", default_value=job_existente['Descripcion'])
+        titulo = self.input_handler.get_string_input(f"Nuevo título", default_value=job_existente.Titulo)
+        descripcion = self.input_handler.get_string_input(f"Nueva descripción", default_value=job_existente.Descripcion)
 
         # --- SELECCIÓN DE EDIFICIO/DEPARTAMENTO ---
-        current_consorcio_nombre = self.consorcio_repo.get_name_by_id(job_existente['Consorcio_FK'])
-        consorcios_disp = self.consorcio_repo.get_all()
+        current_consorcio_nombre = form.consorcio_nombre
         selected_consorcio_nombre = self.input_handler.get_choice_from_list(
-            "\nSeleccione el nuevo Edificio (Consorcio):", consorcios_disp,
+            "\nSeleccione el nuevo Edificio (Consorcio):", form.consorcios.names,
             current_selection=current_consorcio_nombre, allow_empty=True
         )
-        # Si el usuario no ingresa nada, se mantiene el actual
-        if selected_consorcio_nombre is None:
+        # Si el usuario no ingresa nada (o repite el actual), se mantiene el actual
+        if selected_consorcio_nombre is None or selected_consorcio_nombre == current_consorcio_nombre:
             selected_consorcio_nombre = current_consorcio_nombre
-            consorcio_id = job_existente['Consorcio_FK']
+            consorcio_id = job_existente.Consorcio_FK
+            deptos_future = self.departamento_repo.prime(current_consorcio_nombre, form.departamentos)
         else:
-            consorcio_id = self.consorcio_repo.get_by_name(selected_consorcio_nombre)
+            consorcio_id = form.consorcios.id_by_name.get(selected_consorcio_nombre)
             if not consorcio_id:
                 print("Error: No se pudo obtener el ID del consorcio seleccionado para actualizar.")
                 return
+            deptos_future = self._prefetch(self.departamento_repo.get_index, selected_consorcio_nombre)
 
-        department_id = job_existente['Departamento_FK'] # Mantener el actual por defecto
+        department_id = job_existente.Departamento_FK # Mantener el actual por defecto
         
         current_target_type = 'D' if department_id else 'E'
         target_type_str = self.input_handler.get_string_input(
@@ -204,86 +320,65 @@ class JobManager:
         if target_type_str == 'E':
             department_id = None
         elif target_type_str == 'D':
-            deptos_disp = self.departamento_repo.get_all_by_consorcio(selected_consorcio_nombre)
-            if not deptos_disp:
+            deptos = resolve(deptos_future)
+            if not deptos:
                 print(f"No hay departamentos para {selected_consorcio_nombre}. Se asignará al edificio completo.")
                 department_id = None
             else:
-                current_depto_info = None
-                if job_existente['Departamento_FK']:
-                    # Reconstruir la información del departamento actual para mostrarla
-                    for d in deptos_disp:
-                        if d['ID'] == job_existente['Departamento_FK']:
-                            current_depto_info = f"Unidad: {d['Unidad']} (Orden: {d['Orden']}) - {d['dept_nombre']}"
-                            break
-
-                selected_depto_info = self.input_handler.get_choice_from_list(
+                selected_depto = self.input_handler.get_choice_from_list(
                     f"\nDepartamentos en {selected_consorcio_nombre}:",
-                    [f"Unidad: {d['Unidad']} (Orden: {d['Orden']}) - {d['dept_nombre']}" for d in deptos_disp],
-                    current_selection=current_depto_info,
+                    deptos.departments, labels=deptos.labels,
+                    current_selection=deptos.label(job_existente.Departamento_FK),
                     allow_empty=True
                 )
-                if selected_depto_info is None:
-                    # Si el usuario no cambió, se mantiene el ID depto original
-                    pass
-                else:
-                    for d in deptos_disp:
-                        if f"Unidad: {d['Unidad']} (Orden: {d['Orden']}) - {d['dept_nombre']}" == selected_depto_info:
-                            department_id = d['ID']
-                            break
+                # Si el usuario no cambió, se mantiene el ID depto original
+                if selected_depto is not None:
+                    department_id = selected_depto.ID
         else:
             print("Opción no válida. Se mantendrá el tipo de objetivo actual.")
 
         # --- SELECCIÓN DE TÉCNICO ---
-        current_gremio_nombre = self.gremio_repo.get_name_by_id(job_existente['Gremio_FK'])
-        gremios_disp = self.gremio_repo.get_all()
+        current_gremio_nombre = form.gremio_nombre
         selected_gremio_nombre = self.input_handler.get_choice_from_list(
-            "\nSeleccione el nuevo Técnico Asignado:", gremios_disp,
+            "\nSeleccione el nuevo Técnico Asignado:", form.gremios.names,
             current_selection=current_gremio_nombre, allow_empty=True
         )
         if selected_gremio_nombre is None:
             selected_gremio_nombre = current_gremio_nombre
-            gremio_id = job_existente['Gremio_FK']
+            gremio_id = job_existente.Gremio_FK
         else:
-            gremio_id = self.gremio_repo.get_by_name(selected_gremio_nombre)
+            gremio_id = form.gremios.id_by_name.get(selected_gremio_nombre)
             if not gremio_id:
                 print("Error: No se pudo obtener el ID del gremio seleccionado para actualizar.")
                 return
 
         # --- FECHA LÍMITE ---
-        current_date_obj = None
-        if job_existente['AnioFin'] and job_existente['MesFin'] and job_existente['DiaFin']:
-            try:
-                current_date_obj = datetime(job_existente['AnioFin'], job_existente['MesFin'], job_existente['DiaFin']).date()
-            except ValueError:
-                current_date_obj = None # En caso de fecha inválida en DB
-
         dia_fin, mes_fin, anio_fin = self.input_handler.get_date_input(
             "Nueva Fecha Límite",
-            current_date=current_date_obj,
+            current_date=job_existente.FechaFin,
             allow_empty=True
         )
         if dia_fin is None: # Si el usuario dejó vacío, mantiene los valores existentes
-            dia_fin = job_existente['DiaFin']
-            mes_fin = job_existente['MesFin']
-            anio_fin = job_existente['AnioFin']
+            dia_fin = job_existente.DiaFin
+            mes_fin = job_existente.MesFin
+            anio_fin = job_existente.AnioFin
 
         # --- ESTADO Y PRIORIDAD ---
-        current_estado_nombre = self.estado_repo.get_name_by_id(job_existente['Estado_FK'])
+        current_estado_nombre = form.estado_nombre
         status = self.input_handler.get_choice_from_list(
             "\nSeleccione el nuevo Estado:", ESTADOS_POSIBLES,
             current_selection=current_estado_nombre, allow_empty=True
         )
         if status is None:
             status = current_estado_nombre
-            estado_id = job_existente['Estado_FK']
+            estado_id = job_existente.Estado_FK
         else:
             estado_id = self.estado_repo.get_by_name(status)
             if not estado_id:
                 print("Error: No se pudo obtener el ID del estado seleccionado para actualizar.")
                 return
 
-        current_priority = job_existente['Prioridad']
+        current_priority = job_existente.Prioridad
         priority = self.input_handler.get_choice_from_list(
             "\nSeleccione la nueva Prioridad:", PRIORIDADES_POSIBLES,
             current_selection=current_priority, allow_empty=True
@@ -292,17 +387,19 @@ class JobManager:
             priority = current_priority
 
 
-        job_data = {
-            'Titulo': titulo, 'Descripcion': descripcion,
-            'DiaFin': dia_fin, 'MesFin': mes_fin, 'AnioFin': anio_fin,
-            'Consorcio_FK': consorcio_id, 'Departamento_FK': department_id,
-            'Gremio_FK': gremio_id, 'Estado_FK': estado_id, 'Prioridad': priority
-        }
+        job_existente.Titulo, job_existente.Descripcion = titulo, descripcion
+        job_existente.DiaFin, job_existente.MesFin, job_existente.AnioFin = dia_fin, mes_fin, anio_fin
+        job_existente.Consorcio_FK, job_existente.Departamento_FK = consorcio_id, department_id
+        job_existente.Gremio_FK, job_existente.Estado_FK = gremio_id, estado_id
+        job_existente.Prioridad = priority
 
-        if self.avance_repo.update_job(job_id, job_data):
+        # Solo se envían las columnas modificadas; si no cambió nada no se consulta la base.
+        if not job_existente.changes():
+            print("\nNo se realizaron cambios.")
+        elif self.avance_repo.update_job(job_id, job_existente):
             print("\nTrabajo actualizado exitosamente.")
         else:
-            print("\nNo se realizaron cambios o el trabajo no existe.")
+            print("\nNo se pudo actualizar el trabajo (puede haber sido eliminado o modificado por otro usuario).")
 
     def delete_job(self):
         """Permite al usuario eliminar un trabajo."""
@@ -317,3 +414,146 @@ class JobManager:
                 print(f"No se encontró ningún trabajo con ID {job_id} o hubo un error al eliminar.")
         else:
             print("Eliminación cancelada.")
+
+    def import_jobs(self):
+        """Importa trabajos en bloque desde un archivo CSV o JSONL."""
+        path = self.input_handler.get_string_input("\nRuta del archivo a importar (.csv o .jsonl): ").strip()
+        if not path:
+            print("Importación cancelada.")
+            return
+
+        importer = JobImporter(
+            self.avance_repo, self.consorcio_repo, self.gremio_repo,
+            self.estado_repo, self.departamento_repo
+        )
+        try:
+            result = importer.import_file(path)
+        except (OSError, ValueError) as err:
+            print(f"No se pudo leer el archivo: {err}")
+            return
+
+        print(f"\nFilas leídas: {result.total}. Trabajos importados: {result.inserted}.")
+        if result.errors:
+            print(f"Filas con errores ({len(result.errors)}):")
+            for line_number, message in result.errors:
+                location = f"Línea {line_number}" if line_number is not None else "General"
+                print(f"  {location}: {message}")
+
+    def export_jobs(self):
+        """Exporta el listado de trabajos, completo o filtrado, a CSV, JSONL, Parquet o .jcol."""
+        path = self.input_handler.get_string_input(
+            "\nRuta del archivo de salida (.csv, .jsonl, .parquet o .jcol; opcional .gz/.zst): ").strip()
+        if not path:
+            print("Exportación cancelada.")
+            return
+
+        job_filter = None
+        if self.input_handler.get_string_input("¿Exportar solo algunos trabajos? (S/N): ").upper() == 'S':
+            job_filter = self.ask_filter()
+            if job_filter is None:
+                return
+
+        try:
+            result = JobExporter(self.avance_repo).export(path, job_filter=job_filter)
+        except ValueError as err:
+            print(f"No se pudo exportar: {err}")
+            return
+        except OSError as err:
+            print(f"No se pudo escribir el archivo: {err}")
+            return
+        if result is None:
+            print("No se pudo exportar: falló la lectura de los trabajos.")
+            return
+        print(f"Trabajos exportados: {result.rows} ({result.format}) en {result.path}.")
+
+    def _ask_bulk_selection(self):
+        """
+        Pide los trabajos a los que aplicar una operación en bloque: una lista de IDs
+        o un filtro por edificio/técnico/estado. Devuelve (job_ids, job_filter);
+        ambos None si el usuario no indicó ningún criterio válido.
+        """
+        mode = self.input_handler.get_string_input("¿Seleccionar por (I)Ds o por (F)iltro? (I/F): ").upper()
+        if mode == 'I':
+            ids_str = self.input_handler.get_string_input("IDs separados por coma: ")
+            try:
+                job_ids = [int(part) for part in ids_str.split(",") if part.strip()]
+            except ValueError:
+                print("Lista de IDs inválida.")
+                return None, None
+            if not job_ids:
+                print("No se indicó ningún ID.")
+                return None, None
+            return job_ids, None
+        if mode == 'F':
+            return None, self.ask_filter()
+        print("Opción no válida.")
+        return None, None
+
+    def ask_filter(self):
+        """Pide un filtro por edificio/técnico/estado; None si no se indicó ningún criterio."""
+        building = self.input_handler.get_choice_from_list(
+            "\nFiltrar por Edificio:", self.consorcio_repo.get_all(), allow_empty=True)
+        technician = self.input_handler.get_choice_from_list(
+            "\nFiltrar por Técnico:", self.gremio_repo.get_all(), allow_empty=True)
+        status = self.input_handler.get_choice_from_list(
+            "\nFiltrar por Estado:", ESTADOS_POSIBLES, allow_empty=True)
+        if building is None and technician is None and status is None:
+            print("Debe indicar al menos un criterio de filtro.")
+            return None
+        return JobFilter(building=building, technician=technician, status=status)
+
+    def bulk_operations(self):
+        """Cambia el estado, reasigna o elimina muchos trabajos con una sola operación."""
+        print("\n--- OPERACIONES EN BLOQUE ---")
+        operation = self.input_handler.get_choice_from_list("Seleccione la operación:", BULK_OPERATIONS)
+        if not operation: return
+
+        job_ids, job_filter = self._ask_bulk_selection()
+        if job_ids is None and job_filter is None:
+            return
+
+        if operation == "Cambiar estado":
+            status = self.input_handler.get_choice_from_list("\nSeleccione el nuevo Estado:", ESTADOS_POSIBLES)
+            if not status: return
+            estado_id = self.estado_repo.get_by_name(status)
+            if not estado_id:
+                print("Error: No se pudo obtener el ID del estado seleccionado.")
+                return
+            run = lambda dry_run: self.avance_repo.update_status_bulk(
+                estado_id, job_ids=job_ids, job_filter=job_filter, dry_run=dry_run)
+        elif operation == "Reasignar técnico":
+            gremio_nombre = self.input_handler.get_choice_from_list(
+                "\nSeleccione el nuevo Técnico Asignado:", self.gremio_repo.get_all())
+            if not gremio_nombre: return
+            gremio_id = self.gremio_repo.get_by_name(gremio_nombre)
+            if not gremio_id:
+                print("Error: No se pudo obtener el ID del gremio seleccionado.")
+                return
+            run = lambda dry_run: self.avance_repo.reassign_gremio_bulk(
+                gremio_id, job_ids=job_ids, job_filter=job_filter, dry_run=dry_run)
+        else:
+            run = lambda dry_run: self.avance_repo.delete_jobs_bulk(
+                job_ids=job_ids, job_filter=job_filter, dry_run=dry_run)
+
+        # Vista previa: qué trabajos se verían afectados antes de confirmar.
+        preview = run(True)
+        if preview is None:
+            print("\nError: No se pudo obtener la vista previa de la operación.")
+            return
+        if preview.affected == 0:
+            print("\nNingún trabajo coincide con la selección.")
+            return
+        shown = ", ".join(str(job_id) for job_id in preview.ids[:20])
+        if preview.affected > 20:
+            shown += ", ..."
+        print(f"\nTrabajos seleccionados ({preview.affected}): {shown}")
+
+        if not self.input_handler.get_yes_no_confirmation(f"¿Confirma '{operation}' sobre {preview.affected} trabajos?"):
+            print("Operación cancelada.")
+            return
+
+        result = run(False)
+        if result is None:
+            print("\nError: No se pudo completar la operación.")
+        else:
+            print(f"\nOperación completada. Trabajos afectados: {result.affected}.")
@@ -0,0 +1,110 @@
+# job_pager.py
+from collections import OrderedDict
+from config import PAGER_PAGE_SIZE, PAGER_CACHE_PAGES
+from job_query import JobFilter
+from prefetch import PrefetchExecutor, completed_future, resolve
+from repositories import AvanceRepository
+
+
+class JobPager:
+    """
+    Recorre el listado de trabajos por páginas con consultas keyset (find_jobs).
+    Guarda en un LRU las últimas 'cache_pages' páginas visitadas (como futures,
+    así una página que se está precargando no se pide dos veces) y, al entregar
+    una página, precarga la siguiente en segundo plano con el prefetcher.
+
+    El cursor de inicio de cada página se conoce al cargar la anterior; para
+    saltar a una página lejana se pide al servidor solo la clave de orden de la
+    fila anterior (get_job_cursor_at) en vez de recorrer las intermedias.
+    """
+    def __init__(self,
+                 avance_repo: AvanceRepository,
+                 prefetcher: PrefetchExecutor = None,
+                 page_size=PAGER_PAGE_SIZE,
+                 cache_pages=PAGER_CACHE_PAGES):
+        self.avance_repo = avance_repo
+        self.prefetcher = prefetcher
+        self.page_size = page_size
+        self.cache_pages = cache_pages
+        self.job_filter = JobFilter()
+        self.sort = 'deadline'
+        self.descending = True
+        self.reset()
+
+    def reset(self):
+        """Descarta las páginas en memoria (p. ej. tras modificar trabajos)."""
+        self._starts = {0: None}            # página -> cursor keyset de inicio
+        self._pages = OrderedDict()         # página -> Future de (trabajos, cursor siguiente)
+        self._total = self._submit(self.avance_repo.count_jobs, self.job_filter)
+
+    def set_query(self, job_filter=None, sort=None, descending=None):
+        """Cambia filtro y/u orden; el listado vuelve a empezar desde la primera página."""
+        if job_filter is not None:
+            self.job_filter = job_filter
+        if sort is not None:
+            self.sort = sort
+        if descending is not None:
+            self.descending = descending
+        self.reset()
+
+    def _submit(self, fn, *args, **kwargs):
+        if self.prefetcher is None:
+            return completed_future(fn, *args, **kwargs)
+        return self.prefetcher.submit(fn, *args, **kwargs)
+
+    @property
+    def total(self):
+        """Cantidad de trabajos del listado actual (None si no se pudo contar)."""
+        return resolve(self._total)
+
+    @property
+    def page_count(self):
+        total = self.total
+        if total is None:
+            return None
+        return max((total + self.page_size - 1) // self.page_size, 1)
+
+    def _fetch(self, index):
+        """Future de la página 'index'; se lanza la consulta si no está en el LRU."""
+        future = self._pages.get(index)
+        if future is not None:
+            self._pages.move_to_end(index)
+            return future
+        future = self._submit(
+            self.avance_repo.find_jobs, self.job_filter, sort=self.sort,
+            descending=self.descending, after=self._starts[index], limit=self.page_size
+        )
+        self._pages[index] = future
+        while len(self._pages) > self.cache_pages:
+            self._pages.popitem(last=False)
+        return future
+
+    def _locate(self, index):
+        """Asegura el cursor de inicio de 'index'; False si la página no existe."""
+        if index in self._starts:
+            return True
+        start = self.avance_repo.get_job_cursor_at(
+            index * self.page_size - 1, self.job_filter, self.sort, self.descending
+        )
+        if start is None:
+            return False
+        self._starts[index] = start
+        return True
+
+    def page(self, index):
+        """
+        Devuelve los trabajos de la página 'index' (desde 0), o None si no existe.
+        Deja precargándose la siguiente.
+        """
+        if index < 0 or not self._locate(index):
+            return None
+        jobs, next_start = resolve(self._fetch(index))
+        if not jobs and index > 0:
+            return None
+        if next_start is not None:
+            self._starts[index + 1] = next_start
+            self._fetch(index + 1)
+        return jobs
+
+    def has_next(self, index):
+        return index + 1 in self._starts
@@ -0,0 +1,157 @@
+# job_query.py
+from dataclasses import dataclass
+from datetime import date
+
+# Claves de ordenamiento admitidas: nombre -> [(expresión SQL, clave en la fila)].
+# El ID se agrega siempre al final como desempate, así el cursor keyset es único.
+# Las columnas de NULLABLE_SORT_COLUMNS pueden ser NULL (FechaFin queda en NULL si la
+# fecha límite no es válida; Prioridad es opcional) y el keyset las trata aparte.
+SORT_KEYS = {
+    'deadline': [('A.FechaFin', 'FechaFin')],
+    'id': [],
+    'title': [('A.Titulo', 'Titulo')],
+    'priority': [('A.Prioridad', 'priority')],
+    'building': [('C.Nombre', 'building')],
+    'technician': [('G.Nombre_Fantasia', 'technician')],
+    'status': [('E.Estado', 'status')],
+}
+NULLABLE_SORT_COLUMNS = {'A.FechaFin', 'A.Prioridad'}
+
+
+@dataclass
+class JobFilter:
+    """
+    Criterios de búsqueda de trabajos; los campos en None no filtran.
+    building, technician, status y priority aceptan un valor o una lista de valores.
+    deadline_from/deadline_to son fechas inclusivas; text busca en título y descripción.
+    """
+    building: object = None
+    department_id: int = None
+    technician: object = None
+    status: object = None
+    priority: object = None
+    deadline_from: date = None
+    deadline_to: date = None
+    text: str = None
+
+
+# Carácter de escape de LIKE explícito: la barra invertida no se interpreta igual
+# en MySQL y en SQLite, '!' sí.
+LIKE_ESCAPE = "!"
+
+
+def _escape_like(text):
+    return text.replace('!', '!!').replace('%', '!%').replace('_', '!_')
+
+
+# Campo de JobFilter -> (condición sobre JOBS_SELECT, condición sobre Avance sin JOINs).
+# La segunda forma se usa en UPDATE/DELETE en bloque, donde no hay alias ni JOINs.
+FILTER_COLUMNS = {
+    'building': ("C.Nombre {}", "Avance.Consorcio_FK IN (SELECT Codigo FROM Consorcios WHERE Nombre {})"),
+    'department_id': ("A.Departamento_FK {}", "Avance.Departamento_FK {}"),
+    'technician': ("G.Nombre_Fantasia {}", "Avance.Gremio_FK IN (SELECT Id FROM Gremios WHERE Nombre_Fantasia {})"),
+    'status': ("E.Estado {}", "Avance.Estado_FK IN (SELECT id FROM Estado WHERE Estado {})"),
+    'priority': ("A.Prioridad {}", "Avance.Prioridad {}"),
+}
+
+
+def _match(template, value, conditions, params):
+    if value is None:
+        return
+    if isinstance(value, (list, tuple, set, frozenset)):
+        values = list(value)
+        if not values:
+            conditions.append("1 = 0")
+            return
+        conditions.append(template.format(f"IN ({', '.join(['%s'] * len(values))})"))
+        params.extend(values)
+    else:
+        conditions.append(template.format("= %s"))
+        params.append(value)
+
+
+def build_filter_conditions(job_filter, joined=True):
+    """
+    Traduce un JobFilter a una lista de condiciones SQL (unidas luego con AND)
+    y sus parámetros. Con joined=True usa los alias de AvanceRepository.JOBS_SELECT;
+    con joined=False solo referencia la tabla Avance (para UPDATE/DELETE).
+    """
+    conditions, params = [], []
+    if job_filter is None:
+        return conditions, params
+
+    form = 0 if joined else 1
+    for field, templates in FILTER_COLUMNS.items():
+        _match(templates[form], getattr(job_filter, field), conditions, params)
+
+    table = "A" if joined else "Avance"
+    if job_filter.deadline_from is not None:
+        conditions.append(f"{table}.FechaFin >= %s")
+        params.append(job_filter.deadline_from)
+    if job_filter.deadline_to is not None:
+        conditions.append(f"{table}.FechaFin <= %s")
+        params.append(job_filter.deadline_to)
+
+    if job_filter.text:
+        pattern = f"%{_escape_like(job_filter.text)}%"
+        conditions.append(
+            f"({table}.Titulo LIKE %s ESCAPE '{LIKE_ESCAPE}' OR {table}.Descripcion LIKE %s ESCAPE '{LIKE_ESCAPE}')"
+        )
+        params.extend([pattern, pattern])
+    return conditions, params
+
+
+def sort_columns(sort):
+    """Devuelve las columnas [(expresión, clave)] de 'sort' más el ID de desempate."""
+    if sort not in SORT_KEYS:
+        raise ValueError(f"Orden no válido: {sort}. Opciones: {', '.join(SORT_KEYS)}")
+    return SORT_KEYS[sort] + [('A.ID', 'ID')]
+
+
+def build_order_by(sort, descending):
+    direction = "DESC" if descending else "ASC"
+    return " ORDER BY " + ", ".join(f"{expr} {direction}" for expr, _ in sort_columns(sort))
+
+
+def _keyset_terms(expr, value, op, descending):
+    """
+    (condición "después de value", condición "igual a value", parámetros de cada una)
+    para una columna. MySQL y SQLite ordenan los NULL como el menor valor: primero
+    en ASC y al final en DESC; un NULL en el cursor se compara con IS NULL.
+    """
+    if value is None:
+        after = "1 = 0" if descending else f"{expr} IS NOT NULL"
+        return after, f"{expr} IS NULL", [], []
+    after = f"{expr} {op} %s"
+    if descending and expr in NULLABLE_SORT_COLUMNS:
+        after = f"({after} OR {expr} IS NULL)"
+    return after, f"{expr} = %s", [value], [value]
+
+
+def build_keyset_condition(sort, descending, after):
+    """
+    Condición para continuar después del cursor 'after' (valores de la clave de
+    orden + ID de la última fila vista; None donde la columna era NULL). Se expande
+    como c1 < v1 OR (c1 = v1 AND (c2 < v2 OR ...)) para que el optimizador use
+    índices; las columnas que pueden ser NULL siguen el orden de ORDER BY, así las
+    filas sin fecha límite o sin prioridad no se pierden al pasar de página.
+    """
+    columns = [expr for expr, _ in sort_columns(sort)]
+    if len(after) != len(columns):
+        raise ValueError("El cursor no corresponde a la clave de orden indicada.")
+    op = "<" if descending else ">"
+    condition, params = None, []
+    for expr, value in reversed(list(zip(columns, after))):
+        after_sql, equal_sql, after_params, equal_params = _keyset_terms(expr, value, op, descending)
+        if condition is None:
+            condition = after_sql
+            params = after_params
+        else:
+            condition = f"{after_sql} OR ({equal_sql} AND ({condition}))"
+            params = after_params + equal_params + params
+    return f"({condition})", params
+
+
+def keyset_cursor(job, sort):
+    """Cursor keyset de una fila de trabajo, para pedir la página siguiente."""
+    return tuple(job[key] for _, key in sort_columns(sort))
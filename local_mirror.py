@@ -0,0 +1,444 @@
+# local_mirror.py
+import json
+from models import JobRecord
+from repositories import AvanceRepository, job_date
+from search_index import SearchIndex
+from sqlite_backend import SQLiteDatabaseManager
+from config import STREAM_BATCH_SIZE, SEARCH_LIMIT
+
+# Tablas replicadas y columnas que se copian del servidor.
+AVANCE_COLUMNS = [
+    'ID', 'DiaIni', 'MesIni', 'AnioIni', 'Consorcio_FK', 'Departamento_FK', 'Titulo',
+    'Descripcion', 'Gremio_FK', 'DiaFin', 'MesFin', 'AnioFin', 'Estado_FK', 'Prioridad',
+    'FechaIni', 'FechaFin'
+]
+MIRROR_TABLES = [
+    ('Consorcios', ['Codigo', 'Nombre']),
+    ('Gremios', ['Id', 'Nombre_Fantasia']),
+    ('Estado', ['id', 'Estado']),
+    ('Departamentos', ['ID', 'Codigo', 'Unidad', 'Orden', 'Nombre', 'Consorcio_FK']),
+    ('Avance', AVANCE_COLUMNS),
+]
+
+# Columnas que puede modificar una actualización; se comparan con el servidor
+# para detectar si otro usuario cambió el trabajo mientras se trabajaba sin conexión.
+UPDATABLE_COLUMNS = [
+    'Titulo', 'Descripcion', 'DiaFin', 'MesFin', 'AnioFin', 'FechaFin',
+    'Consorcio_FK', 'Departamento_FK', 'Gremio_FK', 'Estado_FK', 'Prioridad'
+]
+
+OUTBOX_SCHEMA = """
+CREATE TABLE IF NOT EXISTS Outbox (
+    ID INTEGER PRIMARY KEY AUTOINCREMENT,
+    Operacion TEXT NOT NULL,
+    JobId INTEGER NOT NULL,
+    Datos TEXT,
+    Base TEXT,
+    Estado TEXT NOT NULL DEFAULT 'pendiente',
+    Detalle TEXT,
+    RemoteId INTEGER,
+    CreadoEn TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+"""
+
+PENDING, APPLIED, CONFLICT = 'pendiente', 'aplicado', 'conflicto'
+
+
+def _dump(value):
+    return json.dumps(value, default=str) if value is not None else None
+
+
+def _normalize(value):
+    # Las filas base viajan por JSON: se comparan como texto para que fechas y números
+    # del servidor y de la réplica sean equivalentes.
+    return None if value is None else str(value)
+
+
+class SyncReport:
+    """Resultado de una sincronización con el servidor."""
+    def __init__(self):
+        self.applied = 0
+        self.conflicts = []     # (id de outbox, operación, id de trabajo, detalle)
+        self.refreshed = {}     # tabla -> filas copiadas
+        self.error = None
+
+    @property
+    def ok(self):
+        return self.error is None and not self.conflicts
+
+
+class LocalMirror:
+    """
+    Réplica SQLite local de Consorcios, Gremios, Estado, Departamentos y Avance.
+    Las lecturas se sirven desde la réplica; las escrituras se aplican en la réplica
+    y se encolan en la tabla Outbox, que sync() reproduce contra el servidor
+    informando conflictos antes de refrescar la copia local.
+    El servidor puede ser cualquier gestor con la interfaz de DatabaseManager
+    (incluido otro SQLiteDatabaseManager, para pruebas).
+    """
+    def __init__(self, path, remote_db_manager, batch_size=STREAM_BATCH_SIZE):
+        self.local = SQLiteDatabaseManager(path)
+        self.remote = remote_db_manager
+        self.batch_size = batch_size
+        self._refresh_listeners = []
+        self.local.create_schema()
+        with self.local.connection() as conn:
+            conn.raw.executescript(OUTBOX_SCHEMA)
+
+    def add_refresh_listener(self, callback):
+        """Registra una función a llamar tras refrescar la réplica (p. ej. invalidar cachés)."""
+        self._refresh_listeners.append(callback)
+
+    # --- OUTBOX ---
+
+    def enqueue(self, cursor, operation, job_id, data=None, base=None):
+        """
+        Agrega una operación al Outbox usando el cursor de la transacción local en curso,
+        para que la escritura en la réplica y su entrada en el Outbox sean atómicas.
+        """
+        cursor.execute(
+            "INSERT INTO Outbox (Operacion, JobId, Datos, Base) VALUES (%s, %s, %s, %s)",
+            (operation, job_id, _dump(data), _dump(base))
+        )
+
+    def pending_count(self):
+        with self.local.connection() as conn:
+            cursor = conn.cursor()
+            try:
+                cursor.execute("SELECT COUNT(*) FROM Outbox WHERE Estado = %s", (PENDING,))
+                return cursor.fetchone()[0]
+            finally:
+                cursor.close()
+
+    def conflicts(self):
+        """Entradas del Outbox que no se pudieron aplicar, para revisión manual."""
+        with self.local.connection() as conn:
+            cursor = conn.cursor(dictionary=True)
+            try:
+                cursor.execute("SELECT * FROM Outbox WHERE Estado = %s ORDER BY ID", (CONFLICT,))
+                return cursor.fetchall()
+            finally:
+                cursor.close()
+
+    def _mark(self, entry_id, state, detail=None, remote_id=None):
+        with self.local.connection() as conn:
+            cursor = conn.cursor()
+            try:
+                cursor.execute(
+                    "UPDATE Outbox SET Estado = %s, Detalle = %s, RemoteId = %s WHERE ID = %s",
+                    (state, detail, remote_id, entry_id)
+                )
+            finally:
+                cursor.close()
+
+    def _remote_ids(self):
+        """IDs del servidor asignados a trabajos creados sin conexión (ID local negativo)."""
+        with self.local.connection() as conn:
+            cursor = conn.cursor()
+            try:
+                cursor.execute(
+                    "SELECT JobId, RemoteId FROM Outbox WHERE Operacion = 'add' AND Estado = %s",
+                    (APPLIED,)
+                )
+                return dict(cursor.fetchall())
+            finally:
+                cursor.close()
+
+    def _apply_remote(self, cursor, operation, job_id, data, base):
+        """
+        Aplica una operación sobre el servidor dentro de la transacción de 'cursor'.
+        Returns:
+            tuple: (id remoto, detalle del conflicto o None).
+        """
+        if operation == 'add':
+            columns = [c for c in AVANCE_COLUMNS if c != 'ID']
+            row = dict(data)
+            row.setdefault('Departamento_FK', None)
+            row['FechaIni'] = job_date(row['DiaIni'], row['MesIni'], row['AnioIni'])
+            row['FechaFin'] = job_date(row['DiaFin'], row['MesFin'], row['AnioFin'])
+            cursor.execute(
+                f"INSERT INTO Avance ({', '.join(columns)}) VALUES ({', '.join(['%s'] * len(columns))})",
+                tuple(row[c] for c in columns)
+            )
+            return cursor.lastrowid, None
+
+        cursor.execute(
+            f"SELECT {', '.join(UPDATABLE_COLUMNS)} FROM Avance WHERE ID = %s", (job_id,)
+        )
+        current = cursor.fetchone()
+        if current is None:
+            if operation == 'delete':
+                return job_id, None # Ya no existe: el resultado es el mismo
+            return job_id, "El trabajo fue eliminado en el servidor."
+        current = dict(zip(UPDATABLE_COLUMNS, current))
+        if base is not None and any(
+                _normalize(current[c]) != _normalize(base.get(c)) for c in UPDATABLE_COLUMNS):
+            return job_id, "El trabajo fue modificado en el servidor."
+
+        if operation == 'delete':
+            cursor.execute("DELETE FROM Avance WHERE ID = %s", (job_id,))
+            return job_id, None
+
+        changes = dict(data)
+        if {'DiaFin', 'MesFin', 'AnioFin'} & changes.keys():
+            merged = {**current, **changes}
+            changes['FechaFin'] = job_date(merged['DiaFin'], merged['MesFin'], merged['AnioFin'])
+        changes = {c: v for c, v in changes.items() if c in UPDATABLE_COLUMNS}
+        if changes:
+            cursor.execute(
+                f"UPDATE Avance SET {', '.join(f'{c} = %s' for c in changes)} WHERE ID = %s",
+                tuple(changes.values()) + (job_id,)
+            )
+        return job_id, None
+
+    def replay_outbox(self, report):
+        """
+        Reproduce en orden las operaciones pendientes contra el servidor, cada una en
+        su propia transacción. Ante un error de conexión se detiene y deja el resto pendiente.
+        """
+        with self.local.connection() as conn:
+            cursor = conn.cursor(dictionary=True)
+            try:
+                cursor.execute("SELECT * FROM Outbox WHERE Estado = %s ORDER BY ID", (PENDING,))
+                entries = cursor.fetchall()
+            finally:
+                cursor.close()
+        if not entries:
+            return
+
+        id_map = self._remote_ids()
+        with self.remote.connection() as conn:
+            if not conn:
+                report.error = "No se pudo conectar con el servidor."
+                return
+            cursor = conn.cursor(buffered=True)
+            try:
+                for entry in entries:
+                    operation, local_id = entry['Operacion'], entry['JobId']
+                    data = json.loads(entry['Datos']) if entry['Datos'] else None
+                    base = json.loads(entry['Base']) if entry['Base'] else None
+                    job_id = id_map.get(local_id, local_id)
+                    if operation != 'add' and job_id < 0:
+                        detail = "El alta de este trabajo no se aplicó en el servidor."
+                        self._mark(entry['ID'], CONFLICT, detail)
+                        report.conflicts.append((entry['ID'], operation, local_id, detail))
+                        continue
+                    if local_id < 0:
+                        base = None # Trabajo creado sin conexión: no hay versión previa que comparar
+
+                    try:
+                        self.remote.begin(conn)
+                        remote_id, conflict = self._apply_remote(cursor, operation, job_id, data, base)
+                        if conflict:
+                            self.remote.rollback(conn)
+                        else:
+                            self.remote.commit(conn)
+                    except self.remote.Error as err:
+                        self.remote.rollback(conn)
+                        report.error = f"Error al sincronizar la operación {entry['ID']}: {err}"
+                        return
+
+                    if conflict:
+                        self._mark(entry['ID'], CONFLICT, conflict)
+                        report.conflicts.append((entry['ID'], operation, local_id, conflict))
+                    else:
+                        if operation == 'add':
+                            id_map[local_id] = remote_id
+                        self._mark(entry['ID'], APPLIED, remote_id=remote_id)
+                        report.applied += 1
+            finally:
+                cursor.close()
+
+    # --- REFRESCO ---
+
+    def refresh(self, report=None):
+        """
+        Reemplaza el contenido de la réplica con el del servidor en una sola
+        transacción local, leyendo cada tabla en lotes. No se ejecuta si hay
+        operaciones pendientes en el Outbox (se perderían de la réplica).
+        """
+        report = report or SyncReport()
+        if self.pending_count():
+            report.error = report.error or "Hay operaciones pendientes: no se refrescó la réplica."
+            return report
+
+        with self.remote.connection() as remote_conn:
+            if not remote_conn:
+                report.error = "No se pudo conectar con el servidor."
+                return report
+            with self.local.connection() as local_conn:
+                local_cursor = local_conn.cursor()
+                try:
+                    self.local.begin(local_conn)
+                    for table, columns in MIRROR_TABLES:
+                        local_cursor.execute(f"DELETE FROM {table}")
+                        insert = (f"INSERT INTO {table} ({', '.join(columns)}) "
+                                  f"VALUES ({', '.join(['%s'] * len(columns))})")
+                        remote_cursor = remote_conn.cursor()
+                        try:
+                            remote_cursor.execute(f"SELECT {', '.join(columns)} FROM {table}")
+                            copied = 0
+                            while True:
+                                rows = remote_cursor.fetchmany(self.batch_size)
+                                if not rows:
+                                    break
+                                local_cursor.executemany(insert, rows)
+                                copied += len(rows)
+                        finally:
+                            remote_cursor.close()
+                        report.refreshed[table] = copied
+                    self.local.commit(local_conn)
+                except (self.local.Error, self.remote.Error) as err:
+                    self.local.rollback(local_conn)
+                    report.error = f"Error al refrescar la réplica: {err}"
+                    return report
+                finally:
+                    local_cursor.close()
+
+        for callback in self._refresh_listeners:
+            callback()
+        return report
+
+    def sync(self):
+        """Envía el Outbox al servidor y, si no quedó nada pendiente, refresca la réplica."""
+        report = SyncReport()
+        self.replay_outbox(report)
+        if report.error is None:
+            self.refresh(report)
+        return report
+
+    def close(self):
+        self.local.close_connection()
+
+
+class OfflineAvanceRepository(AvanceRepository):
+    """
+    AvanceRepository que lee de la réplica local y encola sus escrituras en el Outbox.
+    La escritura local y su entrada en el Outbox se hacen en la misma transacción
+    SQLite: SQLiteDatabaseManager entrega la misma conexión a todo el hilo, así que
+    el commit del método heredado confirma ambas.
+    Los trabajos creados sin conexión reciben IDs negativos hasta sincronizar.
+    SQLite no tiene el índice FULLTEXT de MySQL: las búsquedas de texto se
+    resuelven con un SearchIndex en memoria que se actualiza con cada escritura
+    y se descarta al refrescar la réplica.
+    """
+    def __init__(self, mirror: LocalMirror, lookup_cache=None):
+        super().__init__(mirror.local, lookup_cache)
+        self.mirror = mirror
+        self.search_index = SearchIndex(self)
+        self.add_change_listener(self.search_index.apply_change)
+        mirror.add_refresh_listener(self.search_index.invalidate)
+
+    def search_jobs(self, text, limit=SEARCH_LIMIT):
+        ranked = self.search_index.search(text, limit)
+        if not ranked:
+            return []
+        by_id = {job.ID: job for job in self.get_jobs_by_ids(job_id for job_id, _ in ranked)}
+        return [by_id[job_id] for job_id, _ in ranked if job_id in by_id]
+
+    def _fetch_base(self, cursor, job_ids):
+        cursor.execute(
+            f"SELECT * FROM Avance WHERE ID IN ({', '.join(['%s'] * len(job_ids))})", tuple(job_ids)
+        )
+        return {row['ID']: row for row in cursor.fetchall()}
+
+    def _add_local(self, cursor, job_data):
+        cursor.execute("SELECT COALESCE(MIN(ID), 0) AS min_id FROM Avance")
+        local_id = min(cursor.fetchone()['min_id'], 0) - 1
+        row = dict(job_data, ID=local_id)
+        row.setdefault('Departamento_FK', None)
+        row['FechaIni'] = job_date(row['DiaIni'], row['MesIni'], row['AnioIni'])
+        row['FechaFin'] = job_date(row['DiaFin'], row['MesFin'], row['AnioFin'])
+        cursor.execute(
+            f"INSERT INTO Avance ({', '.join(AVANCE_COLUMNS)}) "
+            f"VALUES ({', '.join(['%s'] * len(AVANCE_COLUMNS))})",
+            tuple(row[c] for c in AVANCE_COLUMNS)
+        )
+        self.mirror.enqueue(cursor, 'add', local_id, data=job_data)
+        return local_id
+
+    def _add_many(self, jobs):
+        """Inserta en la réplica y encola en una transacción; devuelve los IDs locales o None."""
+        with self.db_manager.connection() as conn:
+            if not conn: return None
+            cursor = conn.cursor(dictionary=True)
+            try:
+                self.db_manager.begin(conn)
+                local_ids = [self._add_local(cursor, job_data) for job_data in jobs]
+                self.db_manager.commit(conn)
+            except self.db_manager.Error as err:
+                print(f"Error al añadir trabajos en la réplica local: {err}")
+                self.db_manager.rollback(conn)
+                return None
+            finally:
+                cursor.close()
+        self._notify_change('add', local_ids)
+        return local_ids
+
+    def add_job(self, job_data):
+        local_ids = self._add_many([job_data])
+        return local_ids[0] if local_ids else False
+
+    def add_jobs_bulk(self, jobs, chunk_size=None):
+        if not jobs:
+            return 0
+        local_ids = self._add_many(jobs)
+        return len(local_ids) if local_ids is not None else None
+
+    def update_job(self, job_id, job_data):
+        try:
+            job_id = int(job_id)
+        except (TypeError, ValueError):
+            return False
+        # Al servidor viajan solo las columnas modificadas.
+        changes = job_data.changes() if isinstance(job_data, JobRecord) else job_data
+        if not changes:
+            return False
+        with self.db_manager.connection() as conn:
+            if not conn: return False
+            cursor = conn.cursor(dictionary=True)
+            try:
+                base = self._fetch_base(cursor, [job_id]).get(job_id)
+                if base is None:
+                    return False
+                self.db_manager.begin(conn)
+                self.mirror.enqueue(cursor, 'update', job_id, data=changes, base=base)
+            except self.db_manager.Error as err:
+                print(f"Error al encolar la actualización: {err}")
+                self.db_manager.rollback(conn)
+                return False
+            finally:
+                cursor.close()
+            # El método heredado escribe en la réplica y confirma (o revierte) todo junto.
+            return super().update_job(job_id, job_data)
+
+    def delete_job(self, job_id):
+        try:
+            job_id = int(job_id)
+        except (TypeError, ValueError):
+            return False
+        result = self.delete_jobs_bulk(job_ids=[job_id])
+        return bool(result and result.affected)
+
+    def _run_bulk(self, changes, job_ids, job_filter, dry_run, action):
+        if dry_run:
+            return super()._run_bulk(changes, job_ids, job_filter, dry_run, action)
+        preview = super()._run_bulk(changes, job_ids, job_filter, True, action)
+        if not preview or not preview.ids:
+            return preview
+        with self.db_manager.connection() as conn:
+            if not conn: return None
+            cursor = conn.cursor(dictionary=True)
+            try:
+                self.db_manager.begin(conn)
+                bases = self._fetch_base(cursor, preview.ids)
+                for job_id in preview.ids:
+                    operation = 'delete' if changes is None else 'update'
+                    self.mirror.enqueue(cursor, operation, job_id, data=changes, base=bases.get(job_id))
+            except self.db_manager.Error as err:
+                print(f"Error al encolar la operación en bloque: {err}")
+                self.db_manager.rollback(conn)
+                return None
+            finally:
+                cursor.close()
+            return super()._run_bulk(changes, preview.ids, None, False, action)
@@ -0,0 +1,145 @@
+# lookup_cache.py
+import threading
+import time
+from db_manager import DatabaseManager
+
+# Tablas de consulta cacheadas: nombre lógico -> (tabla, columna id, columna nombre)
+LOOKUP_TABLES = {
+    'consorcios': ('Consorcios', 'Codigo', 'Nombre'),
+    'gremios': ('Gremios', 'Id', 'Nombre_Fantasia'),
+    'estado': ('Estado', 'id', 'Estado'),
+}
+
+
+class LookupTable:
+    """
+    Vista inmutable de una tabla de consulta: diccionarios nombre->id e id->nombre
+    y la lista de nombres en el orden del servidor (ORDER BY nombre).
+    """
+    __slots__ = ("id_by_name", "name_by_id", "names")
+
+    def __init__(self, rows):
+        self.id_by_name = {}
+        self.name_by_id = {}
+        self.names = []
+        for row_id, name in rows:
+            self.id_by_name.setdefault(name, row_id)
+            self.name_by_id[row_id] = name
+            self.names.append(name)
+
+
+class DepartmentIndex:
+    """
+    Departamentos de un edificio indexados por ID y por (Unidad, Orden), con las
+    etiquetas para los menús armadas una sola vez.
+    """
+    __slots__ = ("departments", "labels", "by_id", "by_unit", "_by_unit_only", "_position")
+
+    def __init__(self, departments):
+        self.departments = list(departments)
+        self.labels = [f"Unidad: {d.Unidad} (Orden: {d.Orden}) - {d.dept_nombre}" for d in self.departments]
+        self.by_id = {}
+        self.by_unit = {}
+        self._by_unit_only = {}
+        self._position = {}
+        for position, d in enumerate(self.departments):
+            self.by_id[d.ID] = d
+            self._position[d.ID] = position
+            self.by_unit[(str(d.Unidad), str(d.Orden))] = d
+            self._by_unit_only.setdefault(str(d.Unidad), []).append(d)
+
+    def __len__(self):
+        return len(self.departments)
+
+    def label(self, department_id):
+        """Etiqueta del departamento 'department_id', o None si no es de este edificio."""
+        position = self._position.get(department_id)
+        return self.labels[position] if position is not None else None
+
+    def find(self, unidad, orden=None):
+        """Departamento por unidad (y orden, si se indica); None si no existe o es ambiguo."""
+        if orden not in (None, ""):
+            return self.by_unit.get((str(unidad), str(orden)))
+        candidates = self._by_unit_only.get(str(unidad), ())
+        return candidates[0] if len(candidates) == 1 else None
+
+    @classmethod
+    def group_by_consorcio(cls, departments):
+        """Arma un índice por edificio a partir de una lista con varios edificios."""
+        groups = {}
+        for d in departments:
+            groups.setdefault(d.consorcio_nombre, []).append(d)
+        return {name: cls(group) for name, group in groups.items()}
+
+
+class LookupCache:
+    """
+    Caché en memoria de Consorcios, Gremios y Estado.
+    Carga las tres tablas en un único viaje a la base de datos y las mantiene
+    durante 'ttl' segundos; invalidate() fuerza la recarga en el próximo acceso.
+    """
+    def __init__(self, db_manager: DatabaseManager, ttl=300):
+        self.db_manager = db_manager
+        self.ttl = ttl
+        self._tables = None
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _build_query():
+        selects = [
+            f"SELECT '{key}' AS tabla, {id_col} AS id, {name_col} AS nombre FROM {table}"
+            for key, (table, id_col, name_col) in LOOKUP_TABLES.items()
+        ]
+        return " UNION ALL ".join(selects) + " ORDER BY tabla, nombre"
+
+    @staticmethod
+    def fetch_tables(cursor):
+        """
+        Ejecuta la consulta UNION ALL con 'cursor' (de una conexión ya abierta)
+        y devuelve {clave: LookupTable}. Los errores de la base se propagan.
+        """
+        cursor.execute(LookupCache._build_query())
+        rows = {key: [] for key in LOOKUP_TABLES}
+        for tabla, row_id, nombre in cursor.fetchall():
+            rows[tabla].append((row_id, nombre))
+        return {key: LookupTable(table_rows) for key, table_rows in rows.items()}
+
+    def refresh(self):
+        """
+        Recarga las tres tablas con una sola consulta UNION ALL.
+        Devuelve True si la carga fue exitosa.
+        """
+        with self.db_manager.connection() as conn:
+            if not conn: return False
+            cursor = conn.cursor()
+            try:
+                tables = self.fetch_tables(cursor)
+            except self.db_manager.Error as err:
+                print(f"Error al cargar las tablas de consulta: {err}")
+                return False
+            finally:
+                cursor.close()
+
+        with self._lock:
+            self._tables = tables
+            self._loaded_at = time.monotonic()
+        return True
+
+    def invalidate(self):
+        """Descarta el contenido cacheado; se recargará en el próximo acceso."""
+        with self._lock:
+            self._tables = None
+
+    def _is_stale(self):
+        return self._tables is None or bool(self.ttl and time.monotonic() - self._loaded_at > self.ttl)
+
+    def table(self, key):
+        """
+        Devuelve la LookupTable de 'key' ('consorcios', 'gremios' o 'estado'),
+        recargando si expiró el TTL. Devuelve None si no se pudo cargar.
+        """
+        if self._is_stale() and not self.refresh():
+            return None
+        tables = self._tables
+        return tables[key] if tables is not None else None
@@ -1,26 +1,78 @@
 # main.py
-from config import DB_CONFIG
+import sys
+import cli
+from config import DB_CONFIG, LOOKUP_CACHE_TTL, PREFETCH_WORKERS, OFFLINE_MIRROR, INSTRUMENTATION, DASHBOARD, ALERTS
 from db_manager import DatabaseManager
+from instrumentation import QueryStats
+from lookup_cache import LookupCache
+from job_cache import JobCache
+from local_mirror import LocalMirror, OfflineAvanceRepository
 from repositories import (
     ConsorcioRepository, GremioRepository, EstadoRepository,
     DepartamentoRepository, AvanceRepository
 )
 from input_handler import InputHandler
+from prefetch import PrefetchExecutor
 from job_manager import JobManager
+from job_dashboard import JobDashboard
+from deadline_alerts import DeadlineAlerts
 from ui import ConsoleUI
 
 if __name__ == "__main__":
+    # Con argumentos se ejecuta el modo de comandos no interactivo (ver cli.py).
+    if len(sys.argv) > 1:
+        raise SystemExit(cli.main(sys.argv[1:]))
+
     # --- COMPOSICIÓN DE OBJETOS (Dependency Injection Container simple) ---
     # Aquí es donde se instancian las clases y se inyectan las dependencias.
     # Esto sigue el Principio de Inversión de Dependencias (DIP).
 
-    db_manager = DatabaseManager(DB_CONFIG)
+    # Métricas de consultas (opcional): latencias por sentencia y por opción del menú.
+    query_stats = None
+    if INSTRUMENTATION['enabled']:
+        query_stats = QueryStats(
+            slow_query_ms=INSTRUMENTATION['slow_query_ms'],
+            slow_log_path=INSTRUMENTATION['slow_log_path']
+        )
+
+    db_manager = DatabaseManager(DB_CONFIG, instrumentation=query_stats)
+    # La conexión se abre en segundo plano mientras se arma y se muestra el menú.
+    db_manager.warm_up()
+    prefetcher = PrefetchExecutor(max_workers=PREFETCH_WORKERS)
+
+    # Con la réplica local habilitada, las lecturas van a SQLite y las escrituras
+    # se encolan hasta sincronizar; si el servidor no responde se sigue con la réplica.
+    mirror = None
+    read_db_manager = db_manager
+    if OFFLINE_MIRROR['enabled']:
+        mirror = LocalMirror(OFFLINE_MIRROR['path'], db_manager)
+        sync_report = mirror.sync()
+        if sync_report.error:
+            print(f"Aviso: {sync_report.error} Se trabajará con la réplica local.")
+        read_db_manager = mirror.local
+
+    # Consorcios, Gremios y Estado se precargan en un solo viaje (sin demorar el
+    # menú) y se sirven desde memoria.
+    lookup_cache = LookupCache(read_db_manager, ttl=LOOKUP_CACHE_TTL)
+    prefetcher.submit(lookup_cache.refresh)
+    if mirror is not None:
+        mirror.add_refresh_listener(lookup_cache.invalidate)
+
+    consorcio_repo = ConsorcioRepository(read_db_manager, lookup_cache)
+    gremio_repo = GremioRepository(read_db_manager, lookup_cache)
+    estado_repo = EstadoRepository(read_db_manager, lookup_cache)
+    # Los departamentos de cada edificio se indexan y conservan igual que las tablas de consulta.
+    departamento_repo = DepartamentoRepository(read_db_manager, index_ttl=LOOKUP_CACHE_TTL)
+    if mirror is not None:
+        mirror.add_refresh_listener(departamento_repo.invalidate)
+    if mirror is not None:
+        avance_repo = OfflineAvanceRepository(mirror, lookup_cache)
+    else:
+        avance_repo = AvanceRepository(db_manager, lookup_cache)
 
-    consorcio_repo = ConsorcioRepository(db_manager)
-    gremio_repo = GremioRepository(db_manager)
-    estado_repo = EstadoRepository(db_manager)
-    departamento_repo = DepartamentoRepository(db_manager)
-    avance_repo = AvanceRepository(db_manager)
+    # Sobre el servidor, el listado se refresca de forma incremental (requiere la
+    # migración 3); con la réplica local se lee directo de SQLite.
+    job_cache = None if mirror else JobCache(avance_repo)
 
     input_handler = InputHandler()
 
@@ -30,15 +82,40 @@ if __name__ == "__main__":
         gremio_repo=gremio_repo,
         estado_repo=estado_repo,
         departamento_repo=departamento_repo,
-        input_handler=input_handler
+        input_handler=input_handler,
+        prefetcher=prefetcher,
+        job_cache=job_cache
     )
 
-    console_ui = ConsoleUI(job_manager=job_manager)
+    # El resumen mantenido por triggers (migración 5) solo existe en el servidor.
+    dashboard = JobDashboard(
+        avance_repo, prefetcher, use_summary=DASHBOARD['use_summary'] and mirror is None
+    )
+
+    # Vencimientos para el aviso del menú: se cargan en segundo plano con una consulta
+    # y se mantienen con cada escritura; al refrescar la réplica se vuelven a cargar.
+    alerts = None
+    if ALERTS['enabled']:
+        alerts = DeadlineAlerts(avance_repo, prefetcher)
+        avance_repo.add_change_listener(alerts.apply_change)
+        if mirror is not None:
+            mirror.add_refresh_listener(alerts.invalidate)
+        prefetcher.submit(alerts.load)
+
+    console_ui = ConsoleUI(
+        job_manager=job_manager, mirror=mirror, instrumentation=query_stats,
+        dashboard=dashboard, alerts=alerts
+    )
 
     # --- INICIO DE LA APLICACIÓN ---
     try:
         console_ui.run_app()
     finally:
-        # Asegurarse de cerrar la conexión a la base de datos al finalizar
+        # Primero se detienen las consultas en segundo plano y luego se cierra el pool.
+        prefetcher.shutdown()
+        if mirror is not None:
+            mirror.close()
         db_manager.close_connection()
+        if query_stats is not None:
+            query_stats.export(INSTRUMENTATION['export_path'])
 
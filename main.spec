@@ -1,4 +1,25 @@
 # -*- mode: python ; coding: utf-8 -*-
+# Perfiles de compilación (variable de entorno BUILD_PROFILE):
+#   onefile (por defecto)  un único main.exe; en cada arranque se descomprime en una carpeta temporal.
+#   onedir                 dist/main/ con el ejecutable y sus dependencias ya desplegadas: arranca
+#                          sin descomprimir nada. Además compila con optimize=2, sin UPX (descomprimir
+#                          las DLL cuesta más de lo que ahorra) y sin módulos que la aplicación no usa.
+# Ejemplo (PowerShell):  $env:BUILD_PROFILE = "onedir"; pyinstaller main.spec
+import os
+
+PROFILE = os.environ.get("BUILD_PROFILE", "onefile")
+if PROFILE not in ("onefile", "onedir"):
+    raise SystemExit(f"BUILD_PROFILE desconocido: {PROFILE} (use onefile u onedir)")
+ONEDIR = PROFILE == "onedir"
+
+# mysql.connector carga los plugins de autenticación y los mensajes de error por nombre.
+HIDDEN_IMPORTS = [
+    'mysql.connector.plugins.mysql_native_password',
+    'mysql.connector.plugins.caching_sha2_password',
+    'mysql.connector.locales.eng.client_error',
+]
+# Módulos de la biblioteca estándar que arrastran las dependencias pero la aplicación no usa.
+EXCLUDES = ['tkinter', 'unittest', 'pydoc', 'doctest', 'lib2to3', 'test'] if ONEDIR else []
 
 
 a = Analysis(
@@ -6,33 +27,61 @@ a = Analysis(
     pathex=[],
     binaries=[],
     datas=[],
-    hiddenimports=[],
+    hiddenimports=HIDDEN_IMPORTS,
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
-    excludes=[],
+    excludes=EXCLUDES,
     noarchive=False,
-    optimize=0,
+    optimize=2 if ONEDIR else 0,
 )
 pyz = PYZ(a.pure)
 
-exe = EXE(
-    pyz,
-    a.scripts,
-    a.binaries,
-    a.datas,
-    [],
-    name='main',
-    debug=False,
-    bootloader_ignore_signals=False,
-    strip=False,
-    upx=True,
-    upx_exclude=[],
-    runtime_tmpdir=None,
-    console=True,
-    disable_windowed_traceback=False,
-    argv_emulation=False,
-    target_arch=None,
-    codesign_identity=None,
-    entitlements_file=None,
-)
+if ONEDIR:
+    exe = EXE(
+        pyz,
+        a.scripts,
+        [],
+        exclude_binaries=True,
+        name='main',
+        debug=False,
+        bootloader_ignore_signals=False,
+        strip=False,
+        upx=False,
+        console=True,
+        disable_windowed_traceback=False,
+        argv_emulation=False,
+        target_arch=None,
+        codesign_identity=None,
+        entitlements_file=None,
+    )
+    coll = COLLECT(
+        exe,
+        a.binaries,
+        a.datas,
+        strip=False,
+        upx=False,
+        upx_exclude=[],
+        name='main',
+    )
+else:
+    exe = EXE(
+        pyz,
+        a.scripts,
+        a.binaries,
+        a.datas,
+        [],
+        name='main',
+        debug=False,
+        bootloader_ignore_signals=False,
+        strip=False,
+        upx=True,
+        upx_exclude=[],
+        runtime_tmpdir=None,
+        console=True,
+        disable_windowed_traceback=False,
+        argv_emulation=False,
+        target_arch=None,
+        codesign_identity=None,
+        entitlements_file=None,
+    )
@@ -0,0 +1,349 @@
+# migrations.py
+"""
+Migraciones versionadas del esquema de AdministracionEdificios.
+La versión aplicada se guarda en la tabla SchemaVersion; cada migración se
+ejecuta una sola vez y en orden. Deben aplicarse antes de desplegar una versión
+de la aplicación que dependa de ellas.
+
+Uso:
+    python migrations.py                 # aplica las migraciones pendientes sobre DB_CONFIG
+    python migrations.py --status        # muestra la versión actual y las pendientes
+    python migrations.py --host 127.0.0.1 --user root --password secreto --database pruebas
+"""
+import argparse
+import getpass
+import mysql.connector
+from config import DB_CONFIG
+from db_manager import DatabaseManager
+
+# Filas de Avance que se actualizan por sentencia al rellenar columnas nuevas.
+BACKFILL_CHUNK_SIZE = 5000
+
+
+def _date_expr(dia, mes, anio):
+    """
+    Expresión que arma una fecha a partir de las columnas Dia/Mes/Anio heredadas,
+    con el mismo criterio que repositories.job_date: NULL si falta alguna o no forman
+    una fecha válida (31/02, mes 13, día 0), en lugar de desbordar al mes siguiente.
+    Los CASE anidados validan antes de llamar a STR_TO_DATE, que en modo estricto
+    convertiría una fecha inválida en error del UPDATE. Los % van duplicados porque
+    la sentencia se ejecuta con parámetros.
+    """
+    def to_date(day):
+        return f"STR_TO_DATE(CONCAT_WS('-', LPAD({anio}, 4, '0'), {mes}, {day}), '%%Y-%%m-%%d')"
+    return (
+        f"CASE WHEN {anio} BETWEEN 1 AND 9999 AND {mes} BETWEEN 1 AND 12 AND {dia} >= 1 THEN "
+        f"CASE WHEN {dia} <= DAY(LAST_DAY({to_date(1)})) THEN {to_date(dia)} END END"
+    )
+
+
+FECHA_INI_EXPR = _date_expr("DiaIni", "MesIni", "AnioIni")
+FECHA_FIN_EXPR = _date_expr("DiaFin", "MesFin", "AnioFin")
+
+
+def _column_exists(cursor, table, column):
+    cursor.execute(
+        "SELECT COUNT(*) FROM INFORMATION_SCHEMA.COLUMNS "
+        "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND COLUMN_NAME = %s",
+        (table, column)
+    )
+    return cursor.fetchone()[0] > 0
+
+
+def _index_exists(cursor, table, index):
+    cursor.execute(
+        "SELECT COUNT(*) FROM INFORMATION_SCHEMA.STATISTICS "
+        "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND INDEX_NAME = %s",
+        (table, index)
+    )
+    return cursor.fetchone()[0] > 0
+
+
+def _create_index(cursor, table, index, columns):
+    if not _index_exists(cursor, table, index):
+        print(f"  Creando índice {index} en {table} ({columns})...")
+        cursor.execute(f"CREATE INDEX {index} ON {table} ({columns})")
+
+
+def _backfill_in_chunks(conn, cursor, table, assignments, where, chunk_size):
+    """
+    Ejecuta 'UPDATE table SET assignments WHERE where' por rangos de ID, con un
+    commit por rango, para no bloquear la tabla entera en una transacción larga.
+    """
+    cursor.execute(f"SELECT MIN(ID), MAX(ID) FROM {table}")
+    min_id, max_id = cursor.fetchone()
+    if min_id is None:
+        return
+    updated = 0
+    for start in range(min_id, max_id + 1, chunk_size):
+        cursor.execute(
+            f"UPDATE {table} SET {assignments} WHERE ID BETWEEN %s AND %s AND ({where})",
+            (start, start + chunk_size - 1)
+        )
+        updated += cursor.rowcount
+        conn.commit()
+    print(f"  {updated} filas de {table} actualizadas.")
+
+
+def _add_date_columns(conn, cursor, chunk_size):
+    """Agrega FechaIni/FechaFin (DATE) a Avance y las rellena desde Dia/Mes/Anio."""
+    for column in ("FechaIni", "FechaFin"):
+        if not _column_exists(cursor, "Avance", column):
+            print(f"  Agregando columna Avance.{column}...")
+            cursor.execute(f"ALTER TABLE Avance ADD COLUMN {column} DATE NULL")
+    _backfill_in_chunks(
+        conn, cursor, "Avance",
+        f"FechaIni = {FECHA_INI_EXPR}, FechaFin = {FECHA_FIN_EXPR}",
+        "FechaIni IS NULL OR FechaFin IS NULL",
+        chunk_size
+    )
+
+
+def _add_deadline_indexes(conn, cursor, chunk_size):
+    """Índices compuestos para filtrar por estado/edificio/técnico y ordenar por fecha límite."""
+    _create_index(cursor, "Avance", "idx_avance_estado_fechafin", "Estado_FK, FechaFin")
+    _create_index(cursor, "Avance", "idx_avance_consorcio_fechafin", "Consorcio_FK, FechaFin")
+    _create_index(cursor, "Avance", "idx_avance_gremio_fechafin", "Gremio_FK, FechaFin")
+
+
+def _add_updated_at(conn, cursor, chunk_size):
+    """
+    Marca de última modificación en Avance, mantenida por el servidor, para que el
+    listado pueda pedir solo las filas cambiadas desde su último refresco.
+    """
+    if not _column_exists(cursor, "Avance", "ActualizadoEn"):
+        print("  Agregando columna Avance.ActualizadoEn...")
+        cursor.execute(
+            "ALTER TABLE Avance ADD COLUMN ActualizadoEn TIMESTAMP(6) NOT NULL "
+            "DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6)"
+        )
+    _create_index(cursor, "Avance", "idx_avance_actualizado", "ActualizadoEn")
+
+
+def _add_fulltext_index(conn, cursor, chunk_size):
+    """
+    Índice FULLTEXT sobre Titulo y Descripcion para AvanceRepository.search_jobs.
+    Con una intercalación _ai_ci (la predeterminada de utf8mb4) la búsqueda no
+    distingue acentos. InnoDB ignora las palabras de menos de innodb_ft_min_token_size
+    letras (3 por defecto) y las de su lista de palabras vacías.
+    """
+    if not _index_exists(cursor, "Avance", "ft_avance_texto"):
+        print("  Creando índice FULLTEXT ft_avance_texto en Avance (Titulo, Descripcion)...")
+        cursor.execute("CREATE FULLTEXT INDEX ft_avance_texto ON Avance (Titulo, Descripcion)")
+
+
+# Resumen de Avance para el tablero: cantidad de trabajos por estado dentro de cada
+# edificio, técnico y prioridad. Clave guarda Consorcio_FK, Gremio_FK o Prioridad como
+# texto ('' si no tiene prioridad); los triggers la comparan como texto para usar la PK.
+SUMMARY_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS ResumenAvance (
+        Dimension VARCHAR(12) NOT NULL,
+        Clave VARCHAR(64) NOT NULL,
+        Estado_FK INT NOT NULL,
+        Cantidad INT NOT NULL DEFAULT 0,
+        PRIMARY KEY (Dimension, Clave, Estado_FK)
+    )
+"""
+SUMMARY_KEYS = [
+    ("consorcio", "CAST({row}.Consorcio_FK AS CHAR)"),
+    ("gremio", "CAST({row}.Gremio_FK AS CHAR)"),
+    ("prioridad", "COALESCE({row}.Prioridad, '')"),
+]
+
+
+def _summary_increment(row):
+    values = ", ".join(
+        f"('{dimension}', {key.format(row=row)}, {row}.Estado_FK, 1)" for dimension, key in SUMMARY_KEYS
+    )
+    return (f"INSERT INTO ResumenAvance (Dimension, Clave, Estado_FK, Cantidad) VALUES {values} "
+            "ON DUPLICATE KEY UPDATE Cantidad = Cantidad + 1;")
+
+
+def _summary_decrement(row):
+    keys = " OR ".join(
+        f"(Dimension = '{dimension}' AND Clave = {key.format(row=row)})" for dimension, key in SUMMARY_KEYS
+    )
+    return f"UPDATE ResumenAvance SET Cantidad = Cantidad - 1 WHERE Estado_FK = {row}.Estado_FK AND ({keys});"
+
+
+SUMMARY_TRIGGERS = [
+    ("trg_resumen_avance_insert",
+     f"AFTER INSERT ON Avance FOR EACH ROW BEGIN {_summary_increment('NEW')} END"),
+    ("trg_resumen_avance_delete",
+     f"AFTER DELETE ON Avance FOR EACH ROW BEGIN {_summary_decrement('OLD')} END"),
+    ("trg_resumen_avance_update",
+     "AFTER UPDATE ON Avance FOR EACH ROW BEGIN "
+     "IF NOT (OLD.Consorcio_FK <=> NEW.Consorcio_FK AND OLD.Gremio_FK <=> NEW.Gremio_FK "
+     "AND OLD.Estado_FK <=> NEW.Estado_FK AND OLD.Prioridad <=> NEW.Prioridad) THEN "
+     f"{_summary_decrement('OLD')} {_summary_increment('NEW')} END IF; END"),
+]
+
+
+def _add_summary_table(conn, cursor, chunk_size):
+    """
+    Tabla ResumenAvance mantenida por triggers sobre Avance, así el tablero lee unas
+    decenas de filas en lugar de agrupar toda la tabla. Los triggers cubren todas las
+    escrituras (formularios, operaciones en bloque, importaciones y sincronización de
+    la réplica). Se rellena después de crear los triggers: aplicarla sin escrituras
+    en curso, o reconstruir el resumen reejecutando esta función.
+    """
+    print("  Creando tabla ResumenAvance y sus triggers...")
+    cursor.execute(SUMMARY_TABLE_SQL)
+    for name, body in SUMMARY_TRIGGERS:
+        cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+        cursor.execute(f"CREATE TRIGGER {name} {body}")
+    cursor.execute("DELETE FROM ResumenAvance")
+    for dimension, key in SUMMARY_KEYS:
+        key = key.format(row="A")
+        cursor.execute(
+            f"INSERT INTO ResumenAvance (Dimension, Clave, Estado_FK, Cantidad) "
+            f"SELECT '{dimension}', {key}, A.Estado_FK, COUNT(*) FROM Avance A GROUP BY {key}, A.Estado_FK"
+        )
+    cursor.execute("SELECT COUNT(*) FROM ResumenAvance")
+    print(f"  {cursor.fetchone()[0]} filas de resumen calculadas.")
+
+
+def _add_version_column(conn, cursor, chunk_size):
+    """
+    Columna Version en Avance para el control de concurrencia optimista de
+    AvanceRepository.update_job: un trigger la incrementa en cada UPDATE (también
+    en operaciones en bloque y en la sincronización de la réplica), y la
+    actualización de un formulario solo se aplica si sigue en la versión leída.
+    """
+    if not _column_exists(cursor, "Avance", "Version"):
+        print("  Agregando columna Avance.Version...")
+        cursor.execute("ALTER TABLE Avance ADD COLUMN Version INT NOT NULL DEFAULT 0")
+    cursor.execute("DROP TRIGGER IF EXISTS trg_avance_version")
+    cursor.execute(
+        "CREATE TRIGGER trg_avance_version BEFORE UPDATE ON Avance "
+        "FOR EACH ROW SET NEW.Version = OLD.Version + 1"
+    )
+
+
+def _fix_invalid_dates(conn, cursor, chunk_size):
+    """
+    Recalcula FechaIni/FechaFin donde no coinciden con Dia/Mes/Anio: la primera
+    versión de la migración 1 desbordaba las fechas inválidas (31/02/2025 quedaba
+    como 2025-03-03) en vez de dejarlas en NULL como hace la aplicación.
+    """
+    _backfill_in_chunks(
+        conn, cursor, "Avance",
+        f"FechaIni = {FECHA_INI_EXPR}, FechaFin = {FECHA_FIN_EXPR}",
+        f"NOT (FechaIni <=> {FECHA_INI_EXPR}) OR NOT (FechaFin <=> {FECHA_FIN_EXPR})",
+        chunk_size
+    )
+
+
+# (versión, descripción, función(conn, cursor, chunk_size)). Agregar siempre al final
+# con la versión siguiente; las funciones deben poder reejecutarse sin efecto.
+MIGRATIONS = [
+    (1, "Columnas DATE FechaIni/FechaFin en Avance", _add_date_columns),
+    (2, "Índices compuestos sobre FechaFin en Avance", _add_deadline_indexes),
+    (3, "Columna ActualizadoEn en Avance para refresco incremental", _add_updated_at),
+    (4, "Índice FULLTEXT sobre Titulo y Descripcion de Avance", _add_fulltext_index),
+    (5, "Tabla ResumenAvance mantenida por triggers para el tablero", _add_summary_table),
+    (6, "Columna Version en Avance para concurrencia optimista", _add_version_column),
+    (7, "FechaIni/FechaFin en NULL para fechas heredadas inválidas", _fix_invalid_dates),
+]
+
+
+def _ensure_version_table(cursor):
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS SchemaVersion (
+            Version INT PRIMARY KEY,
+            Descripcion VARCHAR(255) NOT NULL,
+            AplicadaEn DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+
+def current_version(cursor):
+    """Devuelve la última versión aplicada (0 si no hay ninguna)."""
+    _ensure_version_table(cursor)
+    cursor.execute("SELECT COALESCE(MAX(Version), 0) FROM SchemaVersion")
+    return cursor.fetchone()[0]
+
+
+def pending_migrations(cursor):
+    version = current_version(cursor)
+    return [m for m in MIGRATIONS if m[0] > version]
+
+
+def migrate(db_manager: DatabaseManager, target=None, chunk_size=BACKFILL_CHUNK_SIZE):
+    """
+    Aplica en orden las migraciones pendientes hasta 'target' (o todas); se
+    detiene en el primer error.
+    Returns:
+        tuple: (versiones aplicadas, ok). ok es False si no hubo conexión o alguna
+        migración falló (las anteriores a la que falló quedan aplicadas).
+    """
+    applied = []
+    with db_manager.connection() as conn:
+        if not conn:
+            print("Error al aplicar migraciones: no se pudo conectar a la base de datos.")
+            return applied, False
+        cursor = conn.cursor(buffered=True)
+        try:
+            for version, description, apply in pending_migrations(cursor):
+                if target is not None and version > target:
+                    break
+                print(f"Aplicando migración {version}: {description}")
+                apply(conn, cursor, chunk_size)
+                cursor.execute(
+                    "INSERT INTO SchemaVersion (Version, Descripcion) VALUES (%s, %s)",
+                    (version, description)
+                )
+                db_manager.commit(conn)
+                applied.append(version)
+        except mysql.connector.Error as err:
+            print(f"Error al aplicar migraciones: {err}")
+            db_manager.rollback(conn)
+            return applied, False
+        finally:
+            cursor.close()
+    return applied, True
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Aplica las migraciones del esquema.")
+    parser.add_argument("--host", default=DB_CONFIG['host'])
+    parser.add_argument("--port", type=int, default=DB_CONFIG['port'])
+    parser.add_argument("--user", default=DB_CONFIG['user'])
+    parser.add_argument("--password", default=None,
+                        help="Si se omite junto con --host, se usa la de DB_CONFIG; si no, se pide por consola.")
+    parser.add_argument("--database", default=DB_CONFIG['database'])
+    parser.add_argument("--target", type=int, default=None, help="Versión máxima a aplicar.")
+    parser.add_argument("--chunk-size", type=int, default=BACKFILL_CHUNK_SIZE)
+    parser.add_argument("--status", action="store_true", help="Solo muestra el estado.")
+    args = parser.parse_args(argv)
+
+    password = args.password
+    if password is None:
+        password = DB_CONFIG['password'] if args.host == DB_CONFIG['host'] else getpass.getpass("Contraseña: ")
+    db_config = {
+        'host': args.host, 'port': args.port, 'user': args.user,
+        'password': password, 'database': args.database
+    }
+    db_manager = DatabaseManager(db_config, {'min_size': 1, 'max_size': 1, 'health_check_interval': 0})
+    try:
+        if args.status:
+            with db_manager.connection() as conn:
+                if not conn: return 1
+                cursor = conn.cursor(buffered=True)
+                try:
+                    print(f"Versión actual del esquema: {current_version(cursor)}")
+                    for version, description, _ in pending_migrations(cursor):
+                        print(f"  Pendiente {version}: {description}")
+                finally:
+                    cursor.close()
+            return 0
+        applied, ok = migrate(db_manager, target=args.target, chunk_size=args.chunk_size)
+        print(f"Migraciones aplicadas: {applied or 'ninguna'}")
+        # Un código distinto de 0 detiene el despliegue: el esquema no quedó al día.
+        return 0 if ok else 1
+    finally:
+        db_manager.close_connection()
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
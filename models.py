@@ -0,0 +1,154 @@
+# models.py
+"""
+Filas de la base como objetos compactos en lugar de diccionarios.
+Son dataclasses con __slots__: sin __dict__ por instancia, cada fila ocupa
+bastante menos memoria que un dict con las mismas claves y el acceso por
+atributo es más rápido que por clave. Los nombres de los campos son los mismos
+que las columnas (o alias) de las consultas, así row_mapper puede armar el
+mapeo columna -> campo una sola vez por forma de resultado.
+
+Para el código genérico que recorre columnas por nombre (exportación, cursores
+keyset) los modelos también admiten job['columna'] y job.get('columna').
+"""
+from dataclasses import dataclass, field, fields
+from datetime import date, datetime
+from operator import itemgetter
+
+
+class _ColumnAccess:
+    __slots__ = ()
+
+    def __getitem__(self, name):
+        return getattr(self, name)
+
+    def get(self, name, default=None):
+        return getattr(self, name, default)
+
+
+@dataclass(slots=True)
+class Job(_ColumnAccess):
+    """Trabajo del listado (AvanceRepository.JOBS_SELECT), con los nombres ya resueltos."""
+    ID: int
+    Titulo: str
+    Descripcion: str
+    DiaFin: int
+    MesFin: int
+    AnioFin: int
+    FechaFin: date
+    priority: str
+    building: str
+    departmentId: int
+    departmentUnit: str
+    departmentOrder: int
+    technician: str
+    status: str
+    ActualizadoEn: datetime = None      # Solo en las consultas del refresco incremental
+
+
+# Columnas de Avance que edita una actualización. FechaFin no figura: se deriva
+# de DiaFin/MesFin/AnioFin al escribir.
+JOB_EDITABLE_COLUMNS = (
+    'Titulo', 'Descripcion', 'DiaFin', 'MesFin', 'AnioFin',
+    'Consorcio_FK', 'Departamento_FK', 'Gremio_FK', 'Estado_FK', 'Prioridad'
+)
+
+
+@dataclass(slots=True)
+class JobRecord(_ColumnAccess):
+    """
+    Fila completa de Avance (claves foráneas en lugar de nombres).
+    Los repositorios la entregan con track() ya llamado: se modifica por atributo
+    y changes() devuelve solo las columnas editables que cambiaron, para que
+    AvanceRepository.update_job escriba lo mínimo. Version es None si la tabla no
+    tiene la columna (migración 6).
+    """
+    ID: int
+    DiaIni: int
+    MesIni: int
+    AnioIni: int
+    Consorcio_FK: int
+    Departamento_FK: int
+    Titulo: str
+    Descripcion: str
+    Gremio_FK: int
+    DiaFin: int
+    MesFin: int
+    AnioFin: int
+    Estado_FK: int
+    Prioridad: str
+    FechaIni: date = None
+    FechaFin: date = None
+    ActualizadoEn: datetime = None
+    Version: int = None
+    _original: tuple = field(default=None, init=False, repr=False, compare=False)
+
+    def track(self):
+        """Toma los valores actuales como originales (al leer o tras guardar)."""
+        self._original = tuple(getattr(self, name) for name in JOB_EDITABLE_COLUMNS)
+        return self
+
+    def changes(self):
+        """
+        {columna: valor} de las columnas editables modificadas desde track(); sin
+        track() se consideran modificadas todas.
+        """
+        current = [getattr(self, name) for name in JOB_EDITABLE_COLUMNS]
+        if self._original is None:
+            return dict(zip(JOB_EDITABLE_COLUMNS, current))
+        return {
+            name: value
+            for name, original, value in zip(JOB_EDITABLE_COLUMNS, self._original, current)
+            if value != original
+        }
+
+
+@dataclass(slots=True)
+class Department(_ColumnAccess):
+    """Departamento con el nombre de su edificio (DepartamentoRepository.get_all_by_consorcio)."""
+    ID: int
+    Codigo: int
+    Unidad: str
+    Orden: int
+    dept_nombre: str
+    consorcio_nombre: str
+    consorcioId: int
+
+
+_MAPPERS = {}
+
+
+def row_mapper(model, columns):
+    """
+    Devuelve una función tupla -> model para filas con las columnas 'columns'.
+    El mapeo se resuelve una vez por (modelo, columnas) y queda en caché: si las
+    columnas coinciden con los campos se construye directo con model(*fila); si
+    no, un itemgetter elige y ordena las posiciones. Las columnas que el modelo no
+    tiene se ignoran y los campos que faltan toman su valor por defecto.
+    """
+    columns = tuple(columns)
+    key = (model, columns)
+    mapper = _MAPPERS.get(key)
+    if mapper is not None:
+        return mapper
+
+    names = [f.name for f in fields(model)]
+    if columns == tuple(names):
+        mapper = lambda row: model(*row)
+    else:
+        present = [name for name in names if name in columns]
+        positions = [columns.index(name) for name in present]
+        if len(positions) == 1:
+            getter = lambda row, i=positions[0]: (row[i],)
+        else:
+            getter = itemgetter(*positions)
+        if present == names[:len(present)]:
+            mapper = lambda row: model(*getter(row))
+        else:
+            mapper = lambda row: model(**dict(zip(present, getter(row))))
+    _MAPPERS[key] = mapper
+    return mapper
+
+
+def cursor_mapper(model, cursor):
+    """row_mapper para las columnas del último execute de 'cursor'."""
+    return row_mapper(model, [column[0] for column in cursor.description])
@@ -0,0 +1,44 @@
+# prefetch.py
+from concurrent.futures import Future, ThreadPoolExecutor
+
+
+class PrefetchExecutor:
+    """
+    Ejecuta consultas de los repositorios en segundo plano y devuelve futures.
+    Permite que JobManager lance las consultas del paso siguiente de un formulario
+    mientras el usuario todavía escribe, y que InputHandler espere el resultado
+    recién cuando lo necesita. Los repositorios son seguros entre hilos porque
+    cada llamada toma su propia conexión del pool.
+    """
+    def __init__(self, max_workers=4):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="db-prefetch")
+        self._closed = False
+
+    def submit(self, fn, *args, **kwargs):
+        """
+        Programa fn(*args, **kwargs) y devuelve su Future.
+        Tras shutdown() se ejecuta en el hilo actual y se devuelve un Future ya resuelto.
+        """
+        if self._closed:
+            return completed_future(fn, *args, **kwargs)
+        return self._executor.submit(fn, *args, **kwargs)
+
+    def shutdown(self, wait=True):
+        """Cancela lo pendiente y espera (si wait) a las consultas en curso."""
+        self._closed = True
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+
+def completed_future(fn, *args, **kwargs):
+    """Ejecuta fn de forma síncrona y devuelve su resultado envuelto en un Future."""
+    future = Future()
+    try:
+        future.set_result(fn(*args, **kwargs))
+    except Exception as err:
+        future.set_exception(err)
+    return future
+
+
+def resolve(value):
+    """Devuelve el resultado si 'value' es un Future (esperándolo); si no, el valor tal cual."""
+    return value.result() if isinstance(value, Future) else value
@@ -1,7 +1,61 @@
 # repositories.py
-import mysql.connector
+import threading
+import time
+from datetime import date
 from abc import ABC, abstractmethod
 from db_manager import DatabaseManager
+from lookup_cache import LookupCache, DepartmentIndex
+from models import Job, JobRecord, Department, JOB_EDITABLE_COLUMNS, cursor_mapper, row_mapper
+from config import STREAM_BATCH_SIZE, BULK_CHUNK_SIZE, SEARCH_LIMIT
+from search_index import tokenize
+from job_query import (
+    build_filter_conditions, build_keyset_condition, build_order_by, keyset_cursor, sort_columns
+)
+
+def job_date(dia, mes, anio):
+    """
+    Arma la fecha DATE (FechaIni/FechaFin) a partir de las columnas Dia/Mes/Anio
+    que se siguen escribiendo por compatibilidad. Devuelve None si falta alguna
+    o no forman una fecha válida.
+    """
+    if dia is None or mes is None or anio is None:
+        return None
+    try:
+        return date(int(anio), int(mes), int(dia))
+    except ValueError:
+        return None
+
+
+class BulkResult:
+    """
+    Resultado de una operación en bloque sobre Avance.
+    affected: filas afectadas (o que se afectarían, si dry_run).
+    ids: IDs seleccionados; solo se completa en modo dry_run (vista previa).
+    """
+    def __init__(self, affected, ids=None, dry_run=False):
+        self.affected = affected
+        self.ids = ids or []
+        self.dry_run = dry_run
+
+
+class EditForm:
+    """
+    Todo lo necesario para editar un trabajo, cargado en un solo viaje:
+    job: fila completa de Avance (JobRecord).
+    consorcio_nombre, gremio_nombre, estado_nombre: nombres actuales ya resueltos.
+    departamentos: departamentos del edificio actual (Department, como get_all_by_consorcio).
+    consorcios, gremios: LookupTable con las opciones y sus IDs.
+    """
+    def __init__(self, job, consorcio_nombre, gremio_nombre, estado_nombre,
+                 departamentos, consorcios, gremios):
+        self.job = job
+        self.consorcio_nombre = consorcio_nombre
+        self.gremio_nombre = gremio_nombre
+        self.estado_nombre = estado_nombre
+        self.departamentos = departamentos
+        self.consorcios = consorcios
+        self.gremios = gremios
+
 
 # --- INTERFACES (OPCIONAL, PERO BUENA PRÁCTICA PARA OCP/DIP) ---
 # En Python, las interfaces se implementan a menudo con ABCs (Abstract Base Classes)
@@ -48,19 +102,79 @@ class DepartamentoRepositoryInterface(ABC):
     def get_all_by_consorcio(self, consorcio_name=None):
         pass
 
+    @abstractmethod
+    def get_index(self, consorcio_nombre):
+        pass
+
 class AvanceRepositoryInterface(ABC):
     @abstractmethod
     def get_all_jobs(self):
         pass
 
+    @abstractmethod
+    def iter_all_jobs(self, batch_size=STREAM_BATCH_SIZE, job_filter=None, raise_errors=False):
+        pass
+
+    @abstractmethod
+    def find_jobs(self, job_filter=None, sort='deadline', descending=True, after=None, limit=50):
+        pass
+
+    @abstractmethod
+    def count_jobs(self, job_filter=None):
+        pass
+
+    @abstractmethod
+    def search_jobs(self, text, limit=SEARCH_LIMIT):
+        pass
+
+    @abstractmethod
+    def get_job_counts(self, dimension, use_summary=False):
+        pass
+
+    @abstractmethod
+    def get_overdue_counts(self, dimension, closed_statuses, today=None):
+        pass
+
+    @abstractmethod
+    def get_open_deadlines(self, closed_statuses):
+        pass
+
+    @abstractmethod
+    def get_job_cursor_at(self, offset, job_filter=None, sort='deadline', descending=True):
+        pass
+
+    @abstractmethod
+    def iter_jobs_changed_since(self, since=None, batch_size=STREAM_BATCH_SIZE):
+        pass
+
+    @abstractmethod
+    def get_jobs_by_ids(self, job_ids):
+        pass
+
+    @abstractmethod
+    def get_jobs_checksum(self):
+        pass
+
+    @abstractmethod
+    def get_all_job_ids(self):
+        pass
+
     @abstractmethod
     def add_job(self, job_data):
         pass
 
+    @abstractmethod
+    def add_jobs_bulk(self, jobs, chunk_size=BULK_CHUNK_SIZE):
+        pass
+
     @abstractmethod
     def get_job_by_id(self, job_id):
         pass
 
+    @abstractmethod
+    def get_edit_form(self, job_id):
+        pass
+
     @abstractmethod
     def update_job(self, job_id, job_data):
         pass
@@ -69,145 +183,171 @@ class AvanceRepositoryInterface(ABC):
     def delete_job(self, job_id):
         pass
 
+    @abstractmethod
+    def update_status_bulk(self, estado_id, job_ids=None, job_filter=None, dry_run=False):
+        pass
+
+    @abstractmethod
+    def reassign_gremio_bulk(self, gremio_id, job_ids=None, job_filter=None, dry_run=False):
+        pass
+
+    @abstractmethod
+    def delete_jobs_bulk(self, job_ids=None, job_filter=None, dry_run=False):
+        pass
+
 
 # --- IMPLEMENTACIONES DE REPOSITORIOS ---
 
-class ConsorcioRepository(ConsorcioRepositoryInterface):
+class _LookupCacheMixin:
+    """
+    Permite a los repositorios de tablas de consulta responder desde un LookupCache
+    (si se inyectó uno) y recurrir a SQL solo cuando la caché no está disponible.
+    """
+    LOOKUP_KEY = None
+
+    def _cached_table(self):
+        if self.lookup_cache is None:
+            return None
+        return self.lookup_cache.table(self.LOOKUP_KEY)
+
+
+class ConsorcioRepository(_LookupCacheMixin, ConsorcioRepositoryInterface):
     """
     Gestiona las operaciones de base de datos para la tabla Consorcios.
     Aplica SRP: solo se ocupa de Consorcios.
     Aplica DIP: depende de la abstracción DatabaseManager, no de una conexión directa.
     """
-    def __init__(self, db_manager: DatabaseManager):
+    LOOKUP_KEY = 'consorcios'
+
+    def __init__(self, db_manager: DatabaseManager, lookup_cache: LookupCache = None):
         self.db_manager = db_manager
+        self.lookup_cache = lookup_cache
 
     def get_by_name(self, nombre_consorcio):
-        conn = self.db_manager.get_connection()
-        if not conn: return None
-        cursor = conn.cursor()
-        try:
-            cursor.execute("SELECT Codigo FROM Consorcios WHERE Nombre = %s", (nombre_consorcio,))
-            result = cursor.fetchone()
-            return result[0] if result else None
-        except mysql.connector.Error as err:
-            print(f"Error al obtener ID de consorcio: {err}")
-            return None
-        finally:
-            cursor.close()
+        table = self._cached_table()
+        if table is not None:
+            return table.id_by_name.get(nombre_consorcio)
+        with self.db_manager.connection() as conn:
+            if not conn: return None
+            try:
+                rows = self.db_manager.execute_prepared(conn, "SELECT Codigo FROM Consorcios WHERE Nombre = %s", (nombre_consorcio,))
+                return rows[0][0] if rows else None
+            except self.db_manager.Error as err:
+                print(f"Error al obtener ID de consorcio: {err}")
+                return None
 
     def get_name_by_id(self, consorcio_id):
-        conn = self.db_manager.get_connection()
-        if not conn: return "Desconocido"
-        cursor = conn.cursor()
-        try:
-            cursor.execute("SELECT Nombre FROM Consorcios WHERE Codigo = %s", (consorcio_id,))
-            result = cursor.fetchone()
-            return result[0] if result else "Desconocido"
-        except mysql.connector.Error as err:
-            print(f"Error al obtener nombre de consorcio: {err}")
-            return "Desconocido"
-        finally:
-            cursor.close()
+        table = self._cached_table()
+        if table is not None:
+            return table.name_by_id.get(consorcio_id, "Desconocido")
+        with self.db_manager.connection() as conn:
+            if not conn: return "Desconocido"
+            try:
+                rows = self.db_manager.execute_prepared(conn, "SELECT Nombre FROM Consorcios WHERE Codigo = %s", (consorcio_id,))
+                return rows[0][0] if rows else "Desconocido"
+            except self.db_manager.Error as err:
+                print(f"Error al obtener nombre de consorcio: {err}")
+                return "Desconocido"
 
     def get_all(self):
-        conn = self.db_manager.get_connection()
-        if not conn: return []
-        cursor = conn.cursor()
-        try:
-            cursor.execute("SELECT Nombre FROM Consorcios ORDER BY Nombre")
-            return [row[0] for row in cursor.fetchall()]
-        except mysql.connector.Error as err:
-            print(f"Error al obtener consorcios: {err}")
-            return []
-        finally:
-            cursor.close()
+        table = self._cached_table()
+        if table is not None:
+            return list(table.names)
+        with self.db_manager.connection() as conn:
+            if not conn: return []
+            try:
+                return [row[0] for row in self.db_manager.execute_prepared(conn, "SELECT Nombre FROM Consorcios ORDER BY Nombre")]
+            except self.db_manager.Error as err:
+                print(f"Error al obtener consorcios: {err}")
+                return []
 
 
-class GremioRepository(GremioRepositoryInterface):
+class GremioRepository(_LookupCacheMixin, GremioRepositoryInterface):
     """
     Gestiona las operaciones de base de datos para la tabla Gremios.
     Aplica SRP y DIP.
     """
-    def __init__(self, db_manager: DatabaseManager):
+    LOOKUP_KEY = 'gremios'
+
+    def __init__(self, db_manager: DatabaseManager, lookup_cache: LookupCache = None):
         self.db_manager = db_manager
+        self.lookup_cache = lookup_cache
 
     def get_by_name(self, nombre_fantasia_gremio):
-        conn = self.db_manager.get_connection()
-        if not conn: return None
-        cursor = conn.cursor()
-        try:
-            cursor.execute("SELECT Id FROM Gremios WHERE Nombre_Fantasia = %s", (nombre_fantasia_gremio,))
-            result = cursor.fetchone()
-            return result[0] if result else None
-        except mysql.connector.Error as err:
-            print(f"Error al obtener ID de gremio: {err}")
-            return None
-        finally:
-            cursor.close()
+        table = self._cached_table()
+        if table is not None:
+            return table.id_by_name.get(nombre_fantasia_gremio)
+        with self.db_manager.connection() as conn:
+            if not conn: return None
+            try:
+                rows = self.db_manager.execute_prepared(conn, "SELECT Id FROM Gremios WHERE Nombre_Fantasia = %s", (nombre_fantasia_gremio,))
+                return rows[0][0] if rows else None
+            except self.db_manager.Error as err:
+                print(f"Error al obtener ID de gremio: {err}")
+                return None
 
     def get_name_by_id(self, gremio_id):
-        conn = self.db_manager.get_connection()
-        if not conn: return "Desconocido"
-        cursor = conn.cursor()
-        try:
-            cursor.execute("SELECT Nombre_Fantasia FROM Gremios WHERE Id = %s", (gremio_id,))
-            result = cursor.fetchone()
-            return result[0] if result else "Desconocido"
-        except mysql.connector.Error as err:
-            print(f"Error al obtener nombre de fantasía de gremio: {err}")
-            return "Desconocido"
-        finally:
-            cursor.close()
+        table = self._cached_table()
+        if table is not None:
+            return table.name_by_id.get(gremio_id, "Desconocido")
+        with self.db_manager.connection() as conn:
+            if not conn: return "Desconocido"
+            try:
+                rows = self.db_manager.execute_prepared(conn, "SELECT Nombre_Fantasia FROM Gremios WHERE Id = %s", (gremio_id,))
+                return rows[0][0] if rows else "Desconocido"
+            except self.db_manager.Error as err:
+                print(f"Error al obtener nombre de fantasía de gremio: {err}")
+                return "Desconocido"
 
     def get_all(self):
-        conn = self.db_manager.get_connection()
-        if not conn: return []
-        cursor = conn.cursor()
-        try:
-            cursor.execute("SELECT Nombre_Fantasia FROM Gremios ORDER BY Nombre_Fantasia")
-            return [row[0] for row in cursor.fetchall()]
-        except mysql.connector.Error as err:
-            print(f"Error al obtener gremios: {err}")
-            return []
-        finally:
-            cursor.close()
+        table = self._cached_table()
+        if table is not None:
+            return list(table.names)
+        with self.db_manager.connection() as conn:
+            if not conn: return []
+            try:
+                return [row[0] for row in self.db_manager.execute_prepared(conn, "SELECT Nombre_Fantasia FROM Gremios ORDER BY Nombre_Fantasia")]
+            except self.db_manager.Error as err:
+                print(f"Error al obtener gremios: {err}")
+                return []
 
 
-class EstadoRepository(EstadoRepositoryInterface):
+class EstadoRepository(_LookupCacheMixin, EstadoRepositoryInterface):
     """
     Gestiona las operaciones de base de datos para la tabla Estado.
     Aplica SRP y DIP.
     """
-    def __init__(self, db_manager: DatabaseManager):
+    LOOKUP_KEY = 'estado'
+
+    def __init__(self, db_manager: DatabaseManager, lookup_cache: LookupCache = None):
         self.db_manager = db_manager
+        self.lookup_cache = lookup_cache
 
     def get_by_name(self, nombre_estado):
-        conn = self.db_manager.get_connection()
-        if not conn: return None
-        cursor = conn.cursor()
-        try:
-            cursor.execute("SELECT id FROM Estado WHERE Estado = %s", (nombre_estado,))
-            result = cursor.fetchone()
-            return result[0] if result else None
-        except mysql.connector.Error as err:
-            print(f"Error al obtener ID de estado: {err}")
-            return None
-        finally:
-            cursor.close()
+        table = self._cached_table()
+        if table is not None:
+            return table.id_by_name.get(nombre_estado)
+        with self.db_manager.connection() as conn:
+            if not conn: return None
+            try:
+                rows = self.db_manager.execute_prepared(conn, "SELECT id FROM Estado WHERE Estado = %s", (nombre_estado,))
+                return rows[0][0] if rows else None
+            except self.db_manager.Error as err:
+                print(f"Error al obtener ID de estado: {err}")
+                return None
 
     def get_name_by_id(self, estado_id):
-        conn = self.db_manager.get_connection()
-        if not conn: return "Desconocido"
-        cursor = conn.cursor()
-        try:
-            cursor.execute("SELECT Estado FROM Estado WHERE id = %s", (estado_id,))
-            result = cursor.fetchone()
-            return result[0] if result else "Desconocido"
-        except mysql.connector.Error as err:
-            print(f"Error al obtener nombre de estado: {err}")
-            return "Desconocido"
-        finally:
-            cursor.close()
+        table = self._cached_table()
+        if table is not None:
+            return table.name_by_id.get(estado_id, "Desconocido")
+        with self.db_manager.connection() as conn:
+            if not conn: return "Desconocido"
+            try:
+                rows = self.db_manager.execute_prepared(conn, "SELECT Estado FROM Estado WHERE id = %s", (estado_id,))
+                return rows[0][0] if rows else "Desconocido"
+            except self.db_manager.Error as err:
+                print(f"Error al obtener nombre de estado: {err}")
+                return "Desconocido"
 
 
 class DepartamentoRepository(DepartamentoRepositoryInterface):
@@ -215,41 +355,70 @@ class DepartamentoRepository(DepartamentoRepositoryInterface):
     Gestiona las operaciones de base de datos para la tabla Departamentos.
     Aplica SRP y DIP.
     """
-    def __init__(self, db_manager: DatabaseManager):
+    def __init__(self, db_manager: DatabaseManager, index_ttl=0):
+        """
+        index_ttl: segundos que get_index conserva el índice de cada edificio
+        (0 = sin caché, se consulta siempre).
+        """
         self.db_manager = db_manager
+        self.index_ttl = index_ttl
+        self._indexes = {}      # nombre del consorcio -> (DepartmentIndex, momento de carga)
+        self._lock = threading.Lock()
+
+    def get_index(self, consorcio_nombre):
+        """
+        DepartmentIndex de los departamentos de un edificio. Con index_ttl se
+        conserva en memoria: elegir otra vez el mismo edificio no vuelve a consultar.
+        """
+        if self.index_ttl:
+            with self._lock:
+                cached = self._indexes.get(consorcio_nombre)
+            if cached is not None and time.monotonic() - cached[1] <= self.index_ttl:
+                return cached[0]
+        departments = self.get_all_by_consorcio(consorcio_nombre)
+        # Una lista vacía puede ser un error de conexión: no se guarda.
+        return self.prime(consorcio_nombre, departments) if departments else DepartmentIndex(())
+
+    def prime(self, consorcio_nombre, departments):
+        """Guarda (si hay caché) y devuelve el índice de departamentos ya consultados."""
+        index = DepartmentIndex(departments)
+        if self.index_ttl:
+            with self._lock:
+                self._indexes[consorcio_nombre] = (index, time.monotonic())
+        return index
+
+    def invalidate(self):
+        """Descarta los índices en memoria (p. ej. tras refrescar la réplica local)."""
+        with self._lock:
+            self._indexes.clear()
 
     def get_all_by_consorcio(self, consorcio_nombre=None):
-        conn = self.db_manager.get_connection()
-        if not conn: return []
-        cursor = conn.cursor()
-        try:
-            query = """
-            SELECT
-                D.ID, D.Codigo, D.Unidad, D.Orden, D.Nombre AS dept_nombre,
-                C.Nombre AS consorcio_nombre, D.Consorcio_FK AS consorcioId
-            FROM
-                Departamentos D
-            JOIN
-                Consorcios C ON D.Consorcio_FK = C.Codigo
-            """
-            params = []
-            if consorcio_nombre:
-                query += " WHERE C.Nombre = %s"
-                params.append(consorcio_nombre)
-            query += " ORDER BY C.Nombre, D.Codigo"
-            
-            cursor.execute(query, tuple(params))
+        with self.db_manager.connection() as conn:
+            if not conn: return []
+            cursor = conn.cursor()
+            try:
+                query = """
+                SELECT
+                    D.ID, D.Codigo, D.Unidad, D.Orden, D.Nombre AS dept_nombre,
+                    C.Nombre AS consorcio_nombre, D.Consorcio_FK AS consorcioId
+                FROM
+                    Departamentos D
+                JOIN
+                    Consorcios C ON D.Consorcio_FK = C.Codigo
+                """
+                params = []
+                if consorcio_nombre:
+                    query += " WHERE C.Nombre = %s"
+                    params.append(consorcio_nombre)
+                query += " ORDER BY C.Nombre, D.Codigo"
             
-            columns = [col[0] for col in cursor.description]
-            departments = []
-            for row_data in cursor.fetchall():
-                departments.append(dict(zip(columns, row_data)))
-            return departments
-        except mysql.connector.Error as err:
-            print(f"Error al obtener departamentos: {err}")
-            return []
-        finally:
-            cursor.close()
+                cursor.execute(query, tuple(params))
+                return list(map(cursor_mapper(Department, cursor), cursor.fetchall()))
+            except self.db_manager.Error as err:
+                print(f"Error al obtener departamentos: {err}")
+                return []
+            finally:
+                cursor.close()
 
 
 class AvanceRepository(AvanceRepositoryInterface):
@@ -257,29 +426,40 @@ class AvanceRepository(AvanceRepositoryInterface):
     Gestiona las operaciones de base de datos para la tabla Avance.
     Aplica SRP y DIP.
     """
-    def __init__(self, db_manager: DatabaseManager):
+    def __init__(self, db_manager: DatabaseManager, lookup_cache: LookupCache = None):
         self.db_manager = db_manager
+        self.lookup_cache = lookup_cache
+        self._change_listeners = []
 
-    def get_all_jobs(self):
-        conn = self.db_manager.get_connection()
-        if not conn: return []
-        cursor = conn.cursor(dictionary=True) # Devuelve resultados como diccionarios
-        try:
-            sql = """
-            SELECT
+    def add_change_listener(self, callback):
+        """
+        Registra callback(operacion, ids) a llamar tras cada escritura confirmada:
+        operacion es 'add', 'update' o 'delete' e ids la lista de trabajos afectados,
+        o None si no se conocen (p. ej. una importación en bloque).
+        """
+        self._change_listeners.append(callback)
+
+    def _notify_change(self, operation, job_ids):
+        for callback in self._change_listeners:
+            callback(operation, job_ids)
+
+    # Consulta base de los listados: el trabajo con los nombres ya resueltos.
+    JOBS_COLUMNS = """
                 A.ID,
                 A.Titulo,
                 A.Descripcion,
                 A.DiaFin,
                 A.MesFin,
                 A.AnioFin,
+                A.FechaFin,
                 A.Prioridad AS priority,
                 C.Nombre AS building,
                 D.ID AS departmentId,
                 D.Unidad AS departmentUnit,
                 D.Orden AS departmentOrder,
                 G.Nombre_Fantasia AS technician,
-                E.Estado AS status
+                E.Estado AS status"""
+    JOBS_FROM = """
             FROM
                 Avance A
             JOIN
@@ -290,122 +470,682 @@ class AvanceRepository(AvanceRepositoryInterface):
                 Gremios G ON A.Gremio_FK = G.Id
             JOIN
                 Estado E ON A.Estado_FK = E.id
+            """
+    JOBS_SELECT = "\n            SELECT" + JOBS_COLUMNS + JOBS_FROM
+    # Igual que JOBS_SELECT más la marca de última modificación, para el refresco incremental.
+    JOBS_DELTA_SELECT = "\n            SELECT" + JOBS_COLUMNS + ",\n                A.ActualizadoEn" + JOBS_FROM
+    # Cantidad y suma de IDs del listado (se arma una vez para reutilizar la sentencia preparada).
+    JOBS_CHECKSUM_SQL = "SELECT COUNT(*), COALESCE(SUM(A.ID), 0)" + JOBS_FROM
+    JOBS_ORDER_BY = """
             ORDER BY
-                A.AnioFin DESC, A.MesFin DESC, A.DiaFin DESC
+                A.FechaFin DESC
             """
-            cursor.execute(sql)
-            return cursor.fetchall()
-        except mysql.connector.Error as err:
-            print(f"Error al obtener trabajos: {err}")
-            return []
-        finally:
+
+    def get_all_jobs(self):
+        with self.db_manager.connection() as conn:
+            if not conn: return []
+            try:
+                # Devuelve resultados como objetos Job
+                return self.db_manager.execute_prepared(
+                    conn, self.JOBS_SELECT + self.JOBS_ORDER_BY, model=Job
+                )
+            except self.db_manager.Error as err:
+                print(f"Error al obtener trabajos: {err}")
+                return []
+
+    def iter_all_jobs(self, batch_size=STREAM_BATCH_SIZE, job_filter=None, raise_errors=False):
+        """
+        Igual que get_all_jobs pero como generador: usa un cursor sin buffer
+        (las filas quedan en el servidor) y las trae en lotes de 'batch_size',
+        así la memoria y la latencia hasta la primera fila no dependen del tamaño
+        de la tabla. Si se abandona antes de agotarse, la conexión se descarta.
+        job_filter (JobFilter, optional) restringe las filas en el servidor.
+        Un error de la base corta el recorrido y se informa; con raise_errors se
+        propaga como db_manager.Error (también si no hay conexión), para que quien
+        necesita el listado completo (la exportación) no lo confunda con el final.
+        """
+        conditions, params = build_filter_conditions(job_filter)
+        sql = self.JOBS_SELECT
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        with self.db_manager.connection() as conn:
+            if not conn:
+                if raise_errors:
+                    raise self.db_manager.Error("No se pudo conectar a la base de datos.")
+                return
+            cursor = conn.cursor(buffered=False)
+            try:
+                cursor.execute(sql + self.JOBS_ORDER_BY, params)
+                to_job = cursor_mapper(Job, cursor)
+                while True:
+                    rows = cursor.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    yield from map(to_job, rows)
+            except self.db_manager.Error as err:
+                if raise_errors:
+                    raise
+                print(f"Error al obtener trabajos: {err}")
+                return
+            # Solo se cierra el cursor si se leyó completo: cerrarlo antes drenaría
+            # el resto de filas desde el servidor.
             cursor.close()
 
-    def add_job(self, job_data):
-        conn = self.db_manager.get_connection()
-        if not conn: return False
-        cursor = conn.cursor()
-        try:
-            if job_data.get('Departamento_FK'):
-                sql = """
-                INSERT INTO Avance (DiaIni, MesIni, AnioIni, Consorcio_FK, Departamento_FK, Titulo, Descripcion, Gremio_FK, DiaFin, MesFin, AnioFin, Estado_FK, Prioridad)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                """
-                params = (
-                    job_data['DiaIni'], job_data['MesIni'], job_data['AnioIni'],
-                    job_data['Consorcio_FK'], job_data['Departamento_FK'], job_data['Titulo'],
-                    job_data['Descripcion'], job_data['Gremio_FK'], job_data['DiaFin'],
-                    job_data['MesFin'], job_data['AnioFin'], job_data['Estado_FK'], job_data['Prioridad']
+    def find_jobs(self, job_filter=None, sort='deadline', descending=True, after=None, limit=50):
+        """
+        Devuelve una página de trabajos filtrada y ordenada en el servidor.
+        Args:
+            job_filter (JobFilter, optional): Criterios de búsqueda.
+            sort (str): Una de las claves de job_query.SORT_KEYS.
+            descending (bool): Sentido del orden.
+            after (tuple, optional): Cursor keyset devuelto por la página anterior.
+            limit (int): Tamaño de página.
+        Returns:
+            tuple: (lista de trabajos, cursor de la página siguiente o None si no hay más).
+        """
+        conditions, params = build_filter_conditions(job_filter)
+        if after is not None:
+            keyset_sql, keyset_params = build_keyset_condition(sort, descending, after)
+            conditions.append(keyset_sql)
+            params.extend(keyset_params)
+
+        sql = self.JOBS_SELECT
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        # Se pide una fila extra para saber si existe una página siguiente.
+        sql += build_order_by(sort, descending) + " LIMIT %s"
+        params.append(limit + 1)
+
+        with self.db_manager.connection() as conn:
+            if not conn: return [], None
+            cursor = conn.cursor()
+            try:
+                cursor.execute(sql, tuple(params))
+                jobs = list(map(cursor_mapper(Job, cursor), cursor.fetchall()))
+            except self.db_manager.Error as err:
+                print(f"Error al buscar trabajos: {err}")
+                return [], None
+            finally:
+                cursor.close()
+
+        if len(jobs) > limit:
+            jobs = jobs[:limit]
+            return jobs, keyset_cursor(jobs[-1], sort)
+        return jobs, None
+
+    def count_jobs(self, job_filter=None):
+        """Cantidad de trabajos que cumplen job_filter (None si falla la consulta)."""
+        conditions, params = build_filter_conditions(job_filter)
+        sql = "SELECT COUNT(*)" + self.JOBS_FROM
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        with self.db_manager.connection() as conn:
+            if not conn: return None
+            try:
+                return self.db_manager.execute_prepared(conn, sql, tuple(params))[0][0]
+            except self.db_manager.Error as err:
+                print(f"Error al contar trabajos: {err}")
+                return None
+
+    # Relevancia del índice FULLTEXT ft_avance_texto (migración 4). En modo booleano
+    # '+palabra*' exige cada palabra y la acepta como prefijo.
+    SEARCH_MATCH = "MATCH (A.Titulo, A.Descripcion) AGAINST (%s IN BOOLEAN MODE)"
+    SEARCH_SQL = (
+        "\n            SELECT" + JOBS_COLUMNS + ",\n                " + SEARCH_MATCH + " AS relevance"
+        + JOBS_FROM + " WHERE " + SEARCH_MATCH + " ORDER BY relevance DESC, A.ID DESC LIMIT %s"
+    )
+
+    def search_jobs(self, text, limit=SEARCH_LIMIT):
+        """
+        Trabajos cuyo título o descripción contienen todas las palabras de 'text'
+        (sin distinguir acentos ni mayúsculas), del más relevante al menos relevante.
+        Usa el índice FULLTEXT de Avance (migración 4).
+        """
+        words = tokenize(text)
+        if not words:
+            return []
+        # tokenize deja solo letras y dígitos: no quedan operadores de MySQL en la expresión.
+        against = " ".join(f"+{word}*" for word in words)
+        with self.db_manager.connection() as conn:
+            if not conn: return []
+            try:
+                return self.db_manager.execute_prepared(
+                    conn, self.SEARCH_SQL, (against, against, limit), model=Job
                 )
-            else:
-                sql = """
-                INSERT INTO Avance (DiaIni, MesIni, AnioIni, Consorcio_FK, Titulo, Descripcion, Gremio_FK, DiaFin, MesFin, AnioFin, Estado_FK, Prioridad)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                """
-                params = (
-                    job_data['DiaIni'], job_data['MesIni'], job_data['AnioIni'],
-                    job_data['Consorcio_FK'], job_data['Titulo'], job_data['Descripcion'],
-                    job_data['Gremio_FK'], job_data['DiaFin'], job_data['MesFin'],
-                    job_data['AnioFin'], job_data['Estado_FK'], job_data['Prioridad']
+            except self.db_manager.Error as err:
+                print(f"Error al buscar trabajos: {err}")
+                return []
+
+    def get_job_cursor_at(self, offset, job_filter=None, sort='deadline', descending=True):
+        """
+        Cursor keyset de la fila en la posición 'offset' (desde 0) del listado
+        filtrado y ordenado, para saltar a una página sin recorrer las anteriores.
+        Solo se leen las columnas de orden. Devuelve None si no existe esa fila.
+        """
+        conditions, params = build_filter_conditions(job_filter)
+        sql = "SELECT " + ", ".join(expr for expr, _ in sort_columns(sort)) + self.JOBS_FROM
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += build_order_by(sort, descending) + " LIMIT 1 OFFSET %s"
+        params.append(offset)
+        with self.db_manager.connection() as conn:
+            if not conn: return None
+            try:
+                rows = self.db_manager.execute_prepared(conn, sql, tuple(params))
+            except self.db_manager.Error as err:
+                print(f"Error al posicionar el listado: {err}")
+                return None
+        return tuple(rows[0]) if rows else None
+
+    # --- REFRESCO INCREMENTAL ---
+
+    def iter_jobs_changed_since(self, since=None, batch_size=STREAM_BATCH_SIZE):
+        """
+        Recorre en streaming los trabajos modificados en o después de 'since'
+        (todos si es None), incluyendo la columna ActualizadoEn.
+        """
+        sql, params = self.JOBS_DELTA_SELECT, ()
+        if since is not None:
+            sql += " WHERE A.ActualizadoEn >= %s"
+            params = (since,)
+        with self.db_manager.connection() as conn:
+            if not conn: return
+            cursor = conn.cursor(buffered=False)
+            try:
+                cursor.execute(sql, params)
+                to_job = cursor_mapper(Job, cursor)
+                while True:
+                    rows = cursor.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    yield from map(to_job, rows)
+            except self.db_manager.Error as err:
+                print(f"Error al obtener trabajos modificados: {err}")
+                return
+            cursor.close()
+
+    def get_jobs_by_ids(self, job_ids):
+        """Trabajos (formato de listado con ActualizadoEn) de los IDs indicados."""
+        job_ids = list(job_ids)
+        if not job_ids:
+            return []
+        with self.db_manager.connection() as conn:
+            if not conn: return []
+            cursor = conn.cursor()
+            try:
+                cursor.execute(
+                    self.JOBS_DELTA_SELECT + f" WHERE A.ID IN ({', '.join(['%s'] * len(job_ids))})",
+                    tuple(job_ids)
                 )
+                return list(map(cursor_mapper(Job, cursor), cursor.fetchall()))
+            except self.db_manager.Error as err:
+                print(f"Error al obtener trabajos por ID: {err}")
+                return []
+            finally:
+                cursor.close()
+
+    def get_jobs_checksum(self):
+        """
+        Devuelve (cantidad, suma de IDs) de los trabajos del listado: una sola fila
+        que permite detectar bajas sin transferir la tabla. None si hubo un error.
+        """
+        with self.db_manager.connection() as conn:
+            if not conn: return None
+            try:
+                rows = self.db_manager.execute_prepared(conn, self.JOBS_CHECKSUM_SQL)
+                count, id_sum = rows[0]
+                return int(count), int(id_sum)
+            except self.db_manager.Error as err:
+                print(f"Error al verificar trabajos: {err}")
+                return None
+
+    def get_all_job_ids(self):
+        """Conjunto de IDs de los trabajos del listado, o None si hubo un error."""
+        with self.db_manager.connection() as conn:
+            if not conn: return None
+            cursor = conn.cursor()
+            try:
+                cursor.execute("SELECT A.ID" + self.JOBS_FROM)
+                return {row[0] for row in cursor.fetchall()}
+            except self.db_manager.Error as err:
+                print(f"Error al obtener IDs de trabajos: {err}")
+                return None
+            finally:
+                cursor.close()
+
+    def add_job(self, job_data):
+        with self.db_manager.connection() as conn:
+            if not conn: return False
+            cursor = conn.cursor()
+            try:
+                fecha_ini = job_date(job_data['DiaIni'], job_data['MesIni'], job_data['AnioIni'])
+                fecha_fin = job_date(job_data['DiaFin'], job_data['MesFin'], job_data['AnioFin'])
+                if job_data.get('Departamento_FK'):
+                    sql = """
+                    INSERT INTO Avance (DiaIni, MesIni, AnioIni, Consorcio_FK, Departamento_FK, Titulo, Descripcion, Gremio_FK, DiaFin, MesFin, AnioFin, Estado_FK, Prioridad, FechaIni, FechaFin)
+                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                    """
+                    params = (
+                        job_data['DiaIni'], job_data['MesIni'], job_data['AnioIni'],
+                        job_data['Consorcio_FK'], job_data['Departamento_FK'], job_data['Titulo'],
+                        job_data['Descripcion'], job_data['Gremio_FK'], job_data['DiaFin'],
+                        job_data['MesFin'], job_data['AnioFin'], job_data['Estado_FK'], job_data['Prioridad'],
+                        fecha_ini, fecha_fin
+                    )
+                else:
+                    sql = """
+                    INSERT INTO Avance (DiaIni, MesIni, AnioIni, Consorcio_FK, Titulo, Descripcion, Gremio_FK, DiaFin, MesFin, AnioFin, Estado_FK, Prioridad, FechaIni, FechaFin)
+                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                    """
+                    params = (
+                        job_data['DiaIni'], job_data['MesIni'], job_data['AnioIni'],
+                        job_data['Consorcio_FK'], job_data['Titulo'], job_data['Descripcion'],
+                        job_data['Gremio_FK'], job_data['DiaFin'], job_data['MesFin'],
+                        job_data['AnioFin'], job_data['Estado_FK'], job_data['Prioridad'],
+                        fecha_ini, fecha_fin
+                    )
             
-            cursor.execute(sql, params)
-            self.db_manager.commit()
-            return True
-        except mysql.connector.Error as err:
-            print(f"Error al añadir trabajo: {err}")
-            self.db_manager.rollback()
-            return False
-        finally:
-            cursor.close()
+                cursor.execute(sql, params)
+                self.db_manager.commit(conn)
+                job_id = cursor.lastrowid
+            except self.db_manager.Error as err:
+                print(f"Error al añadir trabajo: {err}")
+                self.db_manager.rollback(conn)
+                return False
+            finally:
+                cursor.close()
+        self._notify_change('add', [job_id] if job_id else None)
+        return job_id or True # ID del trabajo nuevo (siempre verdadero)
+
+    BULK_INSERT_SQL = """
+            INSERT INTO Avance (DiaIni, MesIni, AnioIni, Consorcio_FK, Departamento_FK, Titulo, Descripcion, Gremio_FK, DiaFin, MesFin, AnioFin, Estado_FK, Prioridad, FechaIni, FechaFin)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+            """
+
+    def add_jobs_bulk(self, jobs, chunk_size=BULK_CHUNK_SIZE):
+        """
+        Inserta muchos trabajos (mismo formato que add_job) en una sola transacción.
+        executemany() envía cada bloque de 'chunk_size' filas como un único INSERT
+        multi-fila, así se paga un viaje por bloque y un solo commit en total.
+        Returns:
+            int: Filas insertadas, o None si hubo un error y se revirtió todo.
+        """
+        if not jobs:
+            return 0
+        with self.db_manager.connection() as conn:
+            if not conn: return None
+            cursor = conn.cursor()
+            try:
+                self.db_manager.begin(conn)
+                inserted = 0
+                for start in range(0, len(jobs), chunk_size):
+                    params = [
+                        (
+                            job['DiaIni'], job['MesIni'], job['AnioIni'],
+                            job['Consorcio_FK'], job.get('Departamento_FK'), job['Titulo'],
+                            job['Descripcion'], job['Gremio_FK'], job['DiaFin'],
+                            job['MesFin'], job['AnioFin'], job['Estado_FK'], job['Prioridad'],
+                            job_date(job['DiaIni'], job['MesIni'], job['AnioIni']),
+                            job_date(job['DiaFin'], job['MesFin'], job['AnioFin'])
+                        )
+                        for job in jobs[start:start + chunk_size]
+                    ]
+                    cursor.executemany(self.BULK_INSERT_SQL, params)
+                    inserted += cursor.rowcount
+                self.db_manager.commit(conn)
+            except self.db_manager.Error as err:
+                print(f"Error al añadir trabajos en bloque: {err}")
+                self.db_manager.rollback(conn)
+                return None
+            finally:
+                cursor.close()
+        self._notify_change('add', None)
+        return inserted
 
     def get_job_by_id(self, job_id):
-        conn = self.db_manager.get_connection()
-        if not conn: return None
-        cursor = conn.cursor(dictionary=True)
-        try:
-            cursor.execute("SELECT * FROM Avance WHERE ID = %s", (job_id,))
-            return cursor.fetchone()
-        except mysql.connector.Error as err:
-            print(f"Error al obtener trabajo por ID: {err}")
-            return None
-        finally:
-            cursor.close()
+        with self.db_manager.connection() as conn:
+            if not conn: return None
+            try:
+                rows = self.db_manager.execute_prepared(
+                    conn, "SELECT * FROM Avance WHERE ID = %s", (job_id,), model=JobRecord
+                )
+                return rows[0].track() if rows else None
+            except self.db_manager.Error as err:
+                print(f"Error al obtener trabajo por ID: {err}")
+                return None
+
+    # Trabajo con sus nombres resueltos y, por LEFT JOIN, una fila por cada
+    # departamento de su edificio (o una sola fila con NULL si no tiene).
+    EDIT_FORM_SELECT = """
+            SELECT
+                A.*,
+                C.Nombre AS form_consorcio,
+                G.Nombre_Fantasia AS form_gremio,
+                E.Estado AS form_estado,
+                D.ID AS form_dept_id,
+                D.Codigo AS form_dept_codigo,
+                D.Unidad AS form_dept_unidad,
+                D.Orden AS form_dept_orden,
+                D.Nombre AS form_dept_nombre
+            FROM
+                Avance A
+            LEFT JOIN
+                Consorcios C ON A.Consorcio_FK = C.Codigo
+            LEFT JOIN
+                Gremios G ON A.Gremio_FK = G.Id
+            LEFT JOIN
+                Estado E ON A.Estado_FK = E.id
+            LEFT JOIN
+                Departamentos D ON D.Consorcio_FK = A.Consorcio_FK
+            WHERE
+                A.ID = %s
+            ORDER BY
+                D.Codigo
+            """
+
+    def get_edit_form(self, job_id):
+        """
+        Carga en una sola consulta el trabajo, sus nombres actuales y los departamentos
+        de su edificio; las listas de edificios y técnicos salen del LookupCache (o, sin
+        caché, de una consulta UNION ALL sobre la misma conexión).
+        Returns:
+            EditForm, o None si el trabajo no existe o hubo un error.
+        """
+        with self.db_manager.connection() as conn:
+            if not conn: return None
+            cursor = conn.cursor()
+            try:
+                cursor.execute(self.EDIT_FORM_SELECT, (job_id,))
+                rows = cursor.fetchall()
+                columns = [column[0] for column in cursor.description]
+                if not rows:
+                    return None
+                tables = None
+                if self.lookup_cache is not None:
+                    consorcios = self.lookup_cache.table('consorcios')
+                    gremios = self.lookup_cache.table('gremios')
+                    if consorcios is not None and gremios is not None:
+                        tables = {'consorcios': consorcios, 'gremios': gremios}
+                if tables is None:
+                    lookup_cursor = conn.cursor()
+                    try:
+                        tables = LookupCache.fetch_tables(lookup_cursor)
+                    finally:
+                        lookup_cursor.close()
+            except self.db_manager.Error as err:
+                print(f"Error al cargar el trabajo para editar: {err}")
+                return None
+            finally:
+                cursor.close()
+
+        first = rows[0]
+        # Las columnas form_* no son de JobRecord: row_mapper las ignora.
+        job = row_mapper(JobRecord, columns)(first).track()
+        position = {name: i for i, name in enumerate(columns)}
+        dept_id, codigo, unidad, orden, nombre, consorcio = (
+            position[name] for name in ('form_dept_id', 'form_dept_codigo', 'form_dept_unidad',
+                                        'form_dept_orden', 'form_dept_nombre', 'form_consorcio')
+        )
+        departamentos = [
+            Department(row[dept_id], row[codigo], row[unidad], row[orden], row[nombre],
+                       row[consorcio], job.Consorcio_FK)
+            for row in rows if row[dept_id] is not None
+        ]
+        return EditForm(
+            job,
+            first[consorcio] or "Desconocido",
+            first[position['form_gremio']] or "Desconocido",
+            first[position['form_estado']] or "Desconocido",
+            departamentos,
+            tables['consorcios'],
+            tables['gremios']
+        )
 
     def update_job(self, job_id, job_data):
-        conn = self.db_manager.get_connection()
-        if not conn: return False
-        cursor = conn.cursor()
+        """
+        Actualiza un trabajo escribiendo solo lo necesario. job_data puede ser:
+          - el JobRecord de get_job_by_id/get_edit_form modificado por atributo: se
+            escriben las columnas que cambiaron desde que se leyó y, si la tabla tiene
+            Version (migración 6), solo si nadie más lo modificó mientras tanto;
+          - un dict con las columnas editables a escribir (las tres de la fecha límite
+            juntas, si se cambia).
+        FechaFin se recalcula si cambia la fecha límite. Sin cambios no se consulta la base.
+        Returns:
+            bool: True si el trabajo se actualizó.
+        """
         try:
-            if job_data.get('Departamento_FK') is None:
-                sql = """
-                UPDATE Avance
-                SET Titulo = %s, Descripcion = %s, DiaFin = %s, MesFin = %s, AnioFin = %s,
-                    Consorcio_FK = %s, Departamento_FK = NULL, Gremio_FK = %s, Estado_FK = %s, Prioridad = %s
-                WHERE ID = %s
-                """
-                params = (
-                    job_data['Titulo'], job_data['Descripcion'],
-                    job_data['DiaFin'], job_data['MesFin'], job_data['AnioFin'],
-                    job_data['Consorcio_FK'], job_data['Gremio_FK'], job_data['Estado_FK'],
-                    job_data['Prioridad'], job_id
-                )
-            else:
-                sql = """
-                UPDATE Avance
-                SET Titulo = %s, Descripcion = %s, DiaFin = %s, MesFin = %s, AnioFin = %s,
-                    Consorcio_FK = %s, Departamento_FK = %s, Gremio_FK = %s, Estado_FK = %s, Prioridad = %s
-                WHERE ID = %s
-                """
-                params = (
-                    job_data['Titulo'], job_data['Descripcion'],
-                    job_data['DiaFin'], job_data['MesFin'], job_data['AnioFin'],
-                    job_data['Consorcio_FK'], job_data['Departamento_FK'], job_data['Gremio_FK'],
-                    job_data['Estado_FK'], job_data['Prioridad'], job_id
-                )
-            
-            cursor.execute(sql, params)
-            self.db_manager.commit()
-            return cursor.rowcount > 0
-        except mysql.connector.Error as err:
-            print(f"Error al actualizar trabajo: {err}")
-            self.db_manager.rollback()
+            job_id = int(job_id)
+        except (TypeError, ValueError):
             return False
-        finally:
-            cursor.close()
+        if isinstance(job_data, JobRecord):
+            job, changes, version = job_data, job_data.changes(), job_data.Version
+            deadline = job
+        else:
+            job, version = None, None
+            changes = {name: job_data[name] for name in JOB_EDITABLE_COLUMNS if name in job_data}
+            deadline = job_data
+        if not changes:
+            return False
+        if changes.keys() & {'DiaFin', 'MesFin', 'AnioFin'}:
+            changes['FechaFin'] = job_date(deadline['DiaFin'], deadline['MesFin'], deadline['AnioFin'])
+
+        sql = f"UPDATE Avance SET {', '.join(f'{name} = %s' for name in changes)} WHERE ID = %s"
+        params = tuple(changes.values()) + (job_id,)
+        if version is not None:
+            # Version la incrementa un trigger en cada UPDATE (migración 6).
+            sql += " AND Version = %s"
+            params += (version,)
+        with self.db_manager.connection() as conn:
+            if not conn: return False
+            cursor = conn.cursor()
+            try:
+                cursor.execute(sql, params)
+                updated = cursor.rowcount > 0
+                current_version = None
+                if not updated and version is not None:
+                    cursor.execute("SELECT Version FROM Avance WHERE ID = %s", (job_id,))
+                    row = cursor.fetchone()
+                    current_version = row[0] if row else None
+                self.db_manager.commit(conn)
+            except self.db_manager.Error as err:
+                print(f"Error al actualizar trabajo: {err}")
+                self.db_manager.rollback(conn)
+                return False
+            finally:
+                cursor.close()
+        if current_version is not None:
+            print(f"Conflicto: el trabajo {job_id} fue modificado por otro usuario después de "
+                  f"cargarlo (versión {version}, ahora {current_version}). Vuelva a cargarlo.")
+        if updated:
+            if job is not None:
+                if version is not None:
+                    job.Version = version + 1
+                if 'FechaFin' in changes:
+                    job.FechaFin = changes['FechaFin']
+                job.track()
+            self._notify_change('update', [job_id])
+        return updated
 
     def delete_job(self, job_id):
-        conn = self.db_manager.get_connection()
-        if not conn: return False
-        cursor = conn.cursor()
         try:
-            cursor.execute("DELETE FROM Avance WHERE ID = %s", (job_id,))
-            self.db_manager.commit()
-            return cursor.rowcount > 0
-        except mysql.connector.Error as err:
-            print(f"Error al eliminar trabajo: {err}")
-            self.db_manager.rollback()
+            job_id = int(job_id)
+        except (TypeError, ValueError):
             return False
-        finally:
-            cursor.close()
+        with self.db_manager.connection() as conn:
+            if not conn: return False
+            cursor = conn.cursor()
+            try:
+                cursor.execute("DELETE FROM Avance WHERE ID = %s", (job_id,))
+                self.db_manager.commit(conn)
+                deleted = cursor.rowcount > 0
+            except self.db_manager.Error as err:
+                print(f"Error al eliminar trabajo: {err}")
+                self.db_manager.rollback(conn)
+                return False
+            finally:
+                cursor.close()
+        if deleted:
+            self._notify_change('delete', [job_id])
+        return deleted
+
+    # --- TABLERO ---
+
+    # Dimensiones del tablero: (expresión del nombre sobre JOBS_FROM, Dimension en
+    # ResumenAvance, JOIN para resolver el nombre y expresión del nombre en el resumen).
+    # Los totales por estado se suman desde la dimensión de prioridad, la de menos filas.
+    COUNT_DIMENSIONS = {
+        'status': ("E.Estado", "prioridad", "", "E.Estado"),
+        'priority': ("COALESCE(A.Prioridad, '')", "prioridad", "", "R.Clave"),
+        'building': ("C.Nombre", "consorcio", " JOIN Consorcios C ON C.Codigo = R.Clave", "C.Nombre"),
+        'technician': ("G.Nombre_Fantasia", "gremio", " JOIN Gremios G ON G.Id = R.Clave", "G.Nombre_Fantasia"),
+    }
+
+    def get_job_counts(self, dimension, use_summary=False):
+        """
+        Cantidad de trabajos por (nombre, estado) para una de COUNT_DIMENSIONS.
+        Con use_summary se lee la tabla ResumenAvance que mantienen los triggers de
+        la migración 5 (unas decenas de filas por dimensión) en lugar de agrupar Avance.
+        Returns:
+            list: [(nombre, estado, cantidad)], o None si falla la consulta.
+        """
+        expr, summary_dimension, summary_join, summary_expr = self.COUNT_DIMENSIONS[dimension]
+        if use_summary:
+            sql = (f"SELECT {summary_expr}, E.Estado, SUM(R.Cantidad) FROM ResumenAvance R{summary_join}"
+                   " JOIN Estado E ON E.id = R.Estado_FK"
+                   f" WHERE R.Dimension = %s AND R.Cantidad <> 0 GROUP BY {summary_expr}, E.Estado")
+            params = (summary_dimension,)
+        else:
+            sql = f"SELECT {expr}, E.Estado, COUNT(*)" + self.JOBS_FROM + f" GROUP BY {expr}, E.Estado"
+            params = ()
+        with self.db_manager.connection() as conn:
+            if not conn: return None
+            try:
+                rows = self.db_manager.execute_prepared(conn, sql, params)
+            except self.db_manager.Error as err:
+                print(f"Error al contar trabajos por {dimension}: {err}")
+                return None
+        return [(name, status, int(count)) for name, status, count in rows]
+
+    def get_overdue_counts(self, dimension, closed_statuses, today=None):
+        """
+        Trabajos vencidos (fecha límite anterior a 'today' y estado fuera de
+        closed_statuses) por nombre. Depende de la fecha, así que no puede salir del
+        resumen: se agrupa Avance, pero el filtro por FechaFin solo recorre las filas
+        vencidas. Returns: {nombre: cantidad}, o None si falla la consulta.
+        """
+        expr = self.COUNT_DIMENSIONS[dimension][0]
+        sql = f"SELECT {expr}, COUNT(*)" + self.JOBS_FROM + " WHERE A.FechaFin < %s"
+        params = [today or date.today()]
+        if closed_statuses:
+            sql += f" AND E.Estado NOT IN ({', '.join(['%s'] * len(closed_statuses))})"
+            params.extend(closed_statuses)
+        sql += f" GROUP BY {expr}"
+        with self.db_manager.connection() as conn:
+            if not conn: return None
+            try:
+                rows = self.db_manager.execute_prepared(conn, sql, tuple(params))
+            except self.db_manager.Error as err:
+                print(f"Error al contar trabajos vencidos por {dimension}: {err}")
+                return None
+        return {name: int(count) for name, count in rows}
+
+    # --- VENCIMIENTOS ---
+
+    def get_open_deadlines(self, closed_statuses):
+        """
+        Trabajos con fecha límite cuyo estado no está en closed_statuses, para el
+        índice de vencimientos (deadline_alerts.py). Estado tiene pocas filas: el plan
+        parte de ella y entra a Avance por idx_avance_estado_fechafin (migración 2),
+        sin recorrer los trabajos cerrados. Returns: list de Job, o None si falla.
+        """
+        sql = self.JOBS_SELECT + " WHERE A.FechaFin IS NOT NULL"
+        if closed_statuses:
+            sql += f" AND E.Estado NOT IN ({', '.join(['%s'] * len(closed_statuses))})"
+        with self.db_manager.connection() as conn:
+            if not conn: return None
+            try:
+                return self.db_manager.execute_prepared(conn, sql, tuple(closed_statuses), model=Job)
+            except self.db_manager.Error as err:
+                print(f"Error al obtener vencimientos: {err}")
+                return None
+
+    # --- OPERACIONES EN BLOQUE ---
+
+    def _bulk_where(self, job_ids, job_filter):
+        conditions, params = build_filter_conditions(job_filter, joined=False)
+        if job_ids is not None:
+            job_ids = list(job_ids)
+            if not job_ids:
+                conditions.append("1 = 0")
+            else:
+                conditions.append(f"Avance.ID IN ({', '.join(['%s'] * len(job_ids))})")
+                params.extend(job_ids)
+        if not conditions:
+            # Evita modificar toda la tabla por olvidar el criterio de selección.
+            raise ValueError("Se requiere una lista de IDs o un filtro para operar en bloque.")
+        return " AND ".join(conditions), params
+
+    def _run_bulk(self, changes, job_ids, job_filter, dry_run, action):
+        """
+        Ejecuta un UPDATE con 'changes' ({columna: valor}) o, si changes es None,
+        un DELETE, sobre los trabajos seleccionados.
+        """
+        if job_ids is not None:
+            try:
+                job_ids = [int(job_id) for job_id in job_ids]
+            except (TypeError, ValueError):
+                print(f"Error al {action} en bloque: los IDs deben ser números enteros.")
+                return None
+        where, params = self._bulk_where(job_ids, job_filter)
+        if changes is None:
+            statement, statement_params = "DELETE FROM Avance", []
+        else:
+            statement = "UPDATE Avance SET " + ", ".join(f"{column} = %s" for column in changes)
+            statement_params = list(changes.values())
+        with self.db_manager.connection() as conn:
+            if not conn: return None
+            cursor = conn.cursor()
+            try:
+                if dry_run:
+                    cursor.execute(f"SELECT Avance.ID FROM Avance WHERE {where} ORDER BY Avance.ID", tuple(params))
+                    ids = [row[0] for row in cursor.fetchall()]
+                    return BulkResult(len(ids), ids, dry_run=True)
+                cursor.execute(f"{statement} WHERE {where}", tuple(statement_params + params))
+                self.db_manager.commit(conn)
+                result = BulkResult(cursor.rowcount)
+            except self.db_manager.Error as err:
+                print(f"Error al {action} en bloque: {err}")
+                self.db_manager.rollback(conn)
+                return None
+            finally:
+                cursor.close()
+        if result.affected:
+            # Con un filtro no se sabe qué trabajos cambiaron.
+            self._notify_change('delete' if changes is None else 'update',
+                                job_ids if job_filter is None else None)
+        return result
+
+    def update_status_bulk(self, estado_id, job_ids=None, job_filter=None, dry_run=False):
+        """
+        Cambia el estado de todos los trabajos seleccionados por 'job_ids' y/o
+        'job_filter' con un único UPDATE. Con dry_run=True solo informa qué
+        trabajos se verían afectados. Devuelve un BulkResult o None si hubo error.
+        """
+        return self._run_bulk(
+            {'Estado_FK': estado_id},
+            job_ids, job_filter, dry_run, "actualizar el estado de trabajos"
+        )
+
+    def reassign_gremio_bulk(self, gremio_id, job_ids=None, job_filter=None, dry_run=False):
+        """Reasigna el técnico (Gremio_FK) de los trabajos seleccionados con un único UPDATE."""
+        return self._run_bulk(
+            {'Gremio_FK': gremio_id},
+            job_ids, job_filter, dry_run, "reasignar trabajos"
+        )
 
+    def delete_jobs_bulk(self, job_ids=None, job_filter=None, dry_run=False):
+        """Elimina los trabajos seleccionados con un único DELETE."""
+        return self._run_bulk(
+            None,
+            job_ids, job_filter, dry_run, "eliminar trabajos"
+        )
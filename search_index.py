@@ -0,0 +1,211 @@
+# search_index.py
+import heapq
+import math
+import re
+import threading
+import unicodedata
+from bisect import bisect_left, insort
+from itertools import compress, islice, repeat
+from operator import add, eq, gt, mul
+from config import SEARCH_LIMIT, SEARCH_MIN_PREFIX, SEARCH_TITLE_WEIGHT
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+# Palabras demasiado frecuentes en español para aportar a la búsqueda (ya sin acentos).
+STOPWORDS = frozenset("""
+a al con de del el en es la las lo los o para por que se su sus un una uno y
+""".split())
+
+
+def normalize(text):
+    """Minúsculas y sin acentos ni diéresis: 'Filtración' -> 'filtracion'."""
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+
+
+def tokenize(text):
+    """Palabras normalizadas de 'text', sin las de una letra ni las STOPWORDS."""
+    if not text:
+        return []
+    return [word for word in _WORD.findall(normalize(text))
+            if len(word) > 1 and word not in STOPWORDS]
+
+
+class SearchIndex:
+    """
+    Índice invertido en memoria sobre Titulo y Descripcion de los trabajos, para
+    buscar sin el índice FULLTEXT de MySQL (réplica SQLite / modo sin conexión).
+
+    Cada palabra guarda {ID: peso}; el peso ya incluye la frecuencia (las palabras
+    del título cuentan SEARCH_TITLE_WEIGHT veces) normalizada por el largo del
+    trabajo, así la consulta solo suma peso * idf. Todas las palabras buscadas deben
+    aparecer (igual que '+palabra*' en MySQL) y las de SEARCH_MIN_PREFIX letras o más
+    también coinciden como prefijo ('filtr' encuentra 'filtracion'), con todas las
+    palabras del índice que empiezan así.
+
+    Se carga completo la primera vez y luego se mantiene con apply_change(), que
+    se registra como listener de cambios del repositorio.
+    """
+    def __init__(self, avance_repo):
+        self.avance_repo = avance_repo
+        self._postings = None           # palabra -> {ID: peso}
+        self._documents = {}            # ID -> palabras del trabajo (para quitarlo)
+        self._vocabulary = []           # palabras ordenadas, para buscar por prefijo
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._documents)
+
+    def invalidate(self):
+        """Descarta el índice; la próxima búsqueda lo vuelve a cargar."""
+        with self._lock:
+            self._postings = None
+            self._documents = {}
+            self._vocabulary = []
+
+    def load(self):
+        """Carga el índice si no está cargado (se puede llamar en segundo plano)."""
+        with self._lock:
+            self._ensure_loaded()
+
+    def _ensure_loaded(self):
+        if self._postings is not None:
+            return
+        self._postings, self._documents = {}, {}
+        for job in self.avance_repo.iter_all_jobs():
+            self._add(job.ID, job.Titulo, job.Descripcion, sort_vocabulary=False)
+        self._vocabulary = sorted(self._postings)
+
+    def _add(self, job_id, titulo, descripcion, sort_vocabulary=True):
+        counts = {}
+        for word in tokenize(titulo):
+            counts[word] = counts.get(word, 0) + SEARCH_TITLE_WEIGHT
+        for word in tokenize(descripcion):
+            counts[word] = counts.get(word, 0) + 1
+        if not counts:
+            return
+        norm = math.sqrt(sum(counts.values()))
+        for word, count in counts.items():
+            posting = self._postings.get(word)
+            if posting is None:
+                posting = self._postings[word] = {}
+                if sort_vocabulary:
+                    insort(self._vocabulary, word)
+            posting[job_id] = (1 + math.log(count)) / norm
+        self._documents[job_id] = tuple(counts)
+
+    def _remove(self, job_id):
+        for word in self._documents.pop(job_id, ()):
+            posting = self._postings[word]
+            del posting[job_id]
+            if not posting:
+                del self._postings[word]
+                position = bisect_left(self._vocabulary, word)
+                if position < len(self._vocabulary) and self._vocabulary[position] == word:
+                    del self._vocabulary[position]
+
+    def apply_change(self, operation, job_ids):
+        """
+        Listener de AvanceRepository.add_change_listener: reindexa los trabajos
+        agregados o modificados y quita los eliminados. Sin IDs (cambio en bloque
+        sin detalle) se descarta el índice.
+        """
+        with self._lock:
+            if self._postings is None:
+                return  # Todavía no se cargó: tomará los cambios al cargarse
+            if job_ids is None:
+                self._postings, self._documents, self._vocabulary = None, {}, []
+                return
+            for job_id in job_ids:
+                self._remove(job_id)
+            if operation != 'delete':
+                for job in self.avance_repo.get_jobs_by_ids(job_ids):
+                    self._add(job.ID, job.Titulo, job.Descripcion)
+
+    def _expand(self, word):
+        """Palabras del índice que corresponden a 'word' (exacta y, si es larga, por prefijo)."""
+        if len(word) < SEARCH_MIN_PREFIX:
+            return [word] if word in self._postings else []
+        matches = []
+        position = bisect_left(self._vocabulary, word)
+        for candidate in islice(self._vocabulary, position, None):
+            if not candidate.startswith(word):
+                break
+            matches.append(candidate)
+        return matches
+
+    def _term(self, matches, total):
+        """
+        (posting, idf) de una palabra buscada. Con varias coincidencias por prefijo se
+        funden en un solo posting con el mejor peso * idf de cada trabajo (e idf 1), así
+        el resto de la búsqueda no depende de cuántas palabras abarca el prefijo: el
+        costo es el de recorrer sus apariciones, como en el índice FULLTEXT.
+        """
+        if len(matches) == 1:
+            posting = self._postings[matches[0]]
+            return posting, math.log(1 + total / len(posting))
+        merged = {}
+        best = merged.get
+        for match in matches:
+            posting = self._postings[match]
+            idf = math.log(1 + total / len(posting))
+            for job_id, weight in posting.items():
+                score = weight * idf
+                if score > best(job_id, 0.0):
+                    merged[job_id] = score
+        return merged, 1.0
+
+    def search(self, text, limit=SEARCH_LIMIT):
+        """
+        Devuelve [(ID, puntaje)] de los trabajos que contienen todas las palabras de
+        'text', del más relevante al menos relevante, como mucho 'limit'.
+        """
+        words = list(dict.fromkeys(tokenize(text)))
+        if not words:
+            return []
+        with self._lock:
+            self._ensure_loaded()
+            total = len(self._documents)
+            terms = []
+            for word in words:
+                matches = self._expand(word)
+                if not matches:
+                    return []
+                terms.append(self._term(matches, total))
+
+            # Se parte de la palabra con menos candidatos y las demás solo se consultan
+            # para esos IDs: el costo depende de la palabra más rara, no de la tabla.
+            terms.sort(key=lambda term: len(term[0]))
+            if len(terms) == 1:
+                # Una sola palabra: el orden es el de los pesos guardados.
+                posting, idf = terms[0]
+                top = _top(list(posting.values()), list(posting), limit)
+                return [(job_id, weight * idf) for job_id, weight in top]
+            ids = list(terms[0][0])
+            for posting, _ in terms[1:]:
+                ids = list(filter(posting.__contains__, ids))
+                if not ids:
+                    return []
+
+            # Puntaje = suma por palabra del mejor peso * idf entre sus coincidencias.
+            # Se calcula por columnas con map() para no iterar fila a fila en Python.
+            scores = repeat(0.0)
+            for posting, idf in terms:
+                scores = list(map(add, scores, map(mul, map(posting.__getitem__, ids), repeat(idf))))
+        return _top(scores, ids, limit)
+
+
+def _top(scores, ids, limit):
+    """
+    Los 'limit' mejores (ID, puntaje), con los empates resueltos por ID descendente
+    (como ORDER BY relevancia DESC, ID DESC). Primero se busca el puntaje de corte
+    comparando solo números; los pares (puntaje, ID) se arman para pocos trabajos.
+    Los IDs empatados en el corte suelen venir ya en orden (el de alta), y ordenarlos
+    completos es lineal en ese caso.
+    """
+    if len(ids) <= limit:
+        return sorted(zip(ids, scores), key=lambda item: (item[1], item[0]), reverse=True)
+    cutoff = heapq.nlargest(limit, scores)[-1]
+    above = sorted(compress(zip(scores, ids), map(gt, scores, repeat(cutoff))), reverse=True)
+    tied = sorted(compress(ids, map(eq, scores, repeat(cutoff))), reverse=True)[:limit - len(above)]
+    return [(job_id, score) for score, job_id in above] + [(job_id, cutoff) for job_id in tied]
@@ -0,0 +1,218 @@
+# sqlite_backend.py
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import date
+from transactions import TransactionMixin
+from models import cursor_mapper
+
+# SQLite no trae adaptadores de fechas registrados por defecto en versiones recientes
+# de Python: se registran aquí para que las columnas DATE vuelvan como datetime.date.
+sqlite3.register_adapter(date, date.isoformat)
+sqlite3.register_converter("DATE", lambda value: date.fromisoformat(value.decode()))
+
+# Esquema de las tablas que usa la aplicación, en su versión SQLite.
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS Consorcios (
+    Codigo INTEGER PRIMARY KEY,
+    Nombre TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS Gremios (
+    Id INTEGER PRIMARY KEY,
+    Nombre_Fantasia TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS Estado (
+    id INTEGER PRIMARY KEY,
+    Estado TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS Departamentos (
+    ID INTEGER PRIMARY KEY,
+    Codigo INTEGER,
+    Unidad TEXT,
+    Orden INTEGER,
+    Nombre TEXT,
+    Consorcio_FK INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS Avance (
+    ID INTEGER PRIMARY KEY,
+    DiaIni INTEGER, MesIni INTEGER, AnioIni INTEGER,
+    Consorcio_FK INTEGER NOT NULL,
+    Departamento_FK INTEGER,
+    Titulo TEXT NOT NULL,
+    Descripcion TEXT,
+    Gremio_FK INTEGER NOT NULL,
+    DiaFin INTEGER, MesFin INTEGER, AnioFin INTEGER,
+    Estado_FK INTEGER NOT NULL,
+    Prioridad TEXT,
+    FechaIni DATE,
+    FechaFin DATE,
+    ActualizadoEn TIMESTAMP NOT NULL DEFAULT (strftime('%Y-%m-%d %H:%M:%f', 'now'))
+);
+CREATE INDEX IF NOT EXISTS idx_departamentos_consorcio ON Departamentos (Consorcio_FK);
+CREATE INDEX IF NOT EXISTS idx_avance_estado_fechafin ON Avance (Estado_FK, FechaFin);
+CREATE INDEX IF NOT EXISTS idx_avance_consorcio_fechafin ON Avance (Consorcio_FK, FechaFin);
+CREATE INDEX IF NOT EXISTS idx_avance_gremio_fechafin ON Avance (Gremio_FK, FechaFin);
+CREATE INDEX IF NOT EXISTS idx_avance_actualizado ON Avance (ActualizadoEn);
+-- Equivalente a ON UPDATE CURRENT_TIMESTAMP de MySQL.
+CREATE TRIGGER IF NOT EXISTS trg_avance_actualizado AFTER UPDATE ON Avance
+FOR EACH ROW WHEN NEW.ActualizadoEn IS OLD.ActualizadoEn
+BEGIN
+    UPDATE Avance SET ActualizadoEn = strftime('%Y-%m-%d %H:%M:%f', 'now') WHERE ID = NEW.ID;
+END;
+"""
+
+
+def _to_qmark(sql):
+    """Convierte el estilo de parámetros de mysql.connector (%s) al de sqlite3 (?)."""
+    return sql.replace("%s", "?").replace("%%", "%")
+
+
+class SQLiteCursor:
+    """
+    Cursor de sqlite3 con la interfaz que usan los repositorios de mysql.connector:
+    parámetros %s y filas como diccionarios con dictionary=True.
+    """
+    def __init__(self, raw_cursor, dictionary=False):
+        self._cursor = raw_cursor
+        self._dictionary = dictionary
+        self._columns = None
+
+    @property
+    def description(self):
+        return self._cursor.description
+
+    @property
+    def rowcount(self):
+        return self._cursor.rowcount
+
+    @property
+    def lastrowid(self):
+        return self._cursor.lastrowid
+
+    def execute(self, sql, params=()):
+        self._cursor.execute(_to_qmark(sql), tuple(params or ()))
+        self._columns = [col[0] for col in self._cursor.description] if self._cursor.description else None
+
+    def executemany(self, sql, seq_params):
+        self._cursor.executemany(_to_qmark(sql), seq_params)
+
+    def _row(self, row):
+        if row is None or not self._dictionary:
+            return row
+        return dict(zip(self._columns, row))
+
+    def fetchone(self):
+        return self._row(self._cursor.fetchone())
+
+    def fetchmany(self, size=1):
+        return [self._row(row) for row in self._cursor.fetchmany(size)]
+
+    def fetchall(self):
+        return [self._row(row) for row in self._cursor.fetchall()]
+
+    def __iter__(self):
+        return (self._row(row) for row in self._cursor)
+
+    def close(self):
+        self._cursor.close()
+
+
+class SQLiteConnection:
+    """Conexión sqlite3 en modo autocommit con la interfaz de una conexión mysql.connector."""
+    unread_result = False
+
+    def __init__(self, path):
+        self.raw = sqlite3.connect(
+            path, detect_types=sqlite3.PARSE_DECLTYPES,
+            isolation_level=None, check_same_thread=False
+        )
+        self.raw.execute("PRAGMA foreign_keys = ON")
+
+    @property
+    def in_transaction(self):
+        return self.raw.in_transaction
+
+    def cursor(self, dictionary=False, buffered=None, prepared=False):
+        # buffered/prepared se aceptan por compatibilidad: sqlite3 ya cachea sentencias.
+        return SQLiteCursor(self.raw.cursor(), dictionary=dictionary)
+
+    def start_transaction(self):
+        self.raw.execute("BEGIN")
+
+    def commit(self):
+        if self.raw.in_transaction:
+            self.raw.execute("COMMIT")
+
+    def rollback(self):
+        if self.raw.in_transaction:
+            self.raw.execute("ROLLBACK")
+
+    def close(self):
+        self.raw.close()
+
+
+class SQLiteDatabaseManager(TransactionMixin):
+    """
+    Alternativa a DatabaseManager sobre un archivo SQLite local, con la misma
+    interfaz (connection(), transaction(), commit(), rollback(), close_connection(), Error),
+    para usar los repositorios contra una réplica local o en pruebas.
+    Cada hilo usa su propia conexión.
+    """
+    Error = sqlite3.Error
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+        self._tx_local = threading.local()
+
+    def _get(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = SQLiteConnection(self.path)
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    @contextmanager
+    def _lend(self):
+        """Entrega la conexión del hilo actual; si el bloque falla revierte lo pendiente."""
+        try:
+            conn = self._get()
+        except sqlite3.Error as err:
+            print(f"Error al abrir la base de datos local: {err}")
+            yield None
+            return
+        try:
+            yield conn
+        except BaseException:
+            conn.rollback()
+            raise
+
+    def create_schema(self):
+        """Crea las tablas de la aplicación si no existen."""
+        with self._lend() as conn:
+            conn.raw.executescript(SQLITE_SCHEMA)
+
+    def execute_prepared(self, conn, sql, params=(), dictionary=False, model=None):
+        """
+        Misma interfaz que DatabaseManager.execute_prepared; sqlite3 ya reutiliza
+        las sentencias compiladas de cada conexión, así que basta un cursor común.
+        """
+        cursor = conn.cursor(dictionary=dictionary and model is None)
+        try:
+            cursor.execute(sql, params)
+            if model is not None:
+                return list(map(cursor_mapper(model, cursor), cursor.fetchall()))
+            return cursor.fetchall()
+        finally:
+            cursor.close()
+
+    def close_connection(self):
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            conn.close()
+        self._local = threading.local()
@@ -0,0 +1,111 @@
+# statement_cache.py
+import threading
+import weakref
+from collections import OrderedDict
+
+# Código de error de MySQL cuando el servidor ya no conoce el statement (p. ej. tras
+# un reinicio de sesión): se vuelve a preparar una vez.
+ER_UNKNOWN_STMT_HANDLER = 1243
+
+
+class StatementCache:
+    """
+    Sentencias preparadas en el servidor para una conexión, indexadas por el texto SQL,
+    con desalojo LRU al superar 'capacity'. Cada entrada es un cursor(prepared=True)
+    dedicado a una sola sentencia: al volver a ejecutarlo con el mismo objeto str,
+    mysql.connector reutiliza el statement ya preparado y solo envía los parámetros.
+    Si cambia el id de sesión de la conexión (reconexión) se descartan todas.
+    Ojo: el driver manda un COM_STMT_RESET antes de cada ejecución, así que cada
+    llamada son dos viajes al servidor (ver STATEMENT_CACHE_SIZE en config.py).
+    """
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self._entries = OrderedDict()   # sql -> (sql original, cursor preparado)
+        self._connection_id = None
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def clear(self):
+        entries, self._entries = self._entries, OrderedDict()
+        for _, cursor in entries.values():
+            try:
+                cursor.close()
+            except Exception:
+                pass # La conexión puede estar ya cerrada
+
+    def _cursor_for(self, conn, sql):
+        connection_id = getattr(conn, "connection_id", None)
+        if connection_id != self._connection_id:
+            self.clear()
+            self._connection_id = connection_id
+
+        entry = self._entries.get(sql)
+        if entry is not None:
+            self._entries.move_to_end(sql)
+            self.hits += 1
+            return entry
+        self.misses += 1
+        entry = (sql, conn.cursor(prepared=True))
+        self._entries[sql] = entry
+        if len(self._entries) > self.capacity:
+            _, (_, evicted) = self._entries.popitem(last=False)
+            evicted.close() # Libera el statement en el servidor
+        return entry
+
+    def _evict(self, sql):
+        entry = self._entries.pop(sql, None)
+        if entry is not None:
+            try:
+                entry[1].close()
+            except Exception:
+                pass
+
+    def execute(self, conn, sql, params=(), error_class=Exception):
+        """
+        Ejecuta 'sql' como sentencia preparada y devuelve (nombres de columnas, filas).
+        Ante un error del motor la entrada se descarta; si el servidor perdió el
+        statement, se prepara de nuevo y se reintenta una vez.
+        """
+        for attempt in (1, 2):
+            cached_sql, cursor = self._cursor_for(conn, sql)
+            try:
+                cursor.execute(cached_sql, params)
+                rows = cursor.fetchall() if cursor.description else []
+                columns = [col[0] for col in cursor.description] if cursor.description else []
+                return columns, rows
+            except error_class as err:
+                self._evict(sql)
+                if attempt == 2 or getattr(err, "errno", None) != ER_UNKNOWN_STMT_HANDLER:
+                    raise
+
+
+class StatementCacheRegistry:
+    """
+    Un StatementCache por conexión física. Se indexa débilmente por la conexión,
+    así el caché desaparece junto con ella cuando el pool la descarta.
+    """
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self._caches = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def for_connection(self, conn):
+        with self._lock:
+            cache = self._caches.get(conn)
+            if cache is None:
+                cache = StatementCache(self.capacity)
+                self._caches[conn] = cache
+            return cache
+
+    def stats(self):
+        """Aciertos y fallos acumulados de los cachés de las conexiones vivas."""
+        with self._lock:
+            caches = list(self._caches.values())
+        return {
+            'hits': sum(c.hits for c in caches),
+            'misses': sum(c.misses for c in caches),
+            'statements': sum(len(c) for c in caches),
+        }
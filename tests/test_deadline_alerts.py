@@ -0,0 +1,62 @@
+# tests/test_deadline_alerts.py
+"""
+Reintento de la carga de DeadlineAlerts: tras un fallo de la consulta, summary()
+no vuelve a consultar hasta pasados retry_seconds, y después sí.
+
+Uso:
+    python -m pytest tests
+    python -m unittest discover tests
+"""
+import unittest
+from datetime import date
+from types import SimpleNamespace
+from unittest import mock
+from deadline_alerts import DeadlineAlerts
+from prefetch import PrefetchExecutor
+
+
+class FlakyRepo:
+    """Falla las primeras 'failures' cargas (devuelve None, como los repositorios)."""
+    def __init__(self, failures):
+        self.failures = failures
+        self.calls = 0
+
+    def get_open_deadlines(self, closed_statuses):
+        self.calls += 1
+        if self.calls <= self.failures:
+            return None
+        return [SimpleNamespace(ID=1, FechaFin=date(2024, 1, 1), priority=None, status="Pendiente")]
+
+
+class RetryTest(unittest.TestCase):
+    def setUp(self):
+        # Un prefetcher cerrado ejecuta las cargas en el mismo hilo: el test es determinista.
+        self.prefetcher = PrefetchExecutor(max_workers=1)
+        self.prefetcher.shutdown()
+
+    def test_summary_retries_after_back_off(self):
+        repo = FlakyRepo(failures=1)
+        alerts = DeadlineAlerts(repo, self.prefetcher, retry_seconds=30)
+        with mock.patch("deadline_alerts.time.monotonic", return_value=100.0):
+            self.assertIsNone(alerts.summary(today=date(2024, 6, 1)))
+            self.assertIsNone(alerts.summary(today=date(2024, 6, 1)))
+        self.assertEqual(repo.calls, 1)
+        with mock.patch("deadline_alerts.time.monotonic", return_value=131.0):
+            self.assertIsNone(alerts.summary(today=date(2024, 6, 1)))  # lanza la carga
+            summary = alerts.summary(today=date(2024, 6, 1))
+        self.assertEqual(repo.calls, 2)
+        self.assertEqual(summary.overdue, 1)
+
+    def test_invalidate_clears_back_off(self):
+        repo = FlakyRepo(failures=1)
+        alerts = DeadlineAlerts(repo, retry_seconds=3600)
+        self.assertFalse(alerts.load())
+        self.assertFalse(alerts.load())
+        self.assertEqual(repo.calls, 1)
+        alerts.invalidate()
+        self.assertTrue(alerts.load())
+        self.assertEqual(len(alerts), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
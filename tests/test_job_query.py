@@ -0,0 +1,100 @@
+# tests/test_job_query.py
+"""
+Paginación keyset de AvanceRepository.find_jobs sobre una base SQLite en memoria
+con fechas límite y prioridades en NULL: recorrer todas las páginas debe devolver
+las mismas filas, en el mismo orden, que la consulta completa con ORDER BY.
+
+Uso:
+    python -m pytest tests
+    python -m unittest discover tests
+"""
+import unittest
+from datetime import date
+from job_pager import JobPager
+from job_query import SORT_KEYS, build_keyset_condition, build_order_by
+from repositories import AvanceRepository
+from sqlite_backend import SQLiteDatabaseManager
+
+PAGE_SIZE = 3
+
+
+def _fill(db_manager):
+    with db_manager.connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("INSERT INTO Consorcios (Codigo, Nombre) VALUES (1, 'Edificio A'), (2, 'Edificio B')")
+        cursor.execute("INSERT INTO Gremios (Id, Nombre_Fantasia) VALUES (1, 'Plomería'), (2, 'Electricidad')")
+        cursor.execute("INSERT INTO Estado (id, Estado) VALUES (1, 'Pendiente'), (2, 'Completado')")
+        fechas = [date(2024, 5, 1), None, date(2024, 5, 1), None, date(2023, 1, 9), date(2025, 2, 3), None]
+        prioridades = [None, "Alta", "Media", None, "Baja", None, "Media"]
+        for job_id in range(1, 22):
+            fecha_fin = fechas[job_id % len(fechas)]
+            cursor.execute(
+                "INSERT INTO Avance (ID, Consorcio_FK, Titulo, Descripcion, Gremio_FK, Estado_FK,"
+                " Prioridad, DiaFin, MesFin, AnioFin, FechaFin) VALUES (%s, %s, %s, '', %s, %s, %s, %s, %s, %s, %s)",
+                (job_id, job_id % 2 + 1, f"Trabajo {job_id % 4}", job_id % 2 + 1, job_id % 2 + 1,
+                 prioridades[job_id % len(prioridades)],
+                 fecha_fin.day if fecha_fin else None, fecha_fin.month if fecha_fin else None,
+                 fecha_fin.year if fecha_fin else None, fecha_fin)
+            )
+        conn.commit()
+        cursor.close()
+
+
+class KeysetPaginationTest(unittest.TestCase):
+    def setUp(self):
+        self.db_manager = SQLiteDatabaseManager(":memory:")
+        self.db_manager.create_schema()
+        _fill(self.db_manager)
+        self.repo = AvanceRepository(self.db_manager)
+
+    def tearDown(self):
+        self.db_manager.close_connection()
+
+    def _all_ids(self, sort, descending):
+        with self.db_manager.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT A.ID" + AvanceRepository.JOBS_FROM + build_order_by(sort, descending))
+            ids = [row[0] for row in cursor.fetchall()]
+            cursor.close()
+        return ids
+
+    def _paged_ids(self, sort, descending):
+        ids, after = [], None
+        while True:
+            jobs, after = self.repo.find_jobs(sort=sort, descending=descending, after=after, limit=PAGE_SIZE)
+            ids.extend(job.ID for job in jobs)
+            if after is None:
+                return ids
+
+    def test_pages_cover_rows_with_null_sort_keys(self):
+        for sort in SORT_KEYS:
+            for descending in (True, False):
+                with self.subTest(sort=sort, descending=descending):
+                    expected = self._all_ids(sort, descending)
+                    self.assertEqual(len(expected), 21)
+                    self.assertEqual(self._paged_ids(sort, descending), expected)
+
+    def test_default_browse_order_with_page_jumps(self):
+        # El listado por defecto ordena por FechaFin DESC: los trabajos sin fecha
+        # van en las últimas páginas, a las que también se llega saltando.
+        expected = self._all_ids('deadline', True)
+        pages = [expected[i:i + PAGE_SIZE] for i in range(0, len(expected), PAGE_SIZE)]
+        pager = JobPager(self.repo, page_size=PAGE_SIZE)
+        self.assertEqual(pager.page_count, len(pages))
+        for index in reversed(range(len(pages))):
+            pager.reset()
+            self.assertEqual([job.ID for job in pager.page(index)], pages[index])
+        pager.reset()
+        self.assertEqual([[job.ID for job in pager.page(i)] for i in range(len(pages))], pages)
+        self.assertIsNone(pager.page(len(pages)))
+
+    def test_null_cursor_value_uses_is_null(self):
+        sql, params = build_keyset_condition('deadline', True, (None, 7))
+        self.assertIn("A.FechaFin IS NULL", sql)
+        self.assertEqual(params, [7])
+        sql, params = build_keyset_condition('priority', False, (None, 7))
+        self.assertIn("A.Prioridad IS NOT NULL", sql)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+# tests/test_search_index.py
+"""
+Búsqueda por prefijo en SearchIndex: un prefijo encuentra todas las palabras del
+índice que empiezan así, sin importar cuántas sean, igual que '+palabra*' en MySQL.
+
+Uso:
+    python -m pytest tests
+    python -m unittest discover tests
+"""
+import unittest
+from types import SimpleNamespace
+from search_index import SearchIndex
+
+
+class StaticRepo:
+    def __init__(self, jobs):
+        self.jobs = jobs
+
+    def iter_all_jobs(self):
+        return iter(self.jobs)
+
+
+def _job(job_id, titulo, descripcion=""):
+    return SimpleNamespace(ID=job_id, Titulo=titulo, Descripcion=descripcion)
+
+
+class PrefixSearchTest(unittest.TestCase):
+    def test_prefix_matches_every_word(self):
+        # "Medidor 10001" ... "Medidor 10120": el prefijo "100" abarca 99 palabras distintas.
+        jobs = [_job(job_id, f"Medidor {10000 + job_id}", "Cambio de caño") for job_id in range(1, 121)]
+        index = SearchIndex(StaticRepo(jobs))
+        self.assertEqual(index.search("10", limit=500), [])  # Corto: solo coincidencia exacta
+        for query in ("100", "100 cano"):
+            with self.subTest(query=query):
+                found = index.search(query, limit=500)
+                self.assertEqual(sorted(job_id for job_id, _ in found), list(range(1, 100)))
+
+    def test_prefix_keeps_best_variant_score(self):
+        jobs = [_job(1, "Filtración", "filtración en el techo"),
+                _job(2, "Pintura", "filtro de agua"),
+                _job(3, "Pintura", "fachada")]
+        index = SearchIndex(StaticRepo(jobs))
+        self.assertEqual([job_id for job_id, _ in index.search("filtr")], [1, 2])
+        self.assertEqual([job_id for job_id, _ in index.search("filtr pintura")], [2])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,289 @@
+# transactions.py
+import threading
+import time
+from contextlib import contextmanager
+from config import WRITE_BEHIND_MAX_DELAY, WRITE_BEHIND_MAX_WRITES
+
+
+class TransactionRolledBack(Exception):
+    """
+    Se lanza al salir de un bloque transaction() que se revirtió porque un
+    repositorio informó un error dentro de él (los repositorios atrapan sus
+    errores y devuelven False/None, así que sin esto la falla pasaría inadvertida).
+    """
+
+
+class _Scope:
+    """Nivel de transaction(): el externo no tiene savepoint; los anidados sí."""
+    __slots__ = ("savepoint", "rollback_only")
+
+    def __init__(self, savepoint):
+        self.savepoint = savepoint
+        self.rollback_only = False
+
+
+class _TransactionState:
+    """Transacción activa de un hilo: la conexión compartida y sus niveles anidados."""
+    def __init__(self, conn, write_behind=False, max_delay=None, max_writes=None):
+        self.conn = conn
+        self.scopes = []
+        # El hilo de confirmación diferida usa la conexión solo entre llamadas de los
+        # repositorios: ambos toman este lock.
+        self.lock = threading.RLock()
+        self.write_behind = write_behind
+        self.max_delay = max_delay
+        self.max_writes = max_writes
+        self.pending_writes = 0
+        self.first_pending_at = None
+        self.write_savepoint = False
+        self.closed = False
+
+
+def _execute(conn, sql):
+    cursor = conn.cursor()
+    try:
+        cursor.execute(sql)
+    finally:
+        cursor.close()
+
+
+def _close_state(state):
+    """
+    Marca la transacción como terminada (con state.lock tomado), en el mismo paso
+    que su commit o rollback final: así el hilo de escritura diferida no puede
+    confirmar un lote ni abrir otra transacción antes de que la conexión vuelva al pool.
+    """
+    state.closed = True
+    state.pending_writes = 0
+    state.first_pending_at = None
+
+
+class TransactionMixin:
+    """
+    Unidad de trabajo para los gestores de base de datos (DatabaseManager y
+    SQLiteDatabaseManager). La clase que lo usa debe definir Error, _lend()
+    (context manager que presta una conexión o entrega None) y crear
+    self._tx_local = threading.local() en su __init__.
+
+    Mientras un hilo tiene una transacción activa, connection() entrega a los
+    repositorios esa misma conexión, begin() y commit() no hacen nada y rollback()
+    marca el nivel actual para revertirse al salir. Así varias escrituras de
+    repositorios quedan en una sola transacción sin cambiar su código.
+    """
+
+    def _tx_state(self):
+        return getattr(self._tx_local, "state", None)
+
+    def _joined(self, conn):
+        state = self._tx_state()
+        return state if state is not None and conn is state.conn else None
+
+    @contextmanager
+    def connection(self):
+        """
+        Presta una conexión durante el bloque 'with' (None si no se pudo conectar).
+        Dentro de transaction() o write_behind() entrega la conexión de la transacción.
+        """
+        state = self._tx_state()
+        if state is not None:
+            with state.lock:
+                yield state.conn
+            return
+        with self._lend() as conn:
+            yield conn
+
+    def in_transaction(self):
+        """Indica si el hilo actual está dentro de transaction() o write_behind()."""
+        return self._tx_state() is not None
+
+    # --- API QUE USAN LOS REPOSITORIOS ---
+
+    def begin(self, conn):
+        """
+        Inicia una transacción explícita en la conexión prestada. Dentro de una
+        transacción activa no abre otra; en modo diferido marca un savepoint para
+        que rollback() deshaga solo la escritura en curso.
+        """
+        state = self._joined(conn)
+        if state is None:
+            conn.start_transaction()
+        elif state.write_behind and len(state.scopes) == 1 and not state.write_savepoint:
+            _execute(conn, "SAVEPOINT write_behind_write")
+            state.write_savepoint = True
+
+    def commit(self, conn):
+        """
+        Confirma los cambios pendientes de la conexión prestada.
+        Dentro de una transacción activa la confirmación queda para el final del bloque
+        (o, en modo diferido, para el próximo lote).
+        """
+        state = self._joined(conn)
+        if state is None:
+            if conn:
+                conn.commit()
+            return
+        if state.write_behind:
+            if state.write_savepoint:
+                _execute(conn, "RELEASE SAVEPOINT write_behind_write")
+                state.write_savepoint = False
+            state.pending_writes += 1
+            if state.first_pending_at is None:
+                state.first_pending_at = time.monotonic()
+            if state.pending_writes >= state.max_writes:
+                self._flush(state)
+
+    def rollback(self, conn):
+        """
+        Revierte los cambios pendientes de la conexión prestada.
+        Dentro de transaction() marca el nivel actual para revertirse al salir.
+        """
+        state = self._joined(conn)
+        if state is None:
+            if conn:
+                conn.rollback()
+            return
+        if state.write_savepoint:
+            _execute(conn, "ROLLBACK TO SAVEPOINT write_behind_write")
+            _execute(conn, "RELEASE SAVEPOINT write_behind_write")
+            state.write_savepoint = False
+        elif not state.write_behind or len(state.scopes) > 1:
+            state.scopes[-1].rollback_only = True
+        # En modo diferido, una sentencia suelta que falló ya se deshizo sola
+        # (atomicidad por sentencia): no hay nada más que revertir.
+
+    # --- UNIDAD DE TRABAJO ---
+
+    @contextmanager
+    def transaction(self):
+        """
+        Agrupa en una transacción todas las operaciones de los repositorios hechas
+        por este hilo dentro del bloque; confirma al salir o revierte ante una
+        excepción. Los bloques anidados usan savepoints: una excepción dentro de
+        uno deshace solo ese nivel. Si un repositorio revirtió dentro del bloque,
+        el nivel se deshace al salir y se lanza TransactionRolledBack.
+        Entrega la conexión de la transacción.
+        """
+        state = self._tx_state()
+        if state is not None:
+            yield from self._nested_scope(state)
+            return
+        with self._lend() as conn:
+            if not conn:
+                raise self.Error("No se pudo iniciar la transacción: sin conexión a la base de datos.")
+            state = _TransactionState(conn)
+            yield from self._outer_scope(state)
+
+    @contextmanager
+    def write_behind(self, max_delay=WRITE_BEHIND_MAX_DELAY, max_writes=WRITE_BEHIND_MAX_WRITES):
+        """
+        Modo de escritura diferida para ráfagas de escrituras independientes: los
+        commits de los repositorios se agrupan y se confirman juntos cada
+        'max_writes' escrituras o a los 'max_delay' segundos de la primera pendiente
+        (lo que ocurra antes), y al salir del bloque. Una escritura que falla se
+        deshace sola sin afectar a las demás del lote.
+        Dentro de una transacción activa simplemente se une a ella.
+        """
+        state = self._tx_state()
+        if state is not None:
+            yield state.conn
+            return
+        with self._lend() as conn:
+            if not conn:
+                raise self.Error("No se pudo iniciar la escritura diferida: sin conexión a la base de datos.")
+            state = _TransactionState(conn, write_behind=True, max_delay=max_delay, max_writes=max_writes)
+            stop = threading.Event()
+            flusher = threading.Thread(
+                target=self._flush_loop, args=(state, stop), name="db-write-behind", daemon=True
+            )
+            flusher.start()
+            try:
+                yield from self._outer_scope(state)
+            finally:
+                stop.set()
+                flusher.join()
+
+    def _outer_scope(self, state):
+        scope = _Scope(None)
+        state.scopes.append(scope)
+        state.conn.start_transaction()
+        self._tx_local.state = state
+        try:
+            try:
+                yield state.conn
+            except BaseException:
+                with state.lock:
+                    try:
+                        if state.write_behind:
+                            # Lo ya escrito en modo diferido se considera hecho: se confirma igual.
+                            self._flush(state, restart=False)
+                        else:
+                            state.conn.rollback()
+                    finally:
+                        _close_state(state)
+                raise
+            with state.lock:
+                try:
+                    if scope.rollback_only:
+                        state.conn.rollback()
+                        raise TransactionRolledBack("La transacción se revirtió por un error en una operación.")
+                    state.conn.commit()
+                finally:
+                    _close_state(state)
+        finally:
+            self._tx_local.state = None
+            state.scopes.pop()
+            with state.lock:
+                state.closed = True
+
+    def _nested_scope(self, state):
+        savepoint = f"sp_{len(state.scopes)}"
+        with state.lock:
+            _execute(state.conn, f"SAVEPOINT {savepoint}")
+        scope = _Scope(savepoint)
+        state.scopes.append(scope)
+        try:
+            try:
+                yield state.conn
+            except BaseException:
+                with state.lock:
+                    _execute(state.conn, f"ROLLBACK TO SAVEPOINT {savepoint}")
+                raise
+            with state.lock:
+                if scope.rollback_only:
+                    _execute(state.conn, f"ROLLBACK TO SAVEPOINT {savepoint}")
+                    raise TransactionRolledBack("El bloque se revirtió por un error en una operación.")
+                _execute(state.conn, f"RELEASE SAVEPOINT {savepoint}")
+        finally:
+            state.scopes.pop()
+
+    # --- ESCRITURA DIFERIDA ---
+
+    def _flush(self, state, restart=True):
+        """Confirma las escrituras acumuladas y (si restart) abre la transacción siguiente."""
+        if not state.pending_writes:
+            if not restart:
+                state.conn.rollback()
+            return
+        try:
+            state.conn.commit()
+        except self.Error as err:
+            print(f"Error al confirmar {state.pending_writes} escrituras diferidas: {err}")
+            try:
+                state.conn.rollback()
+            except self.Error:
+                pass
+        state.pending_writes = 0
+        state.first_pending_at = None
+        if restart:
+            state.conn.start_transaction()
+
+    def _flush_loop(self, state, stop):
+        # Revisa varias veces por intervalo para que ninguna escritura espere mucho más que max_delay.
+        interval = max(state.max_delay / 4, 0.01)
+        while not stop.wait(interval):
+            with state.lock:
+                due = (state.first_pending_at is not None
+                       and time.monotonic() - state.first_pending_at >= state.max_delay)
+                # No se confirma en medio de un bloque anidado ni de una escritura en curso.
+                if due and not state.closed and len(state.scopes) == 1 and not state.write_savepoint:
+                    self._flush(state)
@@ -1,24 +1,110 @@
 # ui.py
+from contextlib import nullcontext
+from config import INSTRUMENTATION
 
 class ConsoleUI:
     """
     Clase que gestiona la interfaz de usuario de la consola (menús y visualización de resultados).
     Aplica SRP: solo se ocupa de la presentación.
     """
-    def __init__(self, job_manager):
+    def __init__(self, job_manager, mirror=None, instrumentation=None, dashboard=None, alerts=None):
         """
         Inicializa la UI con una instancia de JobManager (Inyección de Dependencias).
+        Con dashboard (JobDashboard) se agrega el tablero de conteos por estado.
+        Con alerts (DeadlineAlerts) el menú principal avisa de los trabajos vencidos
+        y por vencer.
+        Si se trabaja con una réplica local (LocalMirror), se agrega la opción de sincronizar.
+        Con instrumentation (QueryStats), las consultas se atribuyen a la opción del menú
+        que las originó y se agrega la opción de exportar las métricas.
         """
         self.job_manager = job_manager
+        self.mirror = mirror
+        self.instrumentation = instrumentation
+        self.dashboard = dashboard
+        self.alerts = alerts
+
+        # Opciones del menú principal en orden: (texto, acción). "Salir" se agrega al final.
+        self.options = [
+            ("Listar Trabajos", self.job_manager.browse_jobs),
+            ("Listar Todos los Trabajos (sin paginar)", self.job_manager.display_jobs),
+            ("Buscar Trabajos", self.job_manager.search_jobs),
+            ("Añadir Trabajo", self.job_manager.add_job),
+            ("Actualizar Trabajo", self.job_manager.update_job),
+            ("Eliminar Trabajo", self.job_manager.delete_job),
+            ("Importar Trabajos (CSV/JSONL)", self.job_manager.import_jobs),
+            ("Exportar Trabajos", self.job_manager.export_jobs),
+            ("Operaciones en Bloque", self.job_manager.bulk_operations),
+        ]
+        if self.dashboard is not None:
+            self.options.append(("Tablero de Trabajos", self.show_dashboard))
+        if self.mirror is not None:
+            self.options.append(("Sincronizar con el Servidor", self.sync_mirror))
+        if self.instrumentation is not None:
+            self.options.append(("Exportar Métricas de Base de Datos", self.export_metrics))
 
     def main_menu(self):
         """Muestra el menú principal de la aplicación."""
         print("\n--- GESTIÓN DE MANTENIMIENTO DE EDIFICIOS ---")
-        print("1. Listar Trabajos")
-        print("2. Añadir Trabajo")
-        print("3. Actualizar Trabajo")
-        print("4. Eliminar Trabajo")
-        print("5. Salir")
+        if self.alerts is not None:
+            self.show_alerts()
+        for i, (label, _) in enumerate(self.options, start=1):
+            print(f"{i}. {label}")
+        print(f"{len(self.options) + 1}. Salir")
+
+    def show_alerts(self):
+        """Aviso de vencimientos: se lee del índice en memoria, sin consultar la base."""
+        summary = self.alerts.summary()
+        if summary is None or not (summary.overdue or summary.due_soon):
+            return
+        print(f"¡Atención! Vencidos: {summary.overdue}. "
+              f"Vencen en los próximos {summary.days} días: {summary.due_soon}.")
+        for job in summary.urgent:
+            fecha_fin = job.FechaFin
+            titulo = job.Titulo[:28] + '...' if len(job.Titulo) > 28 else job.Titulo
+            print(f"  - {job.ID}: {titulo} ({job.building}) vence el "
+                  f"{fecha_fin.day}/{fecha_fin.month}/{fecha_fin.year} [{job.priority}]")
+
+    def sync_mirror(self):
+        """Envía los cambios locales al servidor y refresca la réplica."""
+        print("\nSincronizando con el servidor...")
+        report = self.mirror.sync()
+        print(f"Operaciones enviadas: {report.applied}.")
+        for entry_id, operation, job_id, detail in report.conflicts:
+            print(f"  Conflicto en operación {entry_id} ({operation}, trabajo {job_id}): {detail}")
+        if report.error:
+            print(f"Aviso: {report.error}")
+        elif report.refreshed:
+            print(f"Réplica actualizada: {report.refreshed.get('Avance', 0)} trabajos.")
+
+    def show_dashboard(self):
+        """Muestra los trabajos abiertos y vencidos por estado, prioridad, edificio y técnico."""
+        tables = self.dashboard.build()
+        if tables is None:
+            print("\nNo se pudo calcular el tablero.")
+            return
+        print("\n--- TABLERO DE TRABAJOS ---")
+        for table in tables:
+            print(f"\n{table.title}")
+            if table.dimension == 'status':
+                print("{:<30} {:>10} {:>10}".format("", "Trabajos", "Vencidos"))
+                for row in table.rows:
+                    print("{:<30} {:>10} {:>10}".format(row.name, row.total, row.overdue))
+                continue
+            header = "{:<30} {:>9} {:>9}".format("", "Abiertos", "Vencidos")
+            header += "".join(" {:>12}".format(status[:12]) for status in table.statuses)
+            print(header + " {:>9}".format("Total"))
+            for row in table.rows:
+                line = "{:<30} {:>9} {:>9}".format((row.name or "(sin prioridad)")[:30], row.open, row.overdue)
+                line += "".join(" {:>12}".format(row.by_status.get(status, 0)) for status in table.statuses)
+                print(line + " {:>9}".format(row.total))
+            if table.hidden:
+                print(f"... y {table.hidden} más.")
+
+    def export_metrics(self):
+        """Escribe el snapshot de métricas en el archivo configurado."""
+        path = INSTRUMENTATION['export_path']
+        if self.instrumentation.export(path):
+            print(f"Métricas exportadas a {path}.")
 
     def run_app(self):
         """Ejecuta el bucle principal de la aplicación de consola."""
@@ -26,16 +112,13 @@ class ConsoleUI:
             self.main_menu()
             choice = input("Seleccione una opción: ")
 
-            if choice == '1':
-                self.job_manager.display_jobs()
-            elif choice == '2':
-                self.job_manager.add_job()
-            elif choice == '3':
-                self.job_manager.update_job()
-            elif choice == '4':
-                self.job_manager.delete_job()
-            elif choice == '5':
+            if choice == str(len(self.options) + 1):
                 print("Saliendo de la aplicación. ¡Hasta luego!")
                 break
+            elif choice.isdigit() and 1 <= int(choice) <= len(self.options):
+                label, action = self.options[int(choice) - 1]
+                scope = self.instrumentation.action(label) if self.instrumentation else nullcontext()
+                with scope:
+                    action()
             else:
                 print("Opción no válida. Por favor, intente de nuevo.")